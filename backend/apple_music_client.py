@@ -3,8 +3,8 @@
 import os
 import time
 import jwt
-import requests
 from dotenv import load_dotenv
+from http_transport import get_session
 
 load_dotenv()
 
@@ -48,7 +48,7 @@ class AppleMusicClient:
         params = {'filter[isrc]': isrc}
         headers = {'Authorization': f'Bearer {self.token}'}
         
-        response = requests.get(url, params=params, headers=headers)
+        response = get_session().get(url, params=params, headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -73,7 +73,7 @@ class AppleMusicClient:
         }
         headers = {'Authorization': f'Bearer {self.token}'}
         
-        response = requests.get(url, params=params, headers=headers)
+        response = get_session().get(url, params=params, headers=headers)
         
         if response.status_code == 200:
             data = response.json()
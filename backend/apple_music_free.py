@@ -3,6 +3,8 @@
 import requests
 from urllib.parse import quote
 from typing import Optional, Dict, List
+from http_transport import get_session
+from resilience import ResiliencePolicy
 
 class AppleMusicFreeClient:
     """
@@ -10,12 +12,16 @@ class AppleMusicFreeClient:
     No authentication or payment required!
     """
     
-    def __init__(self):
+    def __init__(self, resilience: Optional[ResiliencePolicy] = None):
         self.base_url = "https://itunes.apple.com"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'AuxParty/1.0'
-        })
+        self.session = get_session()  # Shared pooled transport
+        self.resilience = resilience or ResiliencePolicy('apple_music')
+    
+    def _get(self, url: str, params: Dict):
+        """GET with retries/circuit breaking, raises for non-2xx responses"""
+        response = self.resilience.call(self.session.get, url, params=params, timeout=10)
+        response.raise_for_status()
+        return response
     
     def search_track(self, title: str, artist: str, limit: int = 5) -> Optional[Dict]:
         """
@@ -41,8 +47,7 @@ class AppleMusicFreeClient:
                 'country': 'US'  # You can make this configurable
             }
             
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._get(url, params)
             
             data = response.json()
             
@@ -76,6 +81,10 @@ class AppleMusicFreeClient:
         
         Returns:
             List of track dictionaries
+        
+        Raises:
+            requests.RequestException: the search failed (as opposed to
+            finding nothing)
         """
         query = f"{title} {artist}"
         
@@ -89,8 +98,7 @@ class AppleMusicFreeClient:
                 'country': 'US'
             }
             
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._get(url, params)
             
             data = response.json()
             
@@ -112,7 +120,7 @@ class AppleMusicFreeClient:
             
         except requests.exceptions.RequestException as e:
             print(f"❌ iTunes API error: {e}")
-            return []
+            raise
     
     def get_track_by_id(self, track_id: str) -> Optional[Dict]:
         """
@@ -125,8 +133,7 @@ class AppleMusicFreeClient:
                 'entity': 'song'
             }
             
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._get(url, params)
             
             data = response.json()
             
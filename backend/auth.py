@@ -1,8 +1,8 @@
 import os
 import urllib.parse
-import requests
 from fastapi import HTTPException
 from dotenv import load_dotenv
+from http_transport import get_session
 
 load_dotenv()
 
@@ -46,7 +46,7 @@ class SpotifyAuth:
             'client_secret': CLIENT_SECRET,
         }
         
-        response = requests.post(TOKEN_URL, data=data)
+        response = get_session().post(TOKEN_URL, data=data)
         
         if response.status_code != 200:
             raise HTTPException(status_code=400, detail="Failed to get token from Spotify")
@@ -0,0 +1,218 @@
+# backend/benchmarks/bench_conversion.py
+
+"""
+Offline conversion throughput benchmark
+
+Runs UniversalConverter.convert end to end against the stand-in platforms
+in benchmarks/standins.py - no network, no credentials - so every
+performance change can be compared on the same hardware.
+
+Usage (from backend/):
+    python -m benchmarks.bench_conversion
+    python -m benchmarks.bench_conversion --sizes 50 500 --pairs spotify:apple_music --latency-ms 80 --error-rate 0.02
+    python -m benchmarks.bench_conversion --fairness 1 4 8
+
+--fairness runs a small conversion next to N large ones on one engine
+and reports how long the small one took, for each N.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from typing import Dict, List
+
+# Links recorded by one case would answer the next case's searches
+os.environ.setdefault('IDENTITY_GRAPH', 'false')
+
+from benchmarks.standins import Catalog, Upstream, install_standins
+from platform_detector import PlatformDetector
+from match_engine import MatchEngine
+from universal_converter import UniversalConverter
+
+SOURCE_URLS = {
+    'spotify': 'https://open.spotify.com/playlist/{id}',
+    'youtube_music': 'https://music.youtube.com/playlist?list={id}',
+}
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def run_case(args, size: int, source: str, target: str) -> Dict:
+    catalog = Catalog(size=max(size, 100) * 2, seed=args.seed)
+    playlist_id = f"BENCH{size}"
+    playlist = catalog.tracks[:size]
+    if args.duplicate_rate:
+        # Party playlists: some positions repeat a song from earlier in the list
+        rng = random.Random(args.seed)
+        playlist = [
+            playlist[rng.randrange(i)] if i and rng.random() < args.duplicate_rate else track
+            for i, track in enumerate(playlist)
+        ]
+    playlists = {playlist_id: playlist}
+
+    upstreams = {
+        name: Upstream(
+            name,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            rate_limit=args.server_rate_limit,
+            seed=args.seed
+        )
+        for name in ('spotify', 'youtube_music', 'apple_music')
+    }
+    handlers = install_standins(catalog, upstreams, playlists, client_rate=args.client_rate)
+
+    # Fresh engine per case so one case's match cache can't speed up the next
+    converter = UniversalConverter(PlatformDetector(), MatchEngine(max_workers=args.workers))
+    url = SOURCE_URLS[source].format(id=playlist_id)
+
+    # The converter logs every track; keep the report readable unless asked
+    log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with log:
+        started = time.perf_counter()
+        result = converter.convert(url, target)
+        elapsed = time.perf_counter() - started
+    tracks = result['stats']['total']
+
+    latencies = handlers[target].latencies
+    return {
+        'size': size,
+        'tracks': tracks,
+        'pair': f"{source}->{target}",
+        'seconds': round(elapsed, 3),
+        'tracks_per_second': round(tracks / elapsed, 2) if elapsed else 0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0,
+        'match_rate': round(result['stats']['match_rate'], 4),
+        'upstream_calls': {
+            name: dict(upstream.calls)
+            for name, upstream in upstreams.items()
+            if upstream.calls
+        },
+    }
+
+def run_fairness(args, large_jobs: int) -> Dict:
+    """A small conversion started while `large_jobs` big ones are matching"""
+    small, large = args.fairness_small, args.fairness_large
+    catalog = Catalog(size=small + large * large_jobs + 100, seed=args.seed)
+    playlists = {'SMALL': catalog.tracks[:small]}
+    for n in range(large_jobs):
+        start = small + n * large
+        playlists[f'LARGE{n}'] = catalog.tracks[start:start + large]
+
+    upstreams = {
+        name: Upstream(name, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed)
+        for name in ('spotify', 'youtube_music', 'apple_music')
+    }
+    install_standins(catalog, upstreams, playlists, client_rate=args.fairness_rate)
+    converter = UniversalConverter(PlatformDetector(), MatchEngine(max_workers=args.workers))
+    url = SOURCE_URLS['spotify']
+
+    def convert_large(playlist_id: str) -> None:
+        try:
+            converter.convert(url.format(id=playlist_id), 'apple_music')
+        except Exception:
+            pass  # Cut short below, once the small job is done
+
+    log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with log:
+        background = [
+            threading.Thread(target=convert_large, args=(f'LARGE{n}',), daemon=True)
+            for n in range(large_jobs)
+        ]
+        for thread in background:
+            thread.start()
+        # Let the large jobs fill the pool first
+        time.sleep(1)
+
+        started = time.perf_counter()
+        result = converter.convert(url.format(id='SMALL'), 'apple_music')
+        elapsed = time.perf_counter() - started
+
+        # Stop the large jobs so they don't compete with the next case
+        converter.engine.executor.shutdown(cancel_futures=True)
+        for thread in background:
+            thread.join()
+
+    return {
+        'large_jobs': large_jobs,
+        'small_tracks': result['stats']['total'],
+        'small_seconds': round(elapsed, 3),
+        # Best case: the small job gets every token
+        'ideal_seconds': round(small / args.fairness_rate, 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000])
+    parser.add_argument('--pairs', nargs='+', default=[
+        'spotify:youtube_music', 'spotify:apple_music', 'youtube_music:spotify', 'youtube_music:apple_music'
+    ], help='source:target pairs')
+    parser.add_argument('--latency-ms', type=float, default=50, help='mean upstream latency')
+    parser.add_argument('--jitter-ms', type=float, default=20, help='upstream latency std deviation')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of calls failing with 503')
+    parser.add_argument('--server-rate-limit', type=float, default=None,
+                        help='requests/s before the stand-in answers 429 (default: unlimited)')
+    parser.add_argument('--client-rate', type=float, default=1000,
+                        help='override platform rate limiters (req/s); 0 keeps the production budgets')
+    parser.add_argument('--duplicate-rate', type=float, default=0.0,
+                        help='fraction of playlist positions that repeat an earlier song')
+    parser.add_argument('--workers', type=int, default=16, help='match engine thread pool size')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--fairness', type=int, nargs='+', metavar='N',
+                        help='instead: time a small conversion next to N large ones, per N')
+    parser.add_argument('--fairness-small', type=int, default=20, help='tracks in the small conversion')
+    parser.add_argument('--fairness-large', type=int, default=1000, help='tracks in each large conversion')
+    parser.add_argument('--fairness-rate', type=float, default=20, help='platform budget (req/s) for --fairness')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--verbose', action='store_true', help="show the converter's own logging")
+    args = parser.parse_args()
+    args.client_rate = args.client_rate or None
+
+    if args.fairness:
+        results = [run_fairness(args, n) for n in args.fairness]
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+
+        print(f"\n⚖️  Fairness: {args.fairness_small} tracks next to N x {args.fairness_large}, "
+              f"{args.fairness_rate:g} req/s, {args.workers} workers\n")
+        print(f"{'large jobs':>10}{'small secs':>12}{'ideal':>8}")
+        for r in results:
+            print(f"{r['large_jobs']:>10}{r['small_seconds']:>12}{r['ideal_seconds']:>8}")
+        return
+
+    results = []
+    for pair in args.pairs:
+        source, target = pair.split(':')
+        for size in args.sizes:
+            results.append(run_case(args, size, source, target))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 Conversion benchmark (latency {args.latency_ms}±{args.jitter_ms}ms, "
+          f"errors {args.error_rate:.0%}, server limit {args.server_rate_limit or '∞'} req/s)\n")
+    print(f"{'pair':<28}{'size':>7}{'tracks':>8}{'secs':>10}{'tracks/s':>11}{'p50 ms':>10}{'p99 ms':>10}{'match':>8}  upstream calls")
+    for r in results:
+        calls = ', '.join(
+            f"{name}:{sum(ops.values())}" for name, ops in r['upstream_calls'].items()
+        )
+        print(f"{r['pair']:<28}{r['size']:>7}{r['tracks']:>8}{r['seconds']:>10}{r['tracks_per_second']:>11}"
+              f"{r['p50_ms']:>10}{r['p99_ms']:>10}{r['match_rate']:>8.1%}  {calls}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# backend/benchmarks/bench_matching.py
+
+"""
+Match quality and speed benchmark for the fuzzy scorers in scoring.py
+
+Scores every case of the labeled corpus (benchmarks/matching_corpus.json)
+with each strategy and reports precision, recall and microseconds per
+track at one or more acceptance thresholds.
+
+    precision = correct accepted matches / accepted matches
+    recall    = correct accepted matches / cases that have a right answer
+
+Usage (from backend/):
+    python -m benchmarks.bench_matching
+    python -m benchmarks.bench_matching --thresholds 60 70 80 --scorers ratio token_set
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, List
+
+from scoring import SCORERS, MATCH_THRESHOLD, best_candidate
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'matching_corpus.json')
+
+def load_corpus(path: str = CORPUS_PATH) -> List[Dict]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['cases']
+
+def evaluate(cases: List[Dict], scorer: str, threshold: float, repeats: int) -> Dict:
+    prepared = [
+        (
+            case['source']['title'],
+            case['source']['artist'],
+            [(c['title'], c['artist']) for c in case['candidates']],
+            [c['id'] for c in case['candidates']],
+            case['answer'],
+        )
+        for case in cases
+    ]
+
+    # Timing: score the whole corpus `repeats` times
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for title, artist, candidates, _, _ in prepared:
+            best_candidate(title, artist, candidates, scorer)
+    elapsed = time.perf_counter() - started
+
+    accepted = correct = answerable = 0
+    misses = []
+    for title, artist, candidates, ids, answer in prepared:
+        index, score = best_candidate(title, artist, candidates, scorer)
+        predicted = ids[index] if index is not None and score >= threshold else None
+
+        answerable += answer is not None
+        if predicted is not None:
+            accepted += 1
+            correct += predicted == answer
+
+        if predicted != answer:
+            misses.append(f"{title} - {artist}: expected {answer}, got {predicted} ({score:.0f})")
+
+    return {
+        'scorer': scorer,
+        'threshold': threshold,
+        'precision': correct / accepted if accepted else 0.0,
+        'recall': correct / answerable if answerable else 0.0,
+        'us_per_track': elapsed / (repeats * len(prepared)) * 1e6,
+        'misses': misses,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scorers', nargs='+', default=list(SCORERS), choices=list(SCORERS))
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[MATCH_THRESHOLD])
+    parser.add_argument('--repeats', type=int, default=200, help='timing passes over the corpus')
+    parser.add_argument('--corpus', default=CORPUS_PATH)
+    parser.add_argument('--show-misses', action='store_true')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    cases = load_corpus(args.corpus)
+    results = [
+        evaluate(cases, scorer, threshold, args.repeats)
+        for scorer in args.scorers
+        for threshold in args.thresholds
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n🎯 Matching benchmark ({len(cases)} labeled tracks)\n")
+    print(f"{'scorer':<24}{'threshold':>10}{'precision':>11}{'recall':>9}{'µs/track':>11}")
+    for r in results:
+        print(f"{r['scorer']:<24}{r['threshold']:>10.0f}{r['precision']:>11.1%}{r['recall']:>9.1%}{r['us_per_track']:>11.1f}")
+        if args.show_misses:
+            for miss in r['misses']:
+                print(f"    ✗ {miss}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# backend/benchmarks/load_sessions.py
+
+"""
+Load test for the session read endpoints
+
+Seeds sessions of several sizes through SessionManager.save_session, then
+drives concurrent GET /api/session/{code} and /api/session/{code}/ttl
+traffic straight into the FastAPI app over ASGI (no sockets, no HTTP
+client), and reports throughput, latency percentiles and per-request
+memory for capacity planning.
+
+The session store is the in-process memory backend by default; use
+--backend redis (REDIS_URL) or tiered to measure a real store.
+
+Usage (from backend/):
+    python -m benchmarks.load_sessions
+    python -m benchmarks.load_sessions --sizes 1000 --concurrency 64 --requests 5000 --backend redis
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+def make_tracks(count: int) -> List[Dict]:
+    """Session tracks shaped like a real Spotify -> YouTube Music conversion"""
+    return [
+        {
+            'title': f"Bench Track {i} (feat. Guest {i % 17})",
+            'artist': f"Bench Artist {i % 250}",
+            'album': f"Bench Album {i % 80}",
+            'isrc': f"QZBENCH{i:05d}",
+            'spotify_id': f"{i:022d}",
+            'duration_ms': 180000 + i,
+            'youtube_music_id': f"yt{i:09d}",
+            'youtube_music_match_method': 'metadata',
+            'youtube_music_confidence': 0.92,
+            'youtube_music_url': f"https://music.youtube.com/watch?v=yt{i:09d}",
+        }
+        for i in range(count)
+    ]
+
+async def asgi_get(app, path: str) -> Tuple[int, int]:
+    """Send one GET through the ASGI app, returns (status, body bytes)"""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'loadtest')],
+        'client': ('127.0.0.1', 50000),
+        'server': ('loadtest', 80),
+    }
+    done = asyncio.Event()
+    sent_request = False
+    status = 0
+    size = 0
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status, size
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body':
+            size += len(message.get('body', b''))
+            if not message.get('more_body'):
+                done.set()
+
+    await app(scope, receive, send)
+    return status, size
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+async def drive(app, paths: List[str], total: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            path = random.choice(paths)
+            started = time.perf_counter()
+            status, _ = await asgi_get(app, path)
+            latencies.append(time.perf_counter() - started)
+            errors += status != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'requests': total,
+        'errors': errors,
+        'rps': round(total / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+async def measure_memory(app, paths: List[str], samples: int) -> Dict:
+    """Peak Python allocations per request (run sequentially, tracemalloc is slow)"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(samples):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            _, body_size = await asgi_get(app, paths[i % len(paths)])
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'mem_mean_kb': round(sum(peaks) / len(peaks) / 1024, 1),
+        'mem_peak_kb': round(max(peaks) / 1024, 1),
+        'body_kb': round(body_size / 1024, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='tracks per session')
+    parser.add_argument('--sessions', type=int, default=20, help='sessions seeded per size')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per endpoint and size')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--memory-samples', type=int, default=50)
+    parser.add_argument('--backend', default='memory', help='SESSION_BACKEND to use (memory, redis, tiered)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    # main.py builds its SessionManager at import time from the environment
+    os.environ['SESSION_BACKEND'] = args.backend
+    import main as api
+
+    results = []
+    quiet = contextlib.redirect_stdout(io.StringIO())  # endpoints log every request
+
+    for size in args.sizes:
+        tracks = make_tracks(size)
+        with quiet:
+            codes = [
+                api.session_manager.save_session(tracks, target_platform='youtube_music', source_platform='Spotify')
+                for _ in range(args.sessions)
+            ]
+
+        for endpoint, suffix in (('session', ''), ('ttl', '/ttl')):
+            paths = [f"/api/session/{code}{suffix}" for code in codes]
+            with quiet:
+                stats = asyncio.run(drive(api.app, paths, args.requests, args.concurrency))
+                stats.update(asyncio.run(measure_memory(api.app, paths, args.memory_samples)))
+            stats.update({'endpoint': endpoint, 'tracks': size})
+            results.append(stats)
+
+        for code in codes:
+            api.session_manager.delete_session(code)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n🚦 Session endpoint load test (backend={args.backend}, concurrency={args.concurrency})\n")
+    print(f"{'endpoint':<10}{'tracks':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'mem KB':>10}{'peak KB':>10}{'body KB':>10}")
+    for r in results:
+        print(f"{r['endpoint']:<10}{r['tracks']:>8}{r['rps']:>10}{r['p50_ms']:>10}{r['p99_ms']:>10}{r['errors']:>8}"
+              f"{r['mem_mean_kb']:>10}{r['mem_peak_kb']:>10}{r['body_kb']:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+# backend/benchmarks/standins.py
+
+"""
+Offline stand-ins for Spotify, YouTube Music and the iTunes Search API
+
+They replace only the network layer (spotipy client, YTMusic client,
+HTTP session), so the real platform code - matching, fuzzy scoring, rate
+limiting, retries - runs exactly as in production.
+"""
+
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from apple_music_free import AppleMusicFreeClient
+from http_transport import enter_network
+from models import MatchResult, Track
+from platforms.apple_music import AppleMusicPlatform
+from platforms.base import MusicPlatform
+from platforms.spotify import SpotifyPlatform
+from platforms.youtube_music import YouTubeMusicPlatform
+from rate_limiter import RateLimiter
+from resilience import ResiliencePolicy, RetryPolicy
+from spotify_client import SpotifyClient
+from youtube_music_client import YouTubeMusicClient
+import platforms.registry as registry
+
+WORDS = (
+    "love night light heart fire dream summer rain city dance gold blue "
+    "wild young lonely electric forever midnight ocean shadow river sky "
+    "star broken paper silver velvet neon echo thunder honey sugar"
+).split()
+SUFFIXES = ['', '', '', ' (feat. {feat})', ' - Remastered 2011', ' (Radio Edit)', ' [Live]']
+
+class UpstreamError(Exception):
+    """Raised by stand-ins for simulated transport failures"""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        self.http_status = status
+        self.headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+        super().__init__(f"Server returned HTTP {status}")
+
+class Catalog:
+    """Deterministic synthetic catalog shared by all stand-in platforms"""
+
+    def __init__(self, size: int, seed: int = 42):
+        rng = random.Random(seed)
+        self.tracks = []
+        for i in range(size):
+            artist = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}"
+            base_title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))).title()
+            suffix = rng.choice(SUFFIXES).format(feat=rng.choice(WORDS).title())
+            self.tracks.append({
+                'n': i,
+                'title': f"{base_title} {i}{suffix}",
+                'artist': artist,
+                'album': f"{rng.choice(WORDS).title()} Sessions",
+                'isrc': f"QZBENCH{i:05d}",
+                'duration_ms': rng.randint(120, 300) * 1000,
+            })
+
+        # Search index: "<title> <artist>" and its simplified forms -> track
+        self._by_query = {}
+        self._by_isrc = {t['isrc']: t for t in self.tracks}
+        for track in self.tracks:
+            for title in (track['title'], AppleMusicPlatform._simplify_title(track['title'])):
+                for artist in (track['artist'], AppleMusicPlatform._simplify_artist(track['artist'])):
+                    self._by_query[self._key(f"{title} {artist}")] = track
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return ' '.join(query.lower().split())
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        """Exact hit first, then a few decoys (like a real search page)"""
+        hit = self._by_query.get(self._key(query))
+        if hit is None:
+            return []
+
+        decoys = [self.tracks[(hit['n'] + k * 7919) % len(self.tracks)] for k in range(1, limit)]
+        return [hit] + decoys
+
+    def by_isrc(self, isrc: str) -> Optional[Dict]:
+        return self._by_isrc.get(isrc)
+
+class Upstream:
+    """
+    Simulated upstream behaviour for one platform
+
+    Adds latency, random 5xx errors and a server-side rate limit that
+    answers 429 + Retry-After, and counts every call by operation.
+    """
+
+    def __init__(self, name: str, latency_ms: float = 50, jitter_ms: float = 20,
+                 error_rate: float = 0.0, rate_limit: Optional[float] = None, seed: int = 7):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.server_limiter = RateLimiter(rate=rate_limit, burst=max(1, int(rate_limit))) if rate_limit else None
+        self.calls = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def call(self, operation: str) -> None:
+        """Simulate one round trip; raises UpstreamError on injected failures"""
+        # Stands in for the transport, so the platform's rate limit applies here too
+        enter_network()
+
+        with self._lock:
+            self.calls[operation] += 1
+            delay = max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+            failed = self._rng.random() < self.error_rate
+
+        time.sleep(delay)
+
+        if self.server_limiter is not None:
+            wait = self.server_limiter.try_acquire()
+            if wait > 0:
+                raise UpstreamError(429, retry_after=round(wait, 2))
+
+        if failed:
+            raise UpstreamError(503)
+
+class FakeSpotipy:
+    """The subset of spotipy.Spotify used by SpotifyClient/SpotifyPlatform"""
+
+    PAGE_SIZE = 100
+
+    def __init__(self, catalog: Catalog, upstream: Upstream, playlists: Dict[str, List[Dict]]):
+        self.catalog = catalog
+        self.upstream = upstream
+        self.playlists = playlists
+
+    @staticmethod
+    def _item(track: Dict) -> Dict:
+        return {
+            'id': f"sp{track['n']}",
+            'name': track['title'],
+            'artists': [{'name': track['artist']}],
+            'album': {'name': track['album']},
+            'external_ids': {'isrc': track['isrc']},
+            'duration_ms': track['duration_ms'],
+        }
+
+    def _page(self, playlist_id: str, offset: int) -> Dict:
+        tracks = self.playlists[playlist_id]
+        chunk = tracks[offset:offset + self.PAGE_SIZE]
+        has_next = offset + self.PAGE_SIZE < len(tracks)
+        return {
+            'items': [{'track': self._item(t)} for t in chunk],
+            'next': f"{playlist_id}:{offset + self.PAGE_SIZE}" if has_next else None,
+        }
+
+    def playlist(self, playlist_id: str, fields: Optional[str] = None) -> Dict:
+        self.upstream.call('playlist')
+        return {'snapshot_id': f"{playlist_id}:{len(self.playlists[playlist_id])}"}
+
+    def playlist_tracks(self, playlist_id: str, **kwargs) -> Dict:
+        self.upstream.call('playlist_tracks')
+        return self._page(playlist_id, 0)
+
+    def next(self, result: Dict) -> Optional[Dict]:
+        if not result.get('next'):
+            return None
+        self.upstream.call('playlist_tracks')
+        playlist_id, offset = result['next'].rsplit(':', 1)
+        return self._page(playlist_id, int(offset))
+
+    def search(self, q: str, type: str = 'track', limit: int = 1, **kwargs) -> Dict:
+        self.upstream.call('search')
+
+        if q.startswith('isrc:'):
+            track = self.catalog.by_isrc(q[5:])
+            found = [track] if track else []
+        else:
+            match = re.match(r'track:(.*) artist:(.*)', q)
+            found = self.catalog.search(f"{match.group(1)} {match.group(2)}", limit) if match else []
+
+        return {'tracks': {'items': [self._item(t) for t in found[:limit]]}}
+
+class FakeYTMusic:
+    """The subset of ytmusicapi.YTMusic used by the YouTube Music platform"""
+
+    def __init__(self, catalog: Catalog, upstream: Upstream, playlists: Dict[str, List[Dict]]):
+        self.catalog = catalog
+        self.upstream = upstream
+        self.playlists = playlists
+
+    @staticmethod
+    def _item(track: Dict) -> Dict:
+        return {
+            'videoId': f"yt{track['n']}",
+            'title': track['title'],
+            'artists': [{'name': track['artist']}],
+            'album': {'name': track['album']},
+            'duration_seconds': track['duration_ms'] // 1000,
+        }
+
+    def get_playlist(self, playlist_id: str, limit: Optional[int] = 100, **kwargs) -> Dict:
+        tracks = self.playlists[playlist_id]
+        if limit is not None:
+            tracks = tracks[:limit]
+        # One call per 100-track continuation, like the real client
+        for _ in range(max(1, (len(tracks) + 99) // 100)):
+            self.upstream.call('get_playlist')
+        return {'tracks': [self._item(t) for t in tracks]}
+
+    def search(self, query: str, filter: str = 'songs', limit: int = 20, **kwargs) -> List[Dict]:
+        self.upstream.call('search')
+        return [self._item(t) for t in self.catalog.search(query, limit)]
+
+class FakeResponse:
+    def __init__(self, status_code: int, payload: Dict, headers: Optional[Dict] = None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+        self.text = ''
+
+    def json(self) -> Dict:
+        return self._payload
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            import requests
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error", response=self)
+
+class FakeITunesSession:
+    """Stands in for the shared requests.Session inside AppleMusicFreeClient"""
+
+    def __init__(self, catalog: Catalog, upstream: Upstream):
+        self.catalog = catalog
+        self.upstream = upstream
+
+    @staticmethod
+    def _result(track: Dict) -> Dict:
+        return {
+            'trackId': 1000000 + track['n'],
+            'trackName': track['title'],
+            'artistName': track['artist'],
+            'collectionName': track['album'],
+            'trackTimeMillis': track['duration_ms'],
+            'previewUrl': f"https://audio.example/{track['n']}.m4a",
+            'trackViewUrl': f"https://music.apple.com/us/song/{1000000 + track['n']}",
+            'artworkUrl100': 'https://art.example/100x100.jpg',
+        }
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> FakeResponse:
+        operation = url.rsplit('/', 1)[-1]
+        try:
+            self.upstream.call(operation)
+        except UpstreamError as e:
+            return FakeResponse(e.http_status, {}, e.headers)
+
+        params = params or {}
+        if operation == 'lookup':
+            n = int(params['id']) - 1000000
+            found = [self.catalog.tracks[n]] if 0 <= n < len(self.catalog.tracks) else []
+        else:
+            found = self.catalog.search(params.get('term', ''), int(params.get('limit', 5)))
+
+        results = [self._result(t) for t in found]
+        return FakeResponse(200, {'resultCount': len(results), 'results': results})
+
+class TimedMatchMixin:
+    """Records wall time of every match_track call (per-track latency)"""
+
+    def match_track(self, track: Track) -> Optional[MatchResult]:
+        started = time.perf_counter()
+        try:
+            return super().match_track(track)
+        finally:
+            with self.latency_lock:
+                self.latencies.append(time.perf_counter() - started)
+
+def _init_standin(platform: MusicPlatform, name: str, client_rate: Optional[float]) -> None:
+    # Client-side budget: the production one unless overridden
+    # (Apple Music's 1 request / 1.2s would take hours at 5,000 tracks)
+    rate, burst = (client_rate, max(1, int(client_rate))) if client_rate else type(platform).RATE_LIMIT
+    MusicPlatform.__init__(
+        platform,
+        name,
+        RateLimiter(rate=rate, burst=burst),
+        ResiliencePolicy(name, retry=RetryPolicy(max_attempts=4, base_delay=0.05, max_delay=2))
+    )
+    platform.latencies = []
+    platform.latency_lock = threading.Lock()
+
+class StandInSpotify(TimedMatchMixin, SpotifyPlatform):
+    def __init__(self, catalog, upstream, playlists, client_rate=None):
+        _init_standin(self, 'spotify', client_rate)
+        self.export_resilience = self.resilience
+        self.client = object.__new__(SpotifyClient)
+        self.client.sp = FakeSpotipy(catalog, upstream, playlists)
+
+class StandInYouTubeMusic(TimedMatchMixin, YouTubeMusicPlatform):
+    def __init__(self, catalog, upstream, playlists, client_rate=None):
+        _init_standin(self, 'youtube_music', client_rate)
+        self.client = object.__new__(YouTubeMusicClient)
+        self.client.ytmusic = FakeYTMusic(catalog, upstream, playlists)
+
+class StandInAppleMusic(TimedMatchMixin, AppleMusicPlatform):
+    def __init__(self, catalog, upstream, playlists, client_rate=None):
+        _init_standin(self, 'apple_music', client_rate)
+        self.client = AppleMusicFreeClient(resilience=self.resilience)
+        self.client.session = FakeITunesSession(catalog, upstream)
+
+STANDINS = {
+    'spotify': StandInSpotify,
+    'youtube_music': StandInYouTubeMusic,
+    'apple_music': StandInAppleMusic,
+}
+
+def install_standins(catalog: Catalog, upstreams: Dict[str, Upstream],
+                     playlists: Dict[str, List[Dict]], client_rate: Optional[float] = None) -> Dict[str, MusicPlatform]:
+    """Replace the shared platform handlers with stand-ins"""
+    handlers = {
+        name: standin(catalog, upstreams[name], playlists, client_rate)
+        for name, standin in STANDINS.items()
+    }
+    registry._instances.clear()
+    registry._instances.update(handlers)
+    return handlers
@@ -0,0 +1,119 @@
+# backend/checkpoints.py
+
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Dict, Iterator, Optional, Tuple
+
+from models import Track
+from session_backends.base import SessionBackend
+from track_keys import dedupe_keys
+
+CHECKPOINT_PREFIX = 'checkpoint:'
+CHECKPOINT_TTL = int(os.getenv('CHECKPOINT_TTL', str(24 * 3600)))
+# A checkpoint nobody has written for this long belongs to a worker that died
+CHECKPOINT_STALE_AFTER = float(os.getenv('CHECKPOINT_STALE_AFTER', '60'))
+# Leases on checkpoints: the worker running a conversion renews its lease every
+# third of this, so only one worker ever runs (or resumes) it
+CHECKPOINT_LEASE_PREFIX = 'lease:checkpoint:'
+CHECKPOINT_LEASE_TTL = int(os.getenv('CHECKPOINT_LEASE_TTL', '30'))
+
+def checkpoint_key(source_platform: str, playlist_id: str, target_platform: str) -> str:
+    """One checkpoint per source playlist and target"""
+    return f"{CHECKPOINT_PREFIX}{source_platform}:{playlist_id}:{target_platform}"
+
+def track_identity(track: Track) -> Optional[str]:
+    """Stable key for a track's match in a checkpoint (survives playlist edits)"""
+    keys = dedupe_keys(track)
+    if not keys:
+        return None
+
+    kind, value = keys[0]
+    return f"{kind}:{value}"
+
+class CheckpointStore:
+    """
+    Conversion progress kept in the session backend
+
+    A checkpoint holds the extracted source tracks, the matches found so
+    far (by track identity) and, once it has one, the session the
+    conversion is filling in. It is rewritten as matching progresses and
+    deleted when the conversion finishes, so whatever is left over after
+    a restart is work that can be picked up again.
+    """
+
+    def __init__(self, backend: SessionBackend):
+        self.backend = backend
+        # Who this worker is, as far as leases are concerned
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def _lease_key(self, key: str) -> str:
+        return f"{CHECKPOINT_LEASE_PREFIX}{key[len(CHECKPOINT_PREFIX):]}"
+
+    def claim(self, key: str) -> bool:
+        """Take the lease on a checkpoint, False if another worker holds it"""
+        return self.backend.set_if_absent(self._lease_key(key), self.owner, CHECKPOINT_LEASE_TTL)
+
+    def renew(self, key: str) -> bool:
+        """
+        Extend this worker's lease, False if it lapsed and someone else took it
+
+        Not atomic, but renewals come every third of the TTL: the lease
+        can only change hands in between if this worker stalled for
+        longer than that.
+        """
+        lease = self._lease_key(key)
+        holder = self.backend.get(lease)
+        if holder is None:
+            return self.claim(key)
+        if holder != self.owner:
+            return False
+
+        self.backend.set(lease, self.owner, CHECKPOINT_LEASE_TTL)
+        return True
+
+    def release(self, key: str) -> None:
+        lease = self._lease_key(key)
+        if self.backend.get(lease) == self.owner:
+            self.backend.delete(lease)
+
+    def load(self, key: str) -> Optional[Dict]:
+        data = self.backend.get(key)
+        return json.loads(data) if data else None
+
+    def save(self, key: str, checkpoint: Dict) -> None:
+        checkpoint['updated_at'] = time.time()
+        self.backend.set(key, json.dumps(checkpoint), CHECKPOINT_TTL)
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def orphaned(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        Checkpoints of background conversions whose worker went away
+
+        Only conversions that already handed out a session code are
+        worth resuming unprompted; the rest resume when the same playlist
+        is converted again. Each one is claimed before it is yielded
+        (and checked again under the claim), so a conversion that is
+        still running, or that another worker is resuming, is skipped.
+        The caller owns the lease from then on.
+        """
+        cutoff = time.time() - CHECKPOINT_STALE_AFTER
+
+        def resumable(checkpoint: Optional[Dict]) -> bool:
+            return bool(checkpoint and checkpoint.get('session_code') and checkpoint['updated_at'] < cutoff)
+
+        for key in self.backend.keys(CHECKPOINT_PREFIX):
+            if not resumable(self.load(key)) or not self.claim(key):
+                continue
+
+            # It may have moved on (or finished) between the read and the claim
+            checkpoint = self.load(key)
+            if not resumable(checkpoint):
+                self.release(key)
+                continue
+
+            yield key, checkpoint
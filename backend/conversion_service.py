@@ -0,0 +1,179 @@
+# backend/conversion_service.py
+
+import os
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+from session_manager import SessionManager
+from universal_converter import ConversionJob, UniversalConverter
+
+# How long a finished (or still running) conversion is handed out again for the same request
+CONVERT_DEDUPE_TTL = int(os.getenv('CONVERT_DEDUPE_TTL', '600'))
+
+class ConversionService:
+    """
+    Runs conversions into sessions, once per identical request
+
+    Requests are identical when they name the same source playlist (by
+    parsed id, so URL variants match) and the same target. A request
+    identical to one in flight in this worker waits for it and gets the
+    same session. Otherwise, one that also matches the playlist snapshot
+    (where the source exposes one) of a conversion started in the last
+    CONVERT_DEDUPE_TTL seconds (by any worker) gets that session right
+    away, even while it is still pending. Only that check fetches the
+    snapshot, requests waiting on one in flight don't.
+    """
+
+    def __init__(self, converter: UniversalConverter, session_manager: SessionManager):
+        self.converter = converter
+        self.session_manager = session_manager
+        # Conversion key -> Future resolving to the session code
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def convert(self, source_url: str, target_platform_name: str, time_budget: Optional[float] = None) -> Dict:
+        """
+        Convert a playlist into a session (or reuse an identical one)
+
+        Returns:
+            Dict with the session code, platforms, stats, pending flag and
+            whether an existing conversion was reused (`deduplicated`)
+        """
+        resolved = self.converter.resolve(source_url, target_platform_name)
+        return self._once(
+            self.converter.conversion_key(resolved),
+            lambda: self.converter.convert(source_url, target_platform_name, time_budget, resolved),
+            lambda: self.converter.playlist_snapshot(resolved)
+        )
+
+    def retarget(self, code: str, target_platform_name: str, time_budget: Optional[float] = None) -> Dict:
+        """
+        Convert an existing session's tracks to another target, as a new session
+
+        Skips extraction entirely (see UniversalConverter.retarget).
+        Identical retargets are deduplicated like conversions.
+
+        Returns:
+            Same as convert(); raises LookupError if the session is gone
+        """
+        session = self.session_manager.get_session(code)
+        if not session:
+            raise LookupError(f"Session {code} not found")
+
+        return self._once(
+            f"retarget:{self.converter.session_identity(session, code)}:{target_platform_name}",
+            lambda: self.converter.retarget(session, code, target_platform_name, time_budget)
+        )
+
+    def _once(
+        self,
+        key: str,
+        run: Callable[[], Dict],
+        snapshot: Optional[Callable[[], Optional[str]]] = None
+    ) -> Dict:
+        """Run a conversion into a new session unless an identical one exists or is running"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+
+        if not owner:
+            print("♻️ Identical conversion in flight, waiting for it")
+            response = self._existing(future.result())
+            if response:
+                return response
+            # The session vanished in the meantime, fall through and redo it
+
+        try:
+            response = self._reuse_or_run(key, run, snapshot)
+        except Exception as e:
+            if owner:
+                future.set_exception(e)
+            raise
+        finally:
+            if owner:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+
+        if owner:
+            future.set_result(response['code'])
+
+        return response
+
+    def _reuse_or_run(
+        self,
+        key: str,
+        run: Callable[[], Dict],
+        snapshot: Optional[Callable[[], Optional[str]]]
+    ) -> Dict:
+        """Hand out a recent identical conversion's session, or run this one"""
+        recent_key = f"convert:{key}:{snapshot() or '-'}" if snapshot else f"convert:{key}"
+
+        code = self.session_manager.backend.get(recent_key)
+        if code:
+            response = self._existing(code)
+            if response:
+                print(f"♻️ Reusing session {code} from an identical conversion")
+                return response
+
+        result = run()
+        code = self.session_manager.save_session(
+            tracks=result['tracks'],
+            target_platform=result['target_platform'],
+            source_platform=result['source_platform'],
+            pending=result['pending'],
+            stats=result['stats']
+        )
+
+        if result['pending']:
+            # Fill the session in as the rest of the playlist matches
+            self.follow(result['job'], code)
+
+        self.session_manager.backend.set(recent_key, code, CONVERT_DEDUPE_TTL)
+
+        return {
+            'code': code,
+            'source_platform': result['source_platform'],
+            'target_platform': result['target_platform'],
+            'stats': result['stats'],
+            'pending': result['pending'],
+            'deduplicated': False
+        }
+
+    def _existing(self, code: str) -> Optional[Dict]:
+        """Response for an existing session, None if it is gone or failed"""
+        session = self.session_manager.get_session(code)
+        if not session or session.get('error'):
+            return None
+
+        return {
+            'code': code,
+            'source_platform': session.get('source_platform'),
+            'target_platform': session['target_platform'],
+            'stats': self.converter.session_stats(session),
+            'pending': session.get('pending', False),
+            'deduplicated': True
+        }
+
+    def follow(self, job: ConversionJob, code: str) -> None:
+        """Write a background conversion's progress into its session"""
+        job.session_code = code
+        job.on_progress(
+            lambda snapshot: self.session_manager.update_session(
+                code,
+                tracks=snapshot['tracks'],
+                stats=snapshot['stats'],
+                pending=snapshot['pending'],
+                error=snapshot['error']
+            )
+        )
+
+    def resume(self) -> None:
+        """Pick up background conversions a previous worker didn't finish"""
+        jobs = self.converter.resume_checkpoints(
+            lambda checkpoint: self.session_manager.session_exists(checkpoint['session_code'])
+        )
+        for job in jobs:
+            self.follow(job, job.session_code)
@@ -0,0 +1,93 @@
+# backend/export_pipeline.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+from models import MatchedTrack, Track
+from platforms.spotify import SpotifyPlatform
+
+EXPORT_WORKERS = int(os.getenv('EXPORT_WORKERS', '8'))
+
+class SpotifyExporter:
+    """
+    Export a saved session to a real Spotify playlist
+
+    Spotify ids already present in the session are reused (either the
+    source `spotify_id` or the one matched during conversion). Only the
+    remaining tracks are re-matched, concurrently, under the platform's
+    rate limiter.
+    """
+
+    def __init__(self, platform: SpotifyPlatform, max_workers: int = EXPORT_WORKERS):
+        self.platform = platform
+        self.max_workers = max_workers
+
+    def _resolve_track(self, track: Track) -> Optional[str]:
+        """Match a track without a Spotify id, returns its id or None"""
+        try:
+            result = self.platform.match_track(track)
+        except Exception as e:
+            print(f"   ⚠️  Spotify search failed for '{track.title}': {e}")
+            return None
+
+        return result.id if result else None
+
+    @staticmethod
+    def _known_id(matched: MatchedTrack) -> Optional[str]:
+        if matched.track.spotify_id:
+            return matched.track.spotify_id
+        if matched.match and matched.match.platform == 'spotify':
+            return matched.match.id
+        return None
+
+    def resolve_ids(self, tracks: List[MatchedTrack]) -> List[Optional[str]]:
+        """
+        Get a Spotify id for every track, in playlist order
+
+        Returns:
+            List of ids (None where no match was found)
+        """
+        ids = [self._known_id(track) for track in tracks]
+        missing = [i for i, track_id in enumerate(ids) if not track_id]
+
+        if missing:
+            print(f"   Resolving {len(missing)}/{len(tracks)} tracks without a Spotify id...")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                resolved = pool.map(self._resolve_track, [tracks[i].track for i in missing])
+                for i, track_id in zip(missing, resolved):
+                    ids[i] = track_id
+
+        return ids
+
+    def export(self, tracks: List[MatchedTrack], access_token: str, playlist_name: str) -> Dict:
+        """
+        Create the playlist and add every resolvable track
+
+        Returns:
+            Report with the playlist id and exactly what was (not) added
+        """
+        ids = self.resolve_ids(tracks)
+
+        playlist_id = self.platform.create_playlist(
+            access_token,
+            playlist_name,
+            "Created with AuxParty 🎵"
+        )
+
+        uris = [f"spotify:track:{track_id}" for track_id in ids if track_id]
+        result = self.platform.add_tracks_to_playlist(access_token, playlist_id, uris) if uris else {'added': [], 'failed': []}
+
+        unmatched = [
+            {'title': matched.track.title, 'artist': matched.track.artist}
+            for matched, track_id in zip(tracks, ids)
+            if not track_id
+        ]
+
+        return {
+            'playlist_id': playlist_id,
+            'tracks_added': len(result['added']),
+            'tracks_failed': len(result['failed']),
+            'tracks_unmatched': len(unmatched),
+            'failed_uris': result['failed'],
+            'unmatched': unmatched
+        }
@@ -0,0 +1,207 @@
+# backend/fair_scheduler.py
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from rate_limiter import RateLimiter
+
+# Jobs matching at most this many unique tracks count as small...
+SMALL_JOB_TRACKS = int(os.getenv('SCHEDULER_SMALL_JOB_TRACKS', '200'))
+# ...and get this many requests per round for every one a large job gets
+SMALL_JOB_WEIGHT = int(os.getenv('SCHEDULER_SMALL_JOB_WEIGHT', '4'))
+
+class Job:
+    """
+    One conversion (or batch match) competing for upstream budget
+
+    `size` may grow while the job runs (tracks still streaming in), a job
+    stops counting as small once it passes SMALL_JOB_TRACKS.
+    """
+
+    __slots__ = ('name', 'size')
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+
+    @property
+    def weight(self) -> int:
+        return SMALL_JOB_WEIGHT if self.size <= SMALL_JOB_TRACKS else 1
+
+    def __repr__(self) -> str:
+        return f"Job({self.name!r}, size={self.size}, weight={self.weight})"
+
+# The job the current thread is working for (set by the match engine per worker task)
+current_job: ContextVar[Optional[Job]] = ContextVar('current_job', default=None)
+
+# Requests made outside any job (playlist extraction, exports) share this one
+_untracked = Job('untracked', 0)
+
+class _DeficitRoundRobin:
+    """
+    Per-job FIFO queues served by deficit round-robin (caller holds a lock)
+
+    Every job with items queued gets `weight` items per round, in turn
+    order; idle jobs leave the rotation and don't bank credit.
+    """
+
+    def __init__(self):
+        # Jobs with items queued, in turn order (head = current turn)
+        self._rotation: Deque[Job] = deque()
+        # Per job: FIFO of its items and how many it may still take this turn
+        self._queues: Dict[Job, Deque[Any]] = {}
+        self._deficit: Dict[Job, int] = {}
+
+    def __len__(self) -> int:
+        """Jobs with items queued"""
+        return len(self._rotation)
+
+    def push(self, job: Job, item: Any) -> None:
+        if job not in self._queues:
+            self._rotation.append(job)
+            self._queues[job] = deque()
+            self._deficit[job] = 0
+        self._queues[job].append(item)
+
+    def _start_turn(self) -> None:
+        head = self._rotation[0]
+        self._deficit[head] += head.weight
+
+    def head(self) -> Tuple[Job, Any]:
+        """The job owed the next item, and that item (queue must not be empty)"""
+        while self._deficit[self._rotation[0]] < 1:
+            self._rotation.rotate(-1)
+            self._start_turn()
+        job = self._rotation[0]
+        return job, self._queues[job][0]
+
+    def pop(self, job: Job) -> Any:
+        """Take the item head() returned"""
+        self._deficit[job] -= 1
+        item = self._queues[job].popleft()
+        if not self._queues[job]:
+            self._rotation.popleft()
+            del self._queues[job], self._deficit[job]
+            if self._rotation:
+                self._start_turn()
+        return item
+
+    def drain(self) -> Iterator[Any]:
+        """Remove and yield every queued item"""
+        for queue in self._queues.values():
+            yield from queue
+        self._rotation.clear()
+        self._queues.clear()
+        self._deficit.clear()
+
+class FairScheduler:
+    """
+    Deficit round-robin over one platform's rate limiter
+
+    Instead of whichever thread polls the token bucket first winning,
+    waiting requests queue per job and tokens are handed out a round at a
+    time: every job with requests waiting gets `weight` tokens per round,
+    small jobs a few more than large ones. A 5,000-track conversion then
+    takes whatever budget is left over rather than starving a 20-track
+    one queued behind it. Requests within a job stay FIFO.
+    """
+
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
+        self._waiting = _DeficitRoundRobin()
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until it is this request's turn and a token is free"""
+        active_job = current_job.get() or _untracked
+        ticket = object()
+
+        with self._cond:
+            self._waiting.push(active_job, ticket)
+            # The rotation changed, whoever is owed the next token must notice
+            self._cond.notify_all()
+
+            while True:
+                head, head_ticket = self._waiting.head()
+                if head_ticket is not ticket:
+                    # Someone else's turn, wake up when a token is handed out
+                    self._cond.wait()
+                    continue
+
+                wait = self.limiter.try_acquire()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+
+                self._waiting.pop(head)
+                self._cond.notify_all()
+                return
+
+    def active_jobs(self) -> int:
+        """Jobs currently waiting for budget"""
+        with self._cond:
+            return len(self._waiting)
+
+class FairExecutor:
+    """
+    Thread pool whose queue is fair between jobs
+
+    A ThreadPoolExecutor runs tasks in submission order, so once a few
+    large jobs have queued their windows a small job's tasks wait behind
+    all of them before any platform scheduler sees them. Here tasks
+    queue per job and each free worker takes the next one by deficit
+    round-robin, with the same weights as FairScheduler: a small job's
+    tasks go ahead of the large jobs' backlog.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = 'fair'):
+        self._queue = _DeficitRoundRobin()
+        self._cond = threading.Condition()
+        self._shutdown = False
+        for n in range(max_workers):
+            threading.Thread(target=self._work, name=f'{thread_name_prefix}_{n}', daemon=True).start()
+
+    def submit(self, job: Optional[Job], fn: Callable, *args) -> Future:
+        """Queue `fn(*args)` for `job` (None = outside any job)"""
+        future = Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+            self._queue.push(job or _untracked, (future, fn, args))
+            self._cond.notify()
+        return future
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not len(self._queue) and not self._shutdown:
+                    self._cond.wait()
+                if not len(self._queue):
+                    return
+                job, _ = self._queue.head()
+                future, fn, args = self._queue.pop(job)
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, cancel_futures: bool = False) -> None:
+        """Stop taking tasks; queued ones still run unless `cancel_futures`"""
+        with self._cond:
+            self._shutdown = True
+            cancelled = list(self._queue.drain()) if cancel_futures else []
+            self._cond.notify_all()
+
+        for future, _, _ in cancelled:
+            # Also wakes anyone in concurrent.futures.wait() on it
+            future.cancel()
+            future.set_running_or_notify_cancel()
@@ -0,0 +1,133 @@
+# backend/http_cache.py
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from metrics import record_cache
+from session_backends.base import SessionBackend
+from session_backends.memory_backend import MemorySessionBackend
+from session_manager import create_backend
+
+HTTP_CACHE_PREFIX = 'http:'
+
+# Cacheable upstream endpoints: (method, host, path) -> TTL in seconds.
+# Only anonymous catalog reads belong here, never anything user specific.
+HTTP_CACHE_TTLS: Dict[Tuple[str, str, str], int] = {
+    ('GET', 'itunes.apple.com', '/search'): int(os.getenv('HTTP_CACHE_SEARCH_TTL', '3600')),
+    ('GET', 'itunes.apple.com', '/lookup'): int(os.getenv('HTTP_CACHE_LOOKUP_TTL', str(24 * 3600))),
+    ('GET', 'api.spotify.com', '/v1/search'): int(os.getenv('HTTP_CACHE_SEARCH_TTL', '3600')),
+    ('POST', 'music.youtube.com', '/youtubei/v1/search'): int(os.getenv('HTTP_CACHE_SEARCH_TTL', '3600')),
+}
+
+# Cached bodies are stored decoded, these headers would no longer be true
+_DROPPED_HEADERS = ('Content-Encoding', 'Content-Length', 'Transfer-Encoding')
+
+class ResponseCache:
+    """
+    Upstream responses by request, for the transport adapter
+
+    Keyed by method + URL + sorted query params (+ canonical JSON body
+    for POST searches), so the same search made by two conversions, or
+    by two normalizations of a track that end up identical, hits the
+    network once per TTL. Auth headers are not part of the key: only
+    endpoints whose answer doesn't depend on who asks are cached. Only
+    200 responses are stored.
+    """
+
+    def __init__(self, backend: SessionBackend, ttls: Dict[Tuple[str, str, str], int] = HTTP_CACHE_TTLS):
+        self.backend = backend
+        self.ttls = ttls
+
+    def ttl(self, request: requests.PreparedRequest) -> Optional[int]:
+        """How long this request's response may be reused (None = not cacheable)"""
+        url = urlsplit(request.url)
+        return self.ttls.get((request.method, url.hostname, url.path))
+
+    def key(self, request: requests.PreparedRequest) -> str:
+        url = urlsplit(request.url)
+        params = urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+        parts = [request.method, f"{url.hostname}{url.path}", params]
+
+        if request.body:
+            body = request.body.decode() if isinstance(request.body, bytes) else request.body
+            try:
+                body = json.dumps(json.loads(body), sort_keys=True, separators=(',', ':'))
+            except ValueError:
+                pass
+            parts.append(body)
+
+        digest = hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+        return f"{HTTP_CACHE_PREFIX}{url.hostname}:{digest}"
+
+    def get(self, request: requests.PreparedRequest) -> Optional[requests.Response]:
+        data = self.backend.get(self.key(request))
+        record_cache('http', data is not None)
+        if data is None:
+            return None
+
+        stored = json.loads(data)
+        response = requests.Response()
+        response.status_code = stored['status']
+        response.reason = stored['reason']
+        response.headers = CaseInsensitiveDict(stored['headers'])
+        response.encoding = stored['encoding']
+        response._content = base64.b64decode(stored['content'])
+        response.url = request.url
+        response.request = request
+        return response
+
+    def store(self, request: requests.PreparedRequest, response: requests.Response, ttl: int) -> None:
+        if response.status_code != 200:
+            return
+
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.title() not in _DROPPED_HEADERS
+        }
+        self.backend.set(self.key(request), json.dumps({
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': headers,
+            'encoding': response.encoding,
+            'content': base64.b64encode(response.content).decode()
+        }), ttl)
+
+_cache: Optional[ResponseCache] = None
+_cache_ready = False
+_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Process-wide response cache
+
+    HTTP_CACHE_BACKEND=memory (default, per worker) or any SESSION_BACKEND
+    name (redis, tiered) to share it between workers. HTTP_CACHE=false
+    turns it off.
+    """
+    global _cache, _cache_ready
+
+    if not _cache_ready:
+        with _cache_lock:
+            if not _cache_ready:
+                if os.getenv('HTTP_CACHE', 'true').lower() == 'true':
+                    name = os.getenv('HTTP_CACHE_BACKEND', 'memory').lower()
+                    if name == 'memory':
+                        backend = MemorySessionBackend(
+                            max_entries=int(os.getenv('HTTP_CACHE_MAX_ENTRIES', '50000')),
+                            max_bytes=int(os.getenv('HTTP_CACHE_MAX_BYTES', str(128 * 1024 * 1024)))
+                        )
+                    else:
+                        backend = create_backend(name)
+                    _cache = ResponseCache(backend)
+                _cache_ready = True
+
+    return _cache
@@ -0,0 +1,137 @@
+# backend/http_transport.py
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from metrics import record_upstream_request, UPSTREAM_HOSTS
+from profiling import add_timing
+from http_cache import ResponseCache, get_response_cache
+
+# (connect, read) timeout applied to every request that doesn't pass its own
+DEFAULT_TIMEOUT = (
+    float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05')),
+    float(os.getenv('HTTP_READ_TIMEOUT', '15'))
+)
+
+# Max pooled (and concurrent) connections per upstream host
+DEFAULT_HOST_LIMIT = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))
+HOST_LIMITS = {
+    'https://api.spotify.com': 20,
+    'https://accounts.spotify.com': 5,
+    'https://itunes.apple.com': 10,
+    'https://music.youtube.com': 10,
+}
+
+USER_AGENT = 'AuxParty/1.0'
+
+# Rate limit wait for requests about to leave the process, set by a platform around
+# its searches (see MusicPlatform._throttled). Requests answered from the cache skip it.
+network_gate: ContextVar[Optional[Callable[[], None]]] = ContextVar('network_gate', default=None)
+
+def enter_network() -> None:
+    """Wait at the caller's network gate, if it set one (right before a request goes out)"""
+    gate = network_gate.get()
+    if gate is not None:
+        gate()
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with a default timeout so no call can hang forever
+
+    Also records per-platform latency and status codes for /metrics, and
+    answers cacheable catalog requests (see http_cache) from `cache`
+    without touching the network, or the caller's rate limit: the
+    network gate is only passed on a cache miss.
+    """
+
+    def __init__(self, *args, timeout=DEFAULT_TIMEOUT, cache: Optional[ResponseCache] = None, **kwargs):
+        self.timeout = timeout
+        self.cache = cache
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        ttl = self.cache.ttl(request) if self.cache is not None else None
+        if ttl:
+            try:
+                cached = self.cache.get(request)
+                if cached is not None:
+                    cached.connection = self
+                    return cached
+            except Exception as e:
+                print(f"⚠️ HTTP cache read failed: {e}")
+
+        enter_network()
+        response = self._send(request, **kwargs)
+
+        if ttl:
+            try:
+                self.cache.store(request, response, ttl)
+            except Exception as e:
+                print(f"⚠️ HTTP cache write failed: {e}")
+        return response
+
+    def _send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+
+        host = urlsplit(request.url).hostname or ''
+        started = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            record_upstream_request(host, 'error', time.perf_counter() - started)
+            raise
+
+        elapsed = time.perf_counter() - started
+        record_upstream_request(host, response.status_code, elapsed)
+        add_timing(f"upstream.{UPSTREAM_HOSTS.get(host, 'other')}", elapsed)
+        return response
+
+def _build_adapter(max_connections: int) -> TimeoutHTTPAdapter:
+    return TimeoutHTTPAdapter(
+        cache=get_response_cache(),
+        pool_connections=len(HOST_LIMITS) + 4,
+        pool_maxsize=max_connections,
+        pool_block=True,  # Wait for a free connection instead of exceeding the host limit
+        max_retries=0     # Retries are decided by the caller, not hidden in the transport
+    )
+
+def build_session() -> requests.Session:
+    """Create a pooled keep-alive session with per-host connection limits"""
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+
+    default_adapter = _build_adapter(DEFAULT_HOST_LIMIT)
+    session.mount('https://', default_adapter)
+    session.mount('http://', default_adapter)
+
+    # Longest prefix wins, so these override the default for their host
+    for host, limit in HOST_LIMITS.items():
+        session.mount(host, _build_adapter(limit))
+
+    return session
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    Process-wide shared HTTP session
+
+    Every platform client (spotipy, ytmusicapi, iTunes, Spotify Web API
+    calls) goes through this one session so TLS connections are reused
+    across conversions and exports.
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+
+    return _session
@@ -0,0 +1,210 @@
+# backend/identity_graph.py
+
+import json
+import os
+import threading
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Tuple
+
+from models import SOURCE_ID_KEYS, TRACK_URLS, MatchResult, Track
+from metrics import record_cache
+from session_backends.base import SessionBackend
+from session_manager import create_backend
+
+IDENTITY_PREFIX = 'identity:'
+IDENTITY_TTL = int(os.getenv('IDENTITY_TTL', str(30 * 24 * 3600)))
+# Only matches at least this confident link two ids as the same song
+IDENTITY_MIN_CONFIDENCE = float(os.getenv('IDENTITY_MIN_CONFIDENCE', '0.9'))
+
+def track_nodes(track: Track) -> List[str]:
+    """The ids a track is known by ("spotify:<id>", "isrc:<code>", ...)"""
+    nodes = [
+        f"{key[:-len('_id')]}:{value}"
+        for key in SOURCE_ID_KEYS
+        if (value := getattr(track, key))
+    ]
+    if track.isrc:
+        nodes.append(f"isrc:{track.isrc.upper()}")
+    return nodes
+
+class IdentityGraph:
+    """
+    Which platform ids are the same song, across every platform pair
+
+    A union-find over "<platform>:<id>" and "isrc:<code>" nodes kept in a
+    session backend: every node points at a parent, and the root of a set
+    holds one record per platform (enough to answer a match without a
+    search). A confident Spotify -> YouTube Music match and a Spotify ->
+    Apple Music match of the same track put all three ids in one set, so
+    YouTube Music -> Apple Music and Apple Music -> Spotify conversions of
+    that song are answered from it too.
+
+    A union locks only the roots it merges (see SessionBackend.lock,
+    shared by every worker on Redis and tiered with a Redis hot tier;
+    on the other backends it only covers this worker), in sorted order,
+    so unions of unrelated songs run side by side. Lookups never write:
+    path compression and cycle repair happen only under those locks.
+    Unions racing without a shared lock could still leave parent
+    pointers that form a cycle, so the walk detects cycles instead of
+    going round forever.
+    """
+
+    def __init__(self, backend: SessionBackend, ttl: int = IDENTITY_TTL):
+        self.backend = backend
+        self.ttl = ttl
+
+    def _parent_key(self, node: str) -> str:
+        return f"{IDENTITY_PREFIX}parent:{node}"
+
+    def _set_key(self, root: str) -> str:
+        return f"{IDENTITY_PREFIX}set:{root}"
+
+    def _walk(self, node: str) -> Tuple[str, List[str], bool]:
+        """
+        Follow parent pointers without writing anything
+
+        Returns:
+            (root, nodes walked before it, whether it broke a cycle). In a
+            cycle left by racing unions the smallest node counts as the root.
+        """
+        path = []
+        root = node
+        while (parent := self.backend.get(self._parent_key(root))) is not None:
+            path.append(root)
+            if parent in path:
+                cycle = path[path.index(parent):]
+                root = min(cycle)
+                return root, [visited for visited in path if visited != root], True
+            root = parent
+        return root, path, False
+
+    def find(self, node: str) -> str:
+        """Root of a node's set (the node itself if it was never linked), read-only"""
+        return self._walk(node)[0]
+
+    def _compress(self, node: str) -> None:
+        """
+        Repair and compress a node's path (only while holding its root's lock)
+
+        Points everything walked straight at the root, and a root left
+        with a parent by a cycle loses it.
+        """
+        root, path, cyclic = self._walk(node)
+        if cyclic:
+            print(f"⚠️ Identity graph cycle through {len(path) + 1} nodes, repairing at {root}")
+            self.backend.delete(self._parent_key(root))
+        else:
+            # The last node walked already points at the root
+            path = path[:-1]
+
+        for visited in path:
+            self.backend.set(self._parent_key(visited), root, self.ttl)
+
+    def _load_set(self, root: str) -> Dict:
+        data = self.backend.get(self._set_key(root))
+        return json.loads(data) if data else {'size': 1, 'tracks': {}}
+
+    def lookup(self, track: Track, platform: str) -> Optional[MatchResult]:
+        """The track's id on `platform`, if any of its ids was linked to one"""
+        for node in track_nodes(track):
+            data = self.backend.get(self._set_key(self.find(node)))
+            if data:
+                record = json.loads(data)['tracks'].get(platform)
+                if record:
+                    record_cache('identity', True)
+                    return MatchResult.from_dict({**record, 'method': 'identity'})
+
+        record_cache('identity', False)
+        return None
+
+    def link(self, track: Track, match: MatchResult) -> None:
+        """Record that `track` is `match` (if the match is confident enough)"""
+        if match.confidence < IDENTITY_MIN_CONFIDENCE:
+            return
+
+        nodes = track_nodes(track) + [f"{match.platform}:{match.id}"]
+        records = {match.platform: match.to_dict()}
+        for node in nodes:
+            platform, _, platform_id = node.partition(':')
+            if platform in records or platform == 'isrc':
+                continue
+            # The source side, so the reverse direction can be answered too
+            records[platform] = MatchResult(
+                platform=platform,
+                id=platform_id,
+                title=track.title,
+                artist=track.artist,
+                album=track.album,
+                confidence=match.confidence,
+                url=TRACK_URLS[platform].format(id=platform_id) if platform in TRACK_URLS else None
+            ).to_dict()
+
+        while True:
+            roots = sorted(set(self.find(node) for node in nodes))
+            with ExitStack() as locks:
+                try:
+                    for root in roots:
+                        locks.enter_context(self.backend.lock(f"{IDENTITY_PREFIX}root:{root}"))
+                except Exception as e:
+                    print(f"⚠️ Identity link of {', '.join(nodes)} dropped, could not lock its sets: {e}")
+                    return
+
+                # Another union may have moved a root under a new one before we got its lock
+                if sorted(set(self.find(node) for node in nodes)) != roots:
+                    continue
+
+                for node in nodes:
+                    self._compress(node)
+                self._union(roots, records)
+                return
+
+    def _union(self, roots: List[str], records: Dict[str, Dict]) -> None:
+        """Merge the sets of `roots` (all locked) and add `records` to the result"""
+        sets = {root: self._load_set(root) for root in roots}
+
+        # Union by size: the largest set's root stays the root (the smallest key on ties,
+        # so unions of the same sets always agree on it)
+        root = min(roots, key=lambda r: (-sets[r]['size'], r))
+        merged = sets[root]
+        for other in roots:
+            if other == root:
+                continue
+            merged['size'] += sets[other]['size']
+            for platform, record in sets[other]['tracks'].items():
+                merged['tracks'].setdefault(platform, record)
+            self.backend.set(self._parent_key(other), root, self.ttl)
+            self.backend.delete(self._set_key(other))
+
+        for platform, record in records.items():
+            known = merged['tracks'].get(platform)
+            if not known or known['confidence'] < record['confidence']:
+                merged['tracks'][platform] = record
+
+        self.backend.set(self._set_key(root), json.dumps(merged), self.ttl)
+
+_graph: Optional[IdentityGraph] = None
+_graph_ready = False
+_graph_lock = threading.Lock()
+
+def get_identity_graph() -> Optional[IdentityGraph]:
+    """
+    Process-wide identity graph, in IDENTITY_BACKEND (default: SESSION_BACKEND)
+
+    None if it is turned off (IDENTITY_GRAPH=false) or its store can't be
+    reached; matching then just searches as before.
+    """
+    global _graph, _graph_ready
+
+    if not _graph_ready:
+        with _graph_lock:
+            if not _graph_ready:
+                if os.getenv('IDENTITY_GRAPH', 'true').lower() == 'true':
+                    try:
+                        backend = create_backend(os.getenv('IDENTITY_BACKEND') or None)
+                        backend.ping()
+                        _graph = IdentityGraph(backend)
+                    except Exception as e:
+                        print(f"⚠️ Identity graph disabled, its store is unavailable: {e}")
+                _graph_ready = True
+
+    return _graph
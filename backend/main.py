@@ -1,14 +1,23 @@
 # backend/main.py (ADD Apple Music support)
 from dotenv import load_dotenv
 load_dotenv()
-from fastapi import FastAPI, HTTPException
+import os
+import json
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 
 from universal_converter import UniversalConverter
+from checkpoints import CheckpointStore
+from conversion_service import ConversionService
 from platform_detector import PlatformDetector
 from session_manager import SessionManager
+from models import MatchedTrack, Track, deserialize_track, serialize_track
+from resilience import CircuitOpenError
+from profiling import TIMING_HEADER, PROFILE_HEADER, start_timing, stage, maybe_profile
 
 app = FastAPI(title="AuxParty API - Now with FREE Apple Music!")
 
@@ -20,15 +29,62 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def stage_timing_middleware(request: Request, call_next):
+    """
+    Opt-in diagnostics
+
+    `X-Debug-Timing: 1` returns a per-stage breakdown in the Server-Timing
+    response header. `X-Profile: 1` also writes a cProfile dump to
+    PROFILE_DIR (ignored unless that env var is set).
+    """
+    want_timing = request.headers.get(TIMING_HEADER) == '1'
+    want_profile = request.headers.get(PROFILE_HEADER) == '1'
+    
+    if not want_timing and not want_profile:
+        return await call_next(request)
+    
+    timings = start_timing()
+    with maybe_profile(want_profile, f"{request.method}-{request.url.path}"):
+        with stage('total'):
+            response = await call_next(request)
+    
+    if want_timing:
+        response.headers['Server-Timing'] = timings.to_server_timing()
+    return response
+
 # Initialize services
-converter = UniversalConverter()
 detector = PlatformDetector()
 session_manager = SessionManager()
+converter = UniversalConverter(detector, checkpoints=CheckpointStore(session_manager.backend))
+conversions = ConversionService(converter, session_manager)
+
+@app.on_event("startup")
+def resume_conversions():
+    """Pick up background conversions a previous worker didn't finish"""
+    try:
+        conversions.resume()
+    except Exception as e:
+        print(f"⚠️ Could not resume conversions: {e}")
 
 # Models
+# Default seconds a conversion may spend matching before returning a partial session
+CONVERT_TIME_BUDGET = float(os.getenv('CONVERT_TIME_BUDGET', '0')) or None
+
 class ConvertRequest(BaseModel):
     url: str
     target_platform: str = "youtube_music"
+    time_budget: Optional[float] = Field(default=CONVERT_TIME_BUDGET, gt=0)
+
+class BatchConvertItem(BaseModel):
+    # No time_budget: a batch always waits for every playlist (rejected rather than ignored)
+    model_config = ConfigDict(extra='forbid')
+    
+    url: str
+    target_platform: str = "youtube_music"
+
+class BatchConvertRequest(BaseModel):
+    items: List[BatchConvertItem]
 
 class PlatformInfo(BaseModel):
     name: str
@@ -40,22 +96,64 @@ class MatchStats(BaseModel):
     total: int
     matched: int
     failed: int
+    pending: int = 0
     match_rate: float
     avg_confidence: float
     high_confidence: int
     medium_confidence: int
     low_confidence: int
 
+class MatchItem(BaseModel):
+    title: str
+    artist: str
+    isrc: Optional[str] = None
+    duration_ms: Optional[int] = None
+
+    def to_track(self) -> Track:
+        return Track(title=self.title, artist=self.artist, isrc=self.isrc, duration_ms=self.duration_ms)
+
+class MatchRequest(BaseModel):
+    tracks: List[MatchItem]
+    target_platform: str = "youtube_music"
+
 class ConvertResponse(BaseModel):
     code: str
     share_url: str
     source_platform: str
     target_platform: str
     stats: MatchStats
+    pending: bool = False
+    deduplicated: bool = False
+
+class BatchConvertResult(BaseModel):
+    url: str
+    target_platform: str
+    code: Optional[str] = None
+    share_url: Optional[str] = None
+    source_platform: Optional[str] = None
+    stats: Optional[MatchStats] = None
+    error: Optional[str] = None
+
+class BatchStats(BaseModel):
+    playlists: int
+    converted: int
+    failed: int
+    total_tracks: int
+    unique_tracks: int
+    matched: int
+    match_rate: float
+
+class BatchConvertResponse(BaseModel):
+    results: List[BatchConvertResult]
+    stats: BatchStats
 
 class SessionResponse(BaseModel):
     tracks: List[dict]
+    target_platform: str  # ✅ Make it required, not optional
+    source_platform: Optional[str] = None
     stats: MatchStats
+    pending: bool = False
+    error: Optional[str] = None
 
 @app.get("/")
 async def root():
@@ -87,21 +185,26 @@ async def get_target_platforms():
 async def convert_playlist(request: ConvertRequest):
     """
     Convert a playlist from one platform to another
+    
+    With a `time_budget` (seconds), the session is created with whatever
+    matched in that time and `pending` set; the remaining tracks keep
+    matching in the background and are written into the same session.
+    Repeating an identical request (same playlist, target and playlist
+    version) returns the existing session instead of converting again.
     """
     try:
         print(f"\n🔄 New conversion request:")
         print(f"   URL: {request.url}")
         print(f"   Target: {request.target_platform}\n")
         
-        # Convert playlist
-        result = converter.convert(request.url, request.target_platform)
-        
-        # Save session with BOTH source and target platform info
-        code = session_manager.save_session(
-            tracks=result['tracks'],
-            target_platform=request.target_platform,  # ✅ Pass target!
-            source_platform=result['source_platform']  # ✅ Pass source!
+        # Convert playlist and save the session (blocking I/O, keep it off the event loop)
+        result = await run_in_threadpool(
+            conversions.convert,
+            request.url,
+            request.target_platform,
+            request.time_budget
         )
+        code = result['code']
         
         # Build share URL
         share_url = f"http://localhost:5173/join/{code}"
@@ -110,18 +213,25 @@ async def convert_playlist(request: ConvertRequest):
         print(f"   Session code: {code}")
         print(f"   Match rate: {result['stats']['match_rate']:.1%}\n")
         
-        return ConvertResponse(
-            code=code,
-            share_url=share_url,
-            source_platform=result['source_platform'],
-            target_platform=result['target_platform'],
-            stats=MatchStats(**result['stats'])
-        )
+        with stage('serialize'):
+            return ConvertResponse(
+                code=code,
+                share_url=share_url,
+                source_platform=result['source_platform'],
+                target_platform=result['target_platform'],
+                stats=MatchStats(**result['stats']),
+                pending=result['pending'],
+                deduplicated=result['deduplicated']
+            )
         
     except ValueError as e:
         print(f"❌ Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     
+    except CircuitOpenError as e:
+        print(f"❌ Upstream unavailable: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+    
     except Exception as e:
         print(f"❌ Server error: {e}")
         import traceback
@@ -131,14 +241,116 @@ async def convert_playlist(request: ConvertRequest):
             detail=f"Failed to convert playlist: {str(e)}"
         )
 
+
+BATCH_MAX_PLAYLISTS = int(os.getenv('BATCH_MAX_PLAYLISTS', '50'))
+
+@app.post("/api/convert/batch", response_model=BatchConvertResponse)
+async def convert_playlists(request: BatchConvertRequest):
+    """
+    Convert many playlists at once
+    
+    Tracks are deduplicated across the whole batch before matching, so
+    songs that appear in several playlists are only matched once. Every
+    playlist gets its own session code; a playlist that fails carries an
+    error instead and doesn't fail the batch.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No playlists to convert")
+    
+    if len(request.items) > BATCH_MAX_PLAYLISTS:
+        raise HTTPException(status_code=400, detail=f"Too many playlists (max {BATCH_MAX_PLAYLISTS} per batch)")
+    
+    print(f"\n🔄 Batch conversion request: {len(request.items)} playlists\n")
+    
+    try:
+        # Extraction and matching block, keep them off the event loop
+        batch = await run_in_threadpool(
+            converter.convert_batch,
+            [(item.url, item.target_platform) for item in request.items]
+        )
+    
+    except CircuitOpenError as e:
+        print(f"❌ Upstream unavailable: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    except Exception as e:
+        print(f"❌ Server error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to convert playlists: {str(e)}"
+        )
+    
+    results = []
+    for item, result in zip(request.items, batch['results']):
+        entry = BatchConvertResult(
+            url=item.url,
+            target_platform=item.target_platform,
+            source_platform=result.get('source_platform'),
+            error=result.get('error')
+        )
+        
+        if 'tracks' in result:
+            code = await run_in_threadpool(
+                session_manager.save_session,
+                tracks=result['tracks'],
+                target_platform=result['target_platform'],
+                source_platform=result['source_platform'],
+                stats=result['stats']
+            )
+            entry.code = code
+            entry.share_url = f"http://localhost:5173/join/{code}"
+            entry.stats = MatchStats(**result['stats'])
+        
+        results.append(entry)
+    
+    stats = batch['stats']
+    print(f"\n✅ Batch complete: {stats['converted']}/{stats['playlists']} playlists, "
+          f"{stats['unique_tracks']} unique of {stats['total_tracks']} tracks\n")
+    
+    with stage('serialize'):
+        return BatchConvertResponse(results=results, stats=BatchStats(**stats))
         
-# backend/main.py (UPDATE get_session endpoint)
+MATCH_MAX_ITEMS = int(os.getenv('MATCH_MAX_ITEMS', '10000'))
 
-class SessionResponse(BaseModel):
-    tracks: List[dict]
-    target_platform: str  # ✅ Make it required, not optional
-    source_platform: Optional[str] = None
-    stats: MatchStats
+@app.post("/api/match")
+async def match_tracks(request: MatchRequest):
+    """
+    Batch-match raw tracks to a target platform
+    
+    Streams newline-delimited JSON: one line per track as soon as it is
+    matched (`index` is its position in the request), then a final line
+    with `"done": true` and the stats, or with `"error"` if matching had
+    to stop (e.g. the target platform is down). Uses the same concurrent, cached
+    matching path as conversions.
+    """
+    target_platform = detector.get_platform(request.target_platform)
+    if not target_platform:
+        raise HTTPException(status_code=400, detail=f"Unsupported target platform: {request.target_platform}")
+    
+    if len(request.tracks) > MATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many tracks (max {MATCH_MAX_ITEMS} per call)")
+    
+    tracks = [item.to_track() for item in request.tracks]
+    
+    def stream():
+        # Sync generator: Starlette iterates it in the threadpool, off the event loop
+        results = [MatchedTrack(track, pending=True) for track in tracks]
+        try:
+            for index, match in converter.engine.match_iter(target_platform, tracks):
+                results[index] = MatchedTrack(tracks[index], match)
+                yield json.dumps({'index': index, **serialize_track(results[index], target_platform.name)}) + "\n"
+        except Exception as e:
+            # The 200 is already sent, so the failure goes in the last line instead
+            print(f"❌ Batch match failed: {e}")
+            yield json.dumps({'error': str(e)}) + "\n"
+            return
+        
+        stats = converter._calculate_stats(results)
+        yield json.dumps({'done': True, 'stats': stats}) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 @app.get("/api/session/{code}", response_model=SessionResponse)
 async def get_session(code: str):
@@ -163,16 +375,66 @@ async def get_session(code: str):
     print(f"   Target platform: {target_platform}")
     print(f"   Source platform: {source_platform}")
     
-    # Recalculate stats
-    stats = converter._calculate_stats(tracks, target_platform)
+    # Stored with the session (recomputed for older sessions)
+    with stage('stats'):
+        stats = converter.session_stats(session_data)
     
-    return SessionResponse(
-        tracks=tracks,
-        target_platform=target_platform,  # ✅ Return it!
-        source_platform=source_platform,
-        stats=MatchStats(**stats)
-    )
+    with stage('serialize'):
+        return SessionResponse(
+            tracks=tracks,
+            target_platform=target_platform,  # ✅ Return it!
+            source_platform=source_platform,
+            stats=MatchStats(**stats),
+            pending=session_data.get('pending', False),
+            error=session_data.get('error')
+        )
+
 
+@app.post("/api/session/{code}/retarget", response_model=ConvertResponse)
+async def retarget_session(
+    code: str,
+    platform: str,
+    time_budget: Optional[float] = Query(default=CONVERT_TIME_BUDGET, gt=0)
+):
+    """
+    Convert an existing session to another target platform
+    
+    Reuses the source tracks stored in the session, so the source
+    playlist is not fetched again, and creates a sibling session with
+    its own code. `time_budget` works as for /api/convert.
+    """
+    try:
+        result = await run_in_threadpool(conversions.retarget, code, platform, time_budget)
+    
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Session not found or expired (sessions last 24 hours)")
+    
+    except ValueError as e:
+        print(f"❌ Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    except CircuitOpenError as e:
+        print(f"❌ Upstream unavailable: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    except Exception as e:
+        print(f"❌ Server error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Failed to retarget session: {str(e)}")
+    
+    print(f"\n✅ Session {code} retargeted to {platform}: {result['code']}\n")
+    
+    with stage('serialize'):
+        return ConvertResponse(
+            code=result['code'],
+            share_url=f"http://localhost:5173/join/{result['code']}",
+            source_platform=result['source_platform'],
+            target_platform=result['target_platform'],
+            stats=MatchStats(**result['stats']),
+            pending=result['pending'],
+            deduplicated=result['deduplicated']
+        )
     
 @app.get("/api/session/{code}/ttl")
 async def get_session_ttl(code: str):
@@ -190,7 +452,8 @@ async def get_session_ttl(code: str):
     }
 
 from auth import SpotifyAuth
-from fastapi.responses import RedirectResponse
+from export_pipeline import SpotifyExporter
+from metrics import render_metrics
 
 # ... existing imports ...
 
@@ -229,7 +492,8 @@ async def export_playlist(request: ExportRequest):
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
             
-        tracks = session['tracks']
+        target_platform = session.get('target_platform', 'youtube_music')
+        tracks = [deserialize_track(track, target_platform) for track in session['tracks']]
         
         # 2. Get Platform Handler
         if request.target_platform != 'spotify':
@@ -237,80 +501,44 @@ async def export_playlist(request: ExportRequest):
             
         platform = detector.get_platform('spotify')
         
-        # 3. Create Playlist
-        playlist_id = platform.create_playlist(
-            request.access_token, 
-            request.playlist_name,
-            "Created with AuxParty 🎵"
+        # 3. Resolve ids, create playlist and add tracks (blocking I/O, keep it off the event loop)
+        exporter = SpotifyExporter(platform)
+        report = await run_in_threadpool(
+            exporter.export,
+            tracks,
+            request.access_token,
+            request.playlist_name
         )
-        
-        # 4. Search & Add Tracks
-        track_uris = []
-        for track in tracks:
-            # We need the Spotify URI. If we already matched it, we might have an ID
-            # But the track object structure depends on the conversion result
-            # We'll assume we need to search or use the ID if it was a direct spotify match
-            
-            uri = None
-            if track.get('id'): # If we have a spotify ID
-                 uri = f"spotify:track:{track['id']}"
-            
-            # If we don't have a direct ID (e.g. from YouTube), we should search
-            if not uri:
-                # Reuse the search logic? 
-                # Ideally we should have stored the Spotify ID during conversion IF target was Spotify
-                # But if target was Apple Music, we don't have Spotify IDs.
-                # So we might need to search again here if IDs are missing.
-                pass
-            
-            if uri:
-                track_uris.append(uri)
-                
-        # For now, let's assume the tracks HAVE ids from the conversion if the target was spotify.
-        # If the playlist was converted to 'spotify', the tracks list should contain spotify IDs.
-        
-        # But wait, 'session['tracks']' contains the RESULT of the conversion.
-        # If the user converted TO Spotify, the tracks have spotify metadata.
-        # If they converted TO Apple Music, they have Apple metadata.
-        
-        # IF we want to export to Spotify but the current session is Apple Music...
-        # We technically need to RE-MATCH everything to Spotify.
-        # That's a bit complex.
-        
-        # Simplified approach: Only allow export to the TARGET platform of the session.
-        # Or, perform a quick re-match loop here.
-        
-        real_uris = []
-        for track in tracks:
-            # If we have a spotify ID, use it
-            if session.get('target_platform') == 'spotify' and track.get('id'):
-                real_uris.append(f"spotify:track:{track['id']}")
-                continue
-                
-            # Otherwise, quick search
-            result = platform.search_by_metadata(track['title'], track['artist'])
-            if result and result.get('id'):
-                real_uris.append(f"spotify:track:{result['id']}")
-        
-        # 5. Add to Playlist
-        if real_uris:
-            platform.add_tracks_to_playlist(request.access_token, playlist_id, real_uris)
             
         return {
-            "success": True,
-            "playlist_url": f"https://open.spotify.com/playlist/{playlist_id}",
-            "tracks_added": len(real_uris)
+            "success": report['tracks_failed'] == 0,
+            "playlist_url": f"https://open.spotify.com/playlist/{report['playlist_id']}",
+            "tracks_added": report['tracks_added'],
+            "tracks_failed": report['tracks_failed'],
+            "tracks_unmatched": report['tracks_unmatched'],
+            "failed_uris": report['failed_uris'],
+            "unmatched": report['unmatched']
         }
         
+    except HTTPException:
+        raise
+    
     except Exception as e:
         print(f"Export failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "redis": session_manager.redis_client.ping(),
+        "session_backend": session_manager.backend.name,
+        "session_store": session_manager.backend.ping(),
         "platforms": len(detector.get_supported_platforms())
     }
\ No newline at end of file
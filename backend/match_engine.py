@@ -0,0 +1,205 @@
+# backend/match_engine.py
+
+import contextvars
+import itertools
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import MatchResult, Track
+from platforms.base import MusicPlatform
+from fair_scheduler import SMALL_JOB_TRACKS, FairExecutor, Job, current_job
+from session_backends.memory_backend import MemorySessionBackend
+from metrics import TRACK_MATCHES, record_cache
+from profiling import stage
+from resilience import CircuitOpenError
+from track_keys import dedupe_keys
+
+MATCH_WORKERS = int(os.getenv('MATCH_WORKERS', '16'))
+# Most tracks one job may have queued on the pool at once, so a huge
+# playlist can't fill the queue ahead of everyone else's
+MATCH_JOB_WINDOW = int(os.getenv('MATCH_JOB_WINDOW', '8'))
+MATCH_CACHE_TTL = int(os.getenv('MATCH_CACHE_TTL', str(6 * 3600)))
+MATCH_CACHE_MISS_TTL = int(os.getenv('MATCH_CACHE_MISS_TTL', '900'))
+MATCH_CACHE_MAX_ENTRIES = int(os.getenv('MATCH_CACHE_MAX_ENTRIES', '200000'))
+
+class MatchEngine:
+    """
+    Shared track matching path for conversions and batch matching
+
+    Tracks are collapsed to unique songs, looked up in a match cache and
+    the rest are matched concurrently on a process-wide thread pool. The
+    platform rate limiters still bound how fast we hit each upstream; the
+    pool just keeps that budget busy instead of waiting on one request at
+    a time, and the platform schedulers share that budget fairly between
+    the jobs (conversions) using it.
+    """
+
+    def __init__(self, max_workers: int = MATCH_WORKERS, job_window: int = MATCH_JOB_WINDOW):
+        self.job_window = job_window
+        # Queues per job, so a small job's tracks don't wait behind large jobs' windows
+        self.executor = FairExecutor(max_workers=max_workers, thread_name_prefix='match')
+        # Matches keyed by "<target>:<identity key>", stored as JSON (null = no match)
+        self.cache = MemorySessionBackend(max_entries=MATCH_CACHE_MAX_ENTRIES)
+
+    def _cache_lookup(self, target: str, keys: List[Tuple[str, str]]) -> Tuple[bool, Optional[MatchResult]]:
+        for kind, value in keys:
+            cached = self.cache.get(f"{target}:{kind}:{value}")
+            if cached is not None:
+                record_cache('match', True)
+                data = json.loads(cached)
+                return True, MatchResult.from_dict(data) if data else None
+
+        record_cache('match', False)
+        return False, None
+
+    def _cache_store(self, target: str, keys: List[Tuple[str, str]], match: Optional[MatchResult]) -> None:
+        ttl = MATCH_CACHE_TTL if match else MATCH_CACHE_MISS_TTL
+        value = json.dumps(match.to_dict() if match else None)
+        for kind, key_value in keys:
+            self.cache.set(f"{target}:{kind}:{key_value}", value, ttl)
+
+    def match_one(self, target_platform: MusicPlatform, track: Track) -> Optional[MatchResult]:
+        """Match a single track, using the cache when possible (lookup errors propagate, uncached)"""
+        keys = dedupe_keys(track)
+        hit, match = self._cache_lookup(target_platform.name, keys)
+        if hit:
+            return match
+
+        with stage(f'match.{target_platform.name}'):
+            match = target_platform.match_track(track)
+
+        TRACK_MATCHES.labels(target_platform.name, match.method if match else 'none').inc()
+
+        self._cache_store(target_platform.name, keys, match)
+        return match
+
+    def _submit(self, job: Job, target_platform: MusicPlatform, track: Track):
+        # Carry the caller's context (stage timings) into the worker thread,
+        # tagged with the job its upstream requests are scheduled under
+        context = contextvars.copy_context()
+        context.run(current_job.set, job)
+        return self.executor.submit(job, context.run, self.match_one, target_platform, track)
+
+    def match_iter(
+        self,
+        target_platform: MusicPlatform,
+        tracks: Iterable[Track]
+    ) -> Iterator[Tuple[int, Optional[MatchResult]]]:
+        """
+        Match tracks concurrently, yielding (index, match) as they complete
+
+        A track whose lookup raised is yielded as MatchResult.lookup_failed()
+        (and not cached) instead of failing the whole job; only an open
+        circuit breaker stops it. `tracks` may be a generator still being filled (e.g. playlist
+        pages as they are fetched): it is only read as far as needed to
+        keep job_window tracks on the pool (and, at the start, to size the
+        job for the fair schedulers). Duplicates are matched once
+        and yielded for every position they occupy. Completion order is
+        not playlist order.
+        """
+        # Lists are sized upfront, streams count as they arrive
+        job = Job(target_platform.name, len(tracks) if isinstance(tracks, list) else 0)
+        source = enumerate(tracks)
+        if not isinstance(tracks, list):
+            # Read just far enough to tell a small job from a large one, otherwise
+            # a 5,000-track stream competes as small until its 200th track
+            ahead = list(itertools.islice(source, SMALL_JOB_TRACKS + 1))
+            job.size = len(ahead)
+            source = itertools.chain(ahead, source)
+        exhausted = False
+        total = 0
+
+        seen: Dict[Tuple[str, str], int] = {}
+        unique_tracks: List[Track] = []
+        # Per unique track: its match once known, else the positions waiting for it
+        matches: Dict[int, Optional[MatchResult]] = {}
+        waiting: Dict[int, List[int]] = {}
+        futures = {}
+
+        def pull() -> List[Tuple[int, Optional[MatchResult]]]:
+            # Read tracks until job_window of them are on the pool; returns
+            # duplicates of tracks that are already matched
+            nonlocal exhausted, total
+            ready = []
+            while not exhausted and len(futures) < self.job_window:
+                try:
+                    index, track = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+
+                total += 1
+                keys = dedupe_keys(track)
+                unique_index = next((seen[key] for key in keys if key in seen), None)
+
+                if unique_index is None:
+                    unique_index = len(unique_tracks)
+                    unique_tracks.append(track)
+                    job.size = max(job.size, len(unique_tracks))
+                    waiting[unique_index] = [index]
+                    futures[self._submit(job, target_platform, track)] = unique_index
+                elif unique_index in matches:
+                    ready.append((index, matches[unique_index]))
+                else:
+                    waiting[unique_index].append(index)
+
+                for key in keys:
+                    seen.setdefault(key, unique_index)
+            return ready
+
+        try:
+            while True:
+                yield from pull()
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    unique_index = futures.pop(future)
+                    track = unique_tracks[unique_index]
+                    try:
+                        match = future.result()
+                    except CircuitOpenError:
+                        # The whole platform is down, the job can't go on
+                        raise
+                    except Exception as e:
+                        print(f"  ⚠️ Matching '{track.title}' failed: {e}")
+                        TRACK_MATCHES.labels(target_platform.name, 'error').inc()
+                        match = MatchResult.lookup_failed(target_platform.name)
+                    matches[unique_index] = match
+                    status = '✅' if match else '⚠️' if match is not None else '❌'
+                    print(f"  [{len(matches)}/{len(unique_tracks)}{'' if exhausted else '+'}] {status} {track.title} - {track.artist}")
+
+                    for index in waiting.pop(unique_index):
+                        yield index, match
+        finally:
+            # Consumer stopped early (client went away): drop work not yet started
+            for future in futures:
+                future.cancel()
+
+        if len(unique_tracks) < total:
+            print(f"Collapsed {total - len(unique_tracks)} duplicates, matched {len(unique_tracks)} unique tracks")
+
+    def match_all(self, target_platform: MusicPlatform, tracks: List[Track]) -> List[Optional[MatchResult]]:
+        """Match tracks concurrently, returns matches in input order"""
+        matches: List[Optional[MatchResult]] = [None] * len(tracks)
+        for index, match in self.match_iter(target_platform, tracks):
+            matches[index] = match
+        return matches
+
+_engine: Optional[MatchEngine] = None
+_engine_lock = threading.Lock()
+
+def get_match_engine() -> MatchEngine:
+    """Process-wide match engine (one thread pool and cache per worker)"""
+    global _engine
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = MatchEngine()
+
+    return _engine
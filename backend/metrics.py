@@ -0,0 +1,73 @@
+# backend/metrics.py
+
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+
+# Conversions
+CONVERSIONS = Counter(
+    'auxparty_conversions_total',
+    'Playlist conversions by source, target and outcome',
+    ['source', 'target', 'outcome']
+)
+CONVERSION_DURATION = Histogram(
+    'auxparty_conversion_duration_seconds',
+    'End-to-end conversion time',
+    ['source', 'target'],
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+CONVERSIONS_IN_FLIGHT = Gauge(
+    'auxparty_conversions_in_flight',
+    'Conversions currently running'
+)
+TRACK_MATCHES = Counter(
+    'auxparty_track_matches_total',
+    'Track match attempts by target platform and match method (isrc, metadata, none)',
+    ['target', 'method']
+)
+
+# Upstream platforms
+UPSTREAM_REQUESTS = Counter(
+    'auxparty_upstream_requests_total',
+    'HTTP requests to upstream platforms by status code ("error" if no response)',
+    ['platform', 'status']
+)
+UPSTREAM_LATENCY = Histogram(
+    'auxparty_upstream_request_duration_seconds',
+    'Latency of HTTP requests to upstream platforms',
+    ['platform'],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+
+# Caches and session storage
+CACHE_REQUESTS = Counter(
+    'auxparty_cache_requests_total',
+    'Cache lookups by cache name and result (hit/miss)',
+    ['cache', 'result']
+)
+SESSION_STORE_LATENCY = Histogram(
+    'auxparty_session_store_duration_seconds',
+    'Session store operation latency',
+    ['operation', 'backend'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+)
+
+# Upstream host -> platform label
+UPSTREAM_HOSTS = {
+    'api.spotify.com': 'spotify',
+    'accounts.spotify.com': 'spotify',
+    'itunes.apple.com': 'apple_music',
+    'api.music.apple.com': 'apple_music',
+    'music.youtube.com': 'youtube_music',
+}
+
+def record_upstream_request(host: str, status, seconds: float) -> None:
+    """Record one upstream HTTP request (status is an int or 'error')"""
+    platform = UPSTREAM_HOSTS.get(host, 'other')
+    UPSTREAM_REQUESTS.labels(platform, str(status)).inc()
+    UPSTREAM_LATENCY.labels(platform).observe(seconds)
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+def render_metrics():
+    """Prometheus text exposition, returns (body, content_type)"""
+    return generate_latest(), CONTENT_TYPE_LATEST
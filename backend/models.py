@@ -0,0 +1,211 @@
+# backend/models.py
+
+from typing import Dict, Optional
+
+# Platforms a track can carry its own id for (one slot each on Track)
+SOURCE_ID_KEYS = ('spotify_id', 'youtube_music_id', 'apple_music_id')
+
+# Match method of a lookup that raised (see MatchResult.lookup_failed)
+LOOKUP_FAILED = 'error'
+
+# Track links for platforms whose search results don't include one
+TRACK_URLS = {
+    'youtube_music': 'https://music.youtube.com/watch?v={id}',
+    'spotify': 'https://open.spotify.com/track/{id}',
+}
+
+class Track:
+    """
+    A song as read from a source playlist (or sent to /api/match)
+
+    Slotted, so the thousands of these a big conversion holds cost a
+    fraction of the equivalent dicts. Platforms disagree on whether it's
+    `artist` or `artists`; here it is always `artist`.
+    """
+
+    __slots__ = ('title', 'artist', 'album', 'isrc', 'duration_ms') + SOURCE_ID_KEYS
+
+    def __init__(
+        self,
+        title: str,
+        artist: str,
+        album: Optional[str] = None,
+        isrc: Optional[str] = None,
+        duration_ms: Optional[int] = None,
+        spotify_id: Optional[str] = None,
+        youtube_music_id: Optional[str] = None,
+        apple_music_id: Optional[str] = None
+    ):
+        self.title = title
+        self.artist = artist
+        self.album = album
+        self.isrc = isrc
+        self.duration_ms = duration_ms
+        self.spotify_id = spotify_id
+        self.youtube_music_id = youtube_music_id
+        self.apple_music_id = apple_music_id
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Track':
+        """Build from a stored/client dict (accepts `artist` or `artists`)"""
+        return cls(
+            title=data.get('title', ''),
+            artist=data.get('artist') or data.get('artists') or '',
+            album=data.get('album'),
+            isrc=data.get('isrc'),
+            duration_ms=data.get('duration_ms'),
+            **{field: data.get(field) for field in SOURCE_ID_KEYS}
+        )
+
+    def to_dict(self) -> Dict:
+        """Fields that are set, as a plain dict"""
+        return {
+            field: value
+            for field in self.__slots__
+            if (value := getattr(self, field)) is not None
+        }
+
+    def __repr__(self) -> str:
+        return f"Track({self.title!r}, {self.artist!r})"
+
+class MatchResult:
+    """A track found on a target platform"""
+
+    __slots__ = (
+        'platform', 'id', 'title', 'artist', 'album', 'confidence',
+        'method', 'url', 'preview_url', 'artwork_url'
+    )
+
+    def __init__(
+        self,
+        platform: str,
+        id: str,
+        title: Optional[str] = None,
+        artist: Optional[str] = None,
+        album: Optional[str] = None,
+        confidence: float = 0,
+        method: Optional[str] = None,
+        url: Optional[str] = None,
+        preview_url: Optional[str] = None,
+        artwork_url: Optional[str] = None
+    ):
+        self.platform = platform
+        self.id = id
+        self.title = title
+        self.artist = artist
+        self.album = album
+        self.confidence = confidence
+        self.method = method
+        self.url = url
+        self.preview_url = preview_url
+        self.artwork_url = artwork_url
+
+    @classmethod
+    def from_search(cls, platform: str, result: Dict, method: str) -> 'MatchResult':
+        """Build from a platform search result dict"""
+        url = result.get(f'{platform}_url')
+        if not url and platform in TRACK_URLS:
+            url = TRACK_URLS[platform].format(id=result['id'])
+
+        return cls(
+            platform=platform,
+            id=result['id'],
+            title=result.get('title'),
+            artist=result.get('artist'),
+            album=result.get('album') or None,
+            confidence=result.get('confidence', 0),
+            method=method,
+            url=url,
+            preview_url=result.get('preview_url'),
+            artwork_url=result.get('artwork_url')
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MatchResult':
+        return cls(**data)
+
+    @classmethod
+    def lookup_failed(cls, platform: str) -> 'MatchResult':
+        """Placeholder for a track whose lookup raised: not found, but not a known miss either"""
+        return cls(platform=platform, id=None, method=LOOKUP_FAILED)
+
+    @property
+    def failed(self) -> bool:
+        return self.method == LOOKUP_FAILED
+
+    def __bool__(self) -> bool:
+        # A failed lookup reads as "no match" wherever a match is tested
+        return self.id is not None
+
+    def to_dict(self) -> Dict:
+        return {
+            field: value
+            for field in self.__slots__
+            if (value := getattr(self, field)) is not None
+        }
+
+    def __repr__(self) -> str:
+        return f"MatchResult({self.platform!r}, {self.id!r}, confidence={self.confidence})"
+
+class MatchedTrack:
+    """A source track and its match on the target (None = not found yet/at all)"""
+
+    __slots__ = ('track', 'match', 'pending')
+
+    def __init__(self, track: Track, match: Optional[MatchResult] = None, pending: bool = False):
+        self.track = track
+        self.match = match
+        self.pending = pending
+
+def serialize_track(matched: MatchedTrack, target_platform: str) -> Dict:
+    """
+    The API/session representation of a converted track
+
+    The only place tracks become dicts again. Match fields are keyed by
+    target (`youtube_music_id`, `youtube_music_url`, ...) as the frontend
+    expects.
+    """
+    data = matched.track.to_dict()
+    match = matched.match
+
+    data[f'{target_platform}_id'] = match.id if match else None
+    # 'error' for a failed lookup, so clients can tell it from a track that isn't there
+    data[f'{target_platform}_match_method'] = match.method if match is not None else None
+    data[f'{target_platform}_confidence'] = match.confidence if match else 0
+
+    if match:
+        if match.url:
+            data[f'{target_platform}_url'] = match.url
+        if match.preview_url:
+            data['preview_url'] = match.preview_url
+        if match.artwork_url:
+            data['artwork_url'] = match.artwork_url
+        if match.album and not data.get('album'):
+            data['album'] = match.album
+
+    if matched.pending:
+        data['match_pending'] = True
+
+    return data
+
+def deserialize_track(data: Dict, target_platform: str) -> MatchedTrack:
+    """Inverse of serialize_track (for tracks read back from a session)"""
+    track = Track.from_dict(data)
+    id_field = f'{target_platform}_id'
+    if id_field in SOURCE_ID_KEYS:
+        # That slot holds the match, not the source track's own id
+        setattr(track, id_field, None)
+
+    match = None
+    if data.get(id_field):
+        match = MatchResult(
+            platform=target_platform,
+            id=data[id_field],
+            confidence=data.get(f'{target_platform}_confidence', 0),
+            method=data.get(f'{target_platform}_match_method'),
+            url=data.get(f'{target_platform}_url'),
+            preview_url=data.get('preview_url'),
+            artwork_url=data.get('artwork_url')
+        )
+
+    return MatchedTrack(track, match, pending=bool(data.get('match_pending')))
@@ -1,42 +1,27 @@
 # backend/platform_detector.py (ADD Apple Music support)
 
-import re
 from typing import Optional, Dict, List
 from platforms.base import MusicPlatform
-from platforms.spotify import SpotifyPlatform
-from platforms.youtube_music import YouTubeMusicPlatform
-from platforms.apple_music import AppleMusicPlatform  # NEW!
+from platforms.registry import get_platform_handler
+from url_router import router
 
 class PlatformDetector:
     """Detect and retrieve the appropriate platform handler"""
     
     def __init__(self):
-        # Registry of all supported platforms
+        # Supported platforms (handlers come lazily from the shared registry)
         self.platforms = {
             'spotify': {
-                'handler': SpotifyPlatform(),
-                'patterns': [
-                    r'open\.spotify\.com/(playlist|album|track)',
-                    r'spotify:(playlist|album|track):'
-                ],
                 'display_name': 'Spotify',
                 'can_extract': True,  # Can use as source
                 'icon_id': 'spotify'
             },
             'youtube_music': {
-                'handler': YouTubeMusicPlatform(),
-                'patterns': [
-                    r'music\.youtube\.com/(playlist|watch)',
-                ],
                 'display_name': 'YouTube Music',
                 'can_extract': True,
                 'icon_id': 'youtube'
             },
             'apple_music': {
-                'handler': AppleMusicPlatform(),
-                'patterns': [
-                    r'music\.apple\.com/.+/(playlist|album|song)',
-                ],
                 'display_name': 'Apple Music',
                 'can_extract': False,  # FREE version can't extract
                 'icon_id': 'apple'
@@ -45,27 +30,32 @@ class PlatformDetector:
     
     def detect_platform(self, url: str) -> Optional[Dict]:
         """
-        Detect which platform a URL belongs to
+        Detect which platform a URL belongs to (and what it points at)
         
         Returns:
-            Dict with 'name', 'handler', 'display_name', 'can_extract' or None
+            Dict with 'name', 'handler', 'display_name', 'can_extract',
+            'kind' ('playlist', 'album', 'track') and 'resource_id', or None
         """
-        for name, config in self.platforms.items():
-            for pattern in config['patterns']:
-                if re.search(pattern, url):
-                    return {
-                        'name': name,
-                        'handler': config['handler'],
-                        'display_name': config['display_name'],
-                        'can_extract': config['can_extract'],
-                        'icon': config['icon_id']
-                    }
-        return None
+        route = router.match(url)
+        if not route or route.platform not in self.platforms:
+            return None
+        
+        config = self.platforms[route.platform]
+        return {
+            'name': route.platform,
+            'handler': get_platform_handler(route.platform),
+            'display_name': config['display_name'],
+            'can_extract': config['can_extract'],
+            'icon': config['icon_id'],
+            'kind': route.kind,
+            'resource_id': route.resource_id
+        }
     
     def get_platform(self, name: str) -> Optional[MusicPlatform]:
         """Get a platform handler by name"""
-        config = self.platforms.get(name)
-        return config['handler'] if config else None
+        if name not in self.platforms:
+            return None
+        return get_platform_handler(name)
     
     def get_supported_platforms(self) -> List[Dict]:
         """Get list of all supported platforms"""
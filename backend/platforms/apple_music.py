@@ -1,37 +1,38 @@
 # backend/platforms/apple_music.py
 
+import os
 from typing import List, Dict, Optional
 from platforms.base import MusicPlatform
+from models import Track
 from apple_music_free import AppleMusicFreeClient
-from fuzzywuzzy import fuzz
-import time
+from rate_limiter import RateLimiter
+from url_router import router
+from profiling import stage
+from scoring import best_candidate, MATCH_THRESHOLD
 
 class AppleMusicPlatform(MusicPlatform):
+    # iTunes Search API allows roughly 20 requests/minute per IP
+    RATE_LIMIT = (1 / 1.2, 1)  # (requests per second, burst)
+    # See scoring.SCORERS and benchmarks/bench_matching.py
+    SCORER = os.getenv('APPLE_MUSIC_SCORER', 'ratio_token_sort')
+    
     def __init__(self):
-        super().__init__('apple_music')
-        self.client = AppleMusicFreeClient()
+        super().__init__('apple_music', RateLimiter(*self.RATE_LIMIT))
+        self.client = AppleMusicFreeClient(resilience=self.resilience)
     
     def extract_playlist_id(self, url: str) -> Optional[str]:
         """
-        Extract playlist ID from Apple Music URL
+        Extract playlist (or album) ID from Apple Music URL
         
         Note: Free API can't fetch playlist contents
         This is just for URL validation
         """
-        import re
-        # https://music.apple.com/us/playlist/name/pl.xxxxx
-        match = re.search(r'playlist/[^/]+/(pl\.[a-zA-Z0-9-]+)', url)
-        if match:
-            return match.group(1)
-        
-        # Also support album URLs
-        match = re.search(r'album/[^/]+/(\d+)', url)
-        if match:
-            return match.group(1)
-        
+        route = router.match(url)
+        if route and route.platform == self.name and route.kind in ('playlist', 'album'):
+            return route.resource_id
         return None
     
-    def get_playlist_tracks(self, playlist_id: str) -> List[Dict]:
+    def get_playlist_tracks(self, playlist_id: str) -> List[Track]:
         """
         Fetch playlist tracks
         
@@ -58,59 +59,29 @@ class AppleMusicPlatform(MusicPlatform):
         """
         Search for a track by title and artist with fuzzy matching
         """
-        time.sleep(1.2) 
-        # Get multiple results for better matching
-        results = self.client.search_multiple(title, artist, limit=5)
+        results = self._search(title, artist)
         
         if not results:
             # Try simplified search (remove featuring, etc.)
-            simplified_title = self._simplify_title(title)
-            simplified_artist = self._simplify_artist(artist)
-            
-            if simplified_title != title or simplified_artist != artist:
-                results = self.client.search_multiple(simplified_title, simplified_artist, limit=5)
+            simplified = (self._simplify_title(title), self._simplify_artist(artist))
+            if simplified != (title, artist):
+                results = self._search(*simplified)
         
         if not results:
             return None
         
         # Find best match using fuzzy matching
-        best_match = None
-        best_score = 0
-        
-        for result in results:
-            # Calculate similarity scores
-            title_score = fuzz.ratio(
-                title.lower(),
-                result['title'].lower()
+        with stage('score'):
+            best_index, best_score = best_candidate(
+                title,
+                artist,
+                [(result['title'], result['artist']) for result in results],
+                scorer=self.SCORER
             )
-            artist_score = fuzz.ratio(
-                artist.lower(),
-                result['artist'].lower()
-            )
-            
-            # Also try token sort ratio (handles word order differences)
-            title_token_score = fuzz.token_sort_ratio(
-                title.lower(),
-                result['title'].lower()
-            )
-            artist_token_score = fuzz.token_sort_ratio(
-                artist.lower(),
-                result['artist'].lower()
-            )
-            
-            # Use the better score
-            title_final = max(title_score, title_token_score)
-            artist_final = max(artist_score, artist_token_score)
-            
-            # Combined score (title weighted more)
-            combined_score = (title_final * 0.6) + (artist_final * 0.4)
-            
-            if combined_score > best_score:
-                best_score = combined_score
-                best_match = result
+            best_match = results[best_index] if best_index is not None else None
         
         # Only return if confidence is high enough
-        if best_score >= 70:  # 70% threshold
+        if best_score >= MATCH_THRESHOLD:
             return {
                 'id': best_match['apple_music_id'],
                 'title': best_match['title'],
@@ -124,6 +95,11 @@ class AppleMusicPlatform(MusicPlatform):
         
         return None
     
+    def _search(self, title: str, artist: str) -> List[Dict]:
+        """One throttled iTunes search (a cache hit doesn't wait for budget)"""
+        with self._throttled():
+            return self.client.search_multiple(title, artist, limit=5)
+    
     def generate_playback_link(self, track_ids: List[str]) -> str:
         """
         Generate deep link to Apple Music
@@ -142,7 +118,8 @@ class AppleMusicPlatform(MusicPlatform):
         # User will need to manually add others
         return self.client.generate_deep_link(track_ids[0])
     
-    def _simplify_title(self, title: str) -> str:
+    @staticmethod
+    def _simplify_title(title: str) -> str:
         """
         Simplify title by removing common additions
         """
@@ -162,7 +139,8 @@ class AppleMusicPlatform(MusicPlatform):
         
         return title.strip()
     
-    def _simplify_artist(self, artist: str) -> str:
+    @staticmethod
+    def _simplify_artist(artist: str) -> str:
         """
         Simplify artist name
         """
@@ -1,13 +1,60 @@
 # backend/platforms/base.py
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional
+from models import Track, MatchResult
+from identity_graph import get_identity_graph
+from rate_limiter import RateLimiter
+from fair_scheduler import FairScheduler
+from http_transport import network_gate
+from resilience import ResiliencePolicy
+from profiling import stage
 
 class MusicPlatform(ABC):
     """Base class for all music platform integrations"""
     
-    def __init__(self, name: str):
+    def __init__(
+        self,
+        name: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        resilience: Optional[ResiliencePolicy] = None
+    ):
         self.name = name
+        # Shared request budget for this platform's search endpoints
+        self.rate_limiter = rate_limiter or RateLimiter(rate=10, burst=10)
+        # Splits that budget fairly across the conversions using it
+        self.scheduler = FairScheduler(self.rate_limiter)
+        # Retry/backoff + circuit breaker for calls to this platform
+        self.resilience = resilience or ResiliencePolicy(name)
+    
+    def _throttle(self) -> None:
+        """Wait for this job's turn at the platform's budget (timed as its own stage)"""
+        with stage(f'throttle.{self.name}'):
+            self.scheduler.acquire()
+    
+    @contextmanager
+    def _throttled(self) -> Iterator[None]:
+        """
+        Throttle the upstream call made inside the block, once it needs the network
+        
+        The wait (see _throttle) happens in the transport when the first
+        request actually goes out, so a search answered from the HTTP
+        cache neither waits for nor spends a token.
+        """
+        sent = False
+        
+        def gate() -> None:
+            nonlocal sent
+            if not sent:
+                sent = True
+                self._throttle()
+        
+        token = network_gate.set(gate)
+        try:
+            yield
+        finally:
+            network_gate.reset(token)
     
     @abstractmethod
     def extract_playlist_id(self, url: str) -> Optional[str]:
@@ -15,10 +62,27 @@ class MusicPlatform(ABC):
         pass
     
     @abstractmethod
-    def get_playlist_tracks(self, playlist_id: str) -> List[Dict]:
+    def get_playlist_tracks(self, playlist_id: str) -> List[Track]:
         """Get all tracks from a playlist"""
         pass
     
+    def iter_playlist_pages(self, playlist_id: str) -> Iterator[List[Track]]:
+        """
+        Yield a playlist's tracks page by page as they are fetched
+
+        Platforms that can page override this so matching can start
+        before the whole playlist is in. The default is one page.
+        """
+        yield self.get_playlist_tracks(playlist_id)
+    
+    def get_playlist_snapshot(self, playlist_id: str) -> Optional[str]:
+        """
+        Version tag of a playlist's contents, if the platform has one
+
+        Changes whenever the playlist is edited. None means unknown.
+        """
+        return None
+    
     @abstractmethod
     def search_by_isrc(self, isrc: str) -> Optional[Dict]:
         """Search for a track by ISRC code"""
@@ -34,28 +98,46 @@ class MusicPlatform(ABC):
         """Generate a link to play these tracks"""
         pass
     
-    def match_track(self, track: Dict) -> Optional[Dict]:
+    def match_track(self, track: Track) -> Optional[MatchResult]:
         """
         Match a track from another platform to this platform
-        Uses ISRC first, then falls back to metadata search
+        Checks the identity graph first (ids already linked by an earlier
+        match, in any direction), then ISRC, then metadata search
         """
-        # Try ISRC first (most accurate)
-        if track.get('isrc'):
-            result = self.search_by_isrc(track['isrc'])
+        identities = get_identity_graph()
+        if identities:
+            try:
+                known = identities.lookup(track, self.name)
+                if known:
+                    return known
+            except Exception as e:
+                print(f"⚠️ Identity lookup failed: {e}")
+        
+        match = self._search_track(track)
+        
+        if match and identities:
+            try:
+                identities.link(track, match)
+            except Exception as e:
+                # Only costs a search next time
+                print(f"⚠️ Identity link failed: {e}")
+        
+        return match
+    
+    def _search_track(self, track: Track) -> Optional[MatchResult]:
+        """ISRC search first (most accurate), then title + artist"""
+        if track.isrc:
+            result = self.search_by_isrc(track.isrc)
             if result:
-                result['match_method'] = 'isrc'
                 result['confidence'] = 1.0
-                return result
+                return MatchResult.from_search(self.name, result, 'isrc')
         
-        # Fallback to title + artist search
-        artist = track.get('artist') or track.get('artists')
-        if not artist:
-            # If still no artist (shouldn't happen), try empty string or return None
+        if not track.artist:
             return None
             
-        result = self.search_by_metadata(track['title'], artist)
+        result = self.search_by_metadata(track.title, track.artist)
         if result:
-            result['match_method'] = 'metadata'
-            # Confidence will be set by the implementation
+            # Confidence is set by the implementation
+            return MatchResult.from_search(self.name, result, 'metadata')
         
-        return result
\ No newline at end of file
+        return None
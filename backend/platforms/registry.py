@@ -0,0 +1,40 @@
+# backend/platforms/registry.py
+
+import importlib
+import threading
+from typing import Dict
+from .base import MusicPlatform
+
+# Handler classes by platform name, imported only when first needed
+PLATFORM_CLASSES = {
+    'spotify': 'platforms.spotify.SpotifyPlatform',
+    'youtube_music': 'platforms.youtube_music.YouTubeMusicPlatform',
+    'apple_music': 'platforms.apple_music.AppleMusicPlatform',
+}
+
+_instances: Dict[str, MusicPlatform] = {}
+_lock = threading.Lock()
+
+def get_platform_handler(name: str) -> MusicPlatform:
+    """
+    Process-wide platform handler, created on first use
+
+    Importing a platform pulls in its SDK (spotipy, ytmusicapi...) and
+    constructing it may open clients, so neither happens until a request
+    actually needs that platform. Every caller shares the same instance,
+    and with it the same rate limiter and circuit breaker.
+    """
+    handler = _instances.get(name)
+    if handler is not None:
+        return handler
+
+    if name not in PLATFORM_CLASSES:
+        raise KeyError(f"Unknown platform: {name}")
+
+    with _lock:
+        if name not in _instances:
+            module_path, class_name = PLATFORM_CLASSES[name].rsplit('.', 1)
+            platform_class = getattr(importlib.import_module(module_path), class_name)
+            _instances[name] = platform_class()
+
+        return _instances[name]
@@ -1,23 +1,53 @@
 # backend/platforms/spotify.py
 
-import re
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from .base import MusicPlatform
+from models import Track
+from rate_limiter import RateLimiter
+from resilience import ResiliencePolicy, RetryPolicy
 from spotify_client import SpotifyClient
+from http_transport import get_session
+from url_router import router
 
 class SpotifyPlatform(MusicPlatform):
+    # Spotify allows max 100 tracks per request
+    PLAYLIST_CHUNK_SIZE = 100
+    MAX_ADD_ATTEMPTS = 5
+    RATE_LIMIT = (10, 10)  # (requests per second, burst)
+
     def __init__(self):
-        super().__init__('spotify')
+        super().__init__('spotify', RateLimiter(*self.RATE_LIMIT))
         self.client = SpotifyClient()
+        # Playlist writes get more patience but share the platform's circuit breaker.
+        # They are POSTs: only resent when Spotify certainly didn't apply them.
+        self.export_resilience = ResiliencePolicy(
+            'spotify',
+            retry=RetryPolicy(max_attempts=self.MAX_ADD_ATTEMPTS, idempotent=False),
+            breaker=self.resilience.breaker
+        )
     
     def extract_playlist_id(self, url: str) -> Optional[str]:
-        return self.client.extract_playlist_id(url)
+        route = router.match(url)
+        if route and route.platform == self.name and route.kind == 'playlist':
+            return route.resource_id
+        return None
+    
+    def get_playlist_tracks(self, playlist_id: str) -> List[Track]:
+        return [track for page in self.iter_playlist_pages(playlist_id) for track in page]
     
-    def get_playlist_tracks(self, playlist_id: str) -> List[Dict]:
-        return self.client.get_playlist_tracks(playlist_id)
+    def iter_playlist_pages(self, playlist_id: str) -> Iterator[List[Track]]:
+        # Follows `next` pages, each retried on its own
+        for page in self.client.iter_playlist_pages(playlist_id, call=self.resilience.call):
+            yield [Track.from_dict(track) for track in page]
+    
+    def get_playlist_snapshot(self, playlist_id: str) -> Optional[str]:
+        with self._throttled():
+            playlist = self.resilience.call(self.client.sp.playlist, playlist_id, fields='snapshot_id')
+        return playlist.get('snapshot_id')
     
     def search_by_isrc(self, isrc: str) -> Optional[Dict]:
-        results = self.client.sp.search(q=f'isrc:{isrc}', type='track', limit=1)
+        with self._throttled():
+            results = self.resilience.call(self.client.sp.search, q=f'isrc:{isrc}', type='track', limit=1)
         
         if results['tracks']['items']:
             track = results['tracks']['items'][0]
@@ -30,7 +60,8 @@ class SpotifyPlatform(MusicPlatform):
     
     def search_by_metadata(self, title: str, artist: str) -> Optional[Dict]:
         query = f"track:{title} artist:{artist}"
-        results = self.client.sp.search(q=query, type='track', limit=1)
+        with self._throttled():
+            results = self.resilience.call(self.client.sp.search, q=query, type='track', limit=1)
         
         if results['tracks']['items']:
             track = results['tracks']['items'][0]
@@ -53,11 +84,11 @@ class SpotifyPlatform(MusicPlatform):
 
     def create_playlist(self, access_token: str, name: str, description: str = "") -> str:
         """Create a new playlist and return its ID"""
-        import requests
+        session = get_session()
         
         # 1. Get User ID
         headers = {'Authorization': f'Bearer {access_token}'}
-        user_resp = requests.get('https://api.spotify.com/v1/me', headers=headers)
+        user_resp = self.resilience.call(session.get, 'https://api.spotify.com/v1/me', headers=headers)
         if user_resp.status_code != 200:
             raise Exception("Failed to get user info")
         user_id = user_resp.json()['id']
@@ -70,21 +101,49 @@ class SpotifyPlatform(MusicPlatform):
             "public": False
         }
         
-        resp = requests.post(url, headers=headers, json=data)
+        resp = self.export_resilience.call(session.post, url, headers=headers, json=data)
         if resp.status_code not in [200, 201]:
             raise Exception(f"Failed to create playlist: {resp.text}")
             
         return resp.json()['id']
 
-    def add_tracks_to_playlist(self, access_token: str, playlist_id: str, track_uris: List[str]):
-        """Add tracks to a playlist"""
-        import requests
+    def add_tracks_to_playlist(self, access_token: str, playlist_id: str, track_uris: List[str]) -> Dict:
+        """
+        Add tracks to a playlist
+
+        Chunks are retried on 429 (honoring Retry-After) and on connection
+        failures, so rate limits don't silently drop tracks. A 5xx is not
+        retried, the chunk may have been added anyway. If a chunk fails
+        for good (or the circuit opens), it and the chunks after it are
+        reported as failed.
+
+        Returns:
+            Dict with 'added' and 'failed' URI lists
+        """
+        session = get_session()
         
         url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks"
         headers = {'Authorization': f'Bearer {access_token}'}
         
-        # Spotify allows max 100 tracks per request
-        for i in range(0, len(track_uris), 100):
-            chunk = track_uris[i:i + 100]
+        added = []
+        failed = []
+        
+        for i in range(0, len(track_uris), self.PLAYLIST_CHUNK_SIZE):
+            chunk = track_uris[i:i + self.PLAYLIST_CHUNK_SIZE]
             data = {"uris": chunk}
-            requests.post(url, headers=headers, json=data)
+            
+            try:
+                resp = self.export_resilience.call(session.post, url, headers=headers, json=data)
+            except Exception as e:
+                # Keep what made it in, the caller reports the rest
+                print(f"   ❌ Adding tracks stopped after {len(added)}: {e}")
+                failed.extend(track_uris[i:])
+                break
+            
+            if resp.status_code in [200, 201]:
+                added.extend(chunk)
+            else:
+                print(f"   ❌ Failed to add {len(chunk)} tracks: {resp.status_code} {resp.text}")
+                failed.extend(chunk)
+        
+        return {'added': added, 'failed': failed}
@@ -2,155 +2,122 @@
 
 from typing import List, Dict, Optional
 from platforms.base import MusicPlatform
+from models import Track
 from youtube_music_client import YouTubeMusicClient
-import time
+from rate_limiter import RateLimiter
+from resilience import CircuitOpenError
+from url_router import router
 
 class YouTubeMusicPlatform(MusicPlatform):
+    RATE_LIMIT = (5, 5)  # (requests per second, burst)
+    
     def __init__(self):
-        super().__init__('youtube_music')
+        super().__init__('youtube_music', RateLimiter(*self.RATE_LIMIT))
         self.client = YouTubeMusicClient()
     
     def extract_playlist_id(self, url: str) -> Optional[str]:
-        import re
-        
-        # Handle different YouTube Music URL formats
-        patterns = [
-            r'list=([a-zA-Z0-9_-]+)',  # Standard format
-            r'playlist/([a-zA-Z0-9_-]+)',  # Alternative format
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                playlist_id = match.group(1)
-                # Remove &si parameter if present
-                playlist_id = playlist_id.split('&')[0]
-                return playlist_id
-        
+        route = router.match(url)
+        if route and route.platform == self.name and route.kind == 'playlist':
+            return route.resource_id
         return None
     
-    def get_playlist_tracks(self, playlist_id: str) -> List[Dict]:
+    def get_playlist_tracks(self, playlist_id: str) -> List[Track]:
         """
-        Fetch playlist tracks with retry logic
+        Fetch playlist tracks
+
+        Fetches every track, following continuations (ytmusicapi stops at
+        100 unless told otherwise). Transient failures such as timeouts
+        and 429/5xx responses are retried with backoff by the platform's
+        resilience policy. Permanent ones, like a private or missing
+        playlist, fail immediately.
         """
-        max_retries = 3
-        retry_delay = 2  # seconds
+        try:
+            print(f"   Fetching YouTube Music playlist {playlist_id}...")
+            playlist = self.resilience.call(self.client.ytmusic.get_playlist, playlist_id, limit=None)
+        
+        except CircuitOpenError:
+            raise
         
-        for attempt in range(max_retries):
-            try:
-                print(f"   Attempting to fetch YouTube Music playlist (attempt {attempt + 1}/{max_retries})...")
-                
-                playlist = self.client.ytmusic.get_playlist(playlist_id)
-                
-                tracks = []
-                for item in playlist.get('tracks', []):
-                    if not item:
-                        continue
-                    
-                    # Extract video ID
-                    video_id = item.get('videoId')
-                    if not video_id:
-                        continue
-                    
-                    # Get artist name
-                    artists = item.get('artists', [])
-                    artist_name = artists[0].get('name', 'Unknown Artist') if artists else 'Unknown Artist'
-                    
-                    # Get album name
-                    album = item.get('album')
-                    album_name = album.get('name', '') if album else ''
-                    
-                    # Get duration
-                    duration_seconds = 0
-                    if 'duration_seconds' in item:
-                        duration_seconds = item['duration_seconds']
-                    elif 'duration' in item:
-                        # Parse duration string like "3:45"
-                        duration_str = item['duration']
-                        try:
-                            parts = duration_str.split(':')
-                            if len(parts) == 2:
-                                duration_seconds = int(parts[0]) * 60 + int(parts[1])
-                            elif len(parts) == 3:
-                                duration_seconds = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-                        except:
-                            pass
-                    
-                    tracks.append({
-                        'title': item.get('title', 'Unknown Title'),
-                        'artist': artist_name,
-                        'album': album_name,
-                        'youtube_music_id': video_id,
-                        'duration_ms': duration_seconds * 1000 if duration_seconds else 0
-                    })
-                
-                print(f"   ✅ Successfully fetched {len(tracks)} tracks from YouTube Music")
-                return tracks
-                
-            except KeyError as e:
-                error_msg = f"YouTube Music API structure changed (KeyError: {e})"
-                print(f"   ❌ {error_msg}")
-                
-                if attempt < max_retries - 1:
-                    print(f"   ⏳ Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    raise ValueError(
-                        f"Failed to fetch YouTube Music playlist after {max_retries} attempts.\n"
-                        f"This might be due to:\n"
-                        f"  • YouTube Music API changes\n"
-                        f"  • Private or unavailable playlist\n"
-                        f"  • Network connectivity issues\n\n"
-                        f"Please try:\n"
-                        f"  1. Using a different playlist\n"
-                        f"  2. Using Spotify as source instead\n"
-                        f"  3. Checking if the playlist is public"
-                    )
+        except KeyError as e:
+            raise ValueError(
+                f"Failed to fetch YouTube Music playlist (KeyError: {e}).\n"
+                f"This might be due to:\n"
+                f"  • YouTube Music API changes\n"
+                f"  • Private or unavailable playlist\n\n"
+                f"Please try:\n"
+                f"  1. Using a different playlist\n"
+                f"  2. Using Spotify as source instead\n"
+                f"  3. Checking if the playlist is public"
+            )
+        
+        except Exception as e:
+            print(f"   ❌ Failed to fetch playlist: {e}")
+            raise ValueError(
+                f"Failed to fetch YouTube Music playlist: {str(e)}\n"
+                f"Please try using Spotify as source instead."
+            )
+        
+        tracks = []
+        for item in playlist.get('tracks', []):
+            if not item:
+                continue
+            
+            # Extract video ID
+            video_id = item.get('videoId')
+            if not video_id:
+                continue
+            
+            # Get artist name
+            artists = item.get('artists', [])
+            artist_name = artists[0].get('name', 'Unknown Artist') if artists else 'Unknown Artist'
+            
+            # Get album name
+            album = item.get('album')
+            album_name = album.get('name', '') if album else ''
             
-            except ConnectionError as e:
-                print(f"   ❌ Connection error: {e}")
-                
-                if attempt < max_retries - 1:
-                    print(f"   ⏳ Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    raise ValueError(
-                        f"Failed to connect to YouTube Music after {max_retries} attempts.\n"
-                        f"Please check your internet connection and try again."
-                    )
+            # Get duration
+            duration_seconds = 0
+            if 'duration_seconds' in item:
+                duration_seconds = item['duration_seconds']
+            elif 'duration' in item:
+                # Parse duration string like "3:45"
+                duration_str = item['duration']
+                try:
+                    parts = duration_str.split(':')
+                    if len(parts) == 2:
+                        duration_seconds = int(parts[0]) * 60 + int(parts[1])
+                    elif len(parts) == 3:
+                        duration_seconds = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+                except:
+                    pass
             
-            except Exception as e:
-                print(f"   ❌ Unexpected error: {e}")
-                
-                if attempt < max_retries - 1:
-                    print(f"   ⏳ Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    raise ValueError(
-                        f"Failed to fetch YouTube Music playlist: {str(e)}\n"
-                        f"Please try using Spotify as source instead."
-                    )
+            tracks.append(Track(
+                title=item.get('title', 'Unknown Title'),
+                artist=artist_name,
+                album=album_name,
+                youtube_music_id=video_id,
+                duration_ms=duration_seconds * 1000 if duration_seconds else 0
+            ))
         
-        return []
+        print(f"   ✅ Successfully fetched {len(tracks)} tracks from YouTube Music")
+        return tracks
     
     def search_by_isrc(self, isrc: str) -> Optional[Dict]:
         """YouTube Music doesn't support ISRC search"""
         return None
     
     def search_by_metadata(self, title: str, artist: str) -> Optional[Dict]:
-        """Search for a track by title and artist"""
-        try:
-            result = self.client.search_track(title, artist)
-            
-            if result:
-                return {
-                    'id': result['youtube_music_id'],
-                    'title': result['title'],
-                    'artist': result['artists'],
-                    'confidence': result['confidence']
-                }
-        except Exception as e:
-            print(f"   ⚠️  YouTube Music search failed for '{title}': {e}")
+        """Search for a track by title and artist (raises if the search itself fails)"""
+        with self._throttled():
+            result = self.resilience.call(self.client.search_track, title, artist)
+        
+        if result:
+            return {
+                'id': result['youtube_music_id'],
+                'title': result['title'],
+                'artist': result['artists'],
+                'confidence': result['confidence']
+            }
         
         return None
     
@@ -0,0 +1,102 @@
+# backend/profiling.py
+
+import cProfile
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+# Request header that asks for a stage timing breakdown (returned as Server-Timing)
+TIMING_HEADER = 'x-debug-timing'
+# Request header that asks for a cProfile dump (only honored when PROFILE_DIR is set)
+PROFILE_HEADER = 'x-profile'
+PROFILE_DIR = os.getenv('PROFILE_DIR')
+
+class StageTimings:
+    """Accumulated wall time per stage for one request (thread-safe)"""
+
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.totals[name] = self.totals.get(name, 0.0) + seconds
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def to_server_timing(self) -> str:
+        """Format as a Server-Timing header (durations in ms)"""
+        with self._lock:
+            return ', '.join(
+                f'{name};dur={seconds * 1000:.1f};desc="x{self.counts[name]}"'
+                for name, seconds in self.totals.items()
+            )
+
+_current_timings: ContextVar[Optional[StageTimings]] = ContextVar('stage_timings', default=None)
+
+def start_timing() -> StageTimings:
+    """Start collecting stage timings for the current request context"""
+    timings = StageTimings()
+    _current_timings.set(timings)
+    return timings
+
+def add_timing(name: str, seconds: float) -> None:
+    """Add time to a stage if the current request is being timed"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+@contextmanager
+def stage(name: str):
+    """
+    Time a block as a named stage
+
+    Costs a single ContextVar lookup when the request isn't being timed.
+    Stage names must be Server-Timing tokens (use '.' not ':').
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+# cProfile hooks into the interpreter globally, so only one request is profiled at a time
+_profile_lock = threading.Lock()
+
+@contextmanager
+def maybe_profile(enabled: bool, label: str):
+    """
+    Profile a block with cProfile and dump it to PROFILE_DIR
+
+    The .prof output loads in snakeviz, `python -m pstats` or flameprof.
+    Only the calling thread is profiled; work handed to thread pools shows
+    up as time spent waiting on it.
+    """
+    if not enabled or not PROFILE_DIR or not _profile_lock.acquire(blocking=False):
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        safe_label = re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_')
+        path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_label}.prof")
+        profiler.dump_stats(path)
+        print(f"   🔬 Profile written to {path}")
+    finally:
+        _profile_lock.release()
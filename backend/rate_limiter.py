@@ -0,0 +1,49 @@
+# backend/rate_limiter.py
+
+import threading
+import time
+
+class RateLimiter:
+    """
+    Thread-safe token bucket
+
+    Allows `rate` requests per second on average with bursts of up to
+    `burst` requests. Callers block in `acquire` until a token is free, so
+    concurrent workers share one platform budget instead of each sleeping
+    on their own.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available
+
+        Returns 0 on success, otherwise the seconds until the next token
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available"""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
@@ -0,0 +1,250 @@
+# backend/resilience.py
+
+import random
+import re
+import threading
+import time
+from typing import Callable, Optional, Tuple, Any
+
+# Statuses worth retrying: rate limited, or the upstream is having a bad moment
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# The only ones that guarantee the request was not acted on (see RetryPolicy.idempotent)
+RESENDABLE_STATUSES = frozenset({429})
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        self.name = name
+        self.retry_in = retry_in
+        super().__init__(f"{name} is temporarily unavailable, retry in {retry_in:.0f}s")
+
+def _status_and_retry_after(outcome: Any) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Pull an HTTP status and Retry-After header out of a response or exception
+
+    Understands requests responses/HTTPError, spotipy's SpotifyException
+    (http_status/headers) and ytmusicapi errors ("Server returned HTTP 429").
+    """
+    response = getattr(outcome, 'response', None)
+    if response is None and hasattr(outcome, 'status_code'):
+        response = outcome
+
+    if response is not None and getattr(response, 'status_code', None) is not None:
+        return response.status_code, response.headers.get('Retry-After')
+
+    status = getattr(outcome, 'http_status', None)
+    if status is not None:
+        headers = getattr(outcome, 'headers', None) or {}
+        return status, headers.get('Retry-After')
+
+    match = re.search(r'HTTP (\d{3})', str(outcome))
+    if match:
+        return int(match.group(1)), None
+
+    return None, None
+
+def _failed_before_send(error: Exception) -> bool:
+    """Connection errors raised before the request reached the server (safe to resend anything)"""
+    if type(error).__name__ == 'ConnectTimeout':
+        return True
+
+    # requests wraps urllib3's MaxRetryError, whose `reason` says what went wrong
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return type(reason).__name__ in ('NewConnectionError', 'NameResolutionError', 'ConnectTimeoutError')
+
+def _counts_as_outage(outcome: Any) -> bool:
+    """429 is backpressure, not an outage - it must not trip the breaker"""
+    status, _ = _status_and_retry_after(outcome)
+    return status != 429
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, retrying only transient failures
+
+    With `idempotent=False` (POSTs that add or create things) a request
+    is only retried when it certainly wasn't acted on: a 429, or a
+    connection that failed before the request went out. A 5xx or a read
+    timeout may come after the server did the work, and resending would
+    do it twice.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        retryable_statuses=RETRYABLE_STATUSES,
+        idempotent: bool = True
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable_statuses = retryable_statuses
+        self.idempotent = idempotent
+
+    def is_transient(self, outcome: Any) -> bool:
+        """Decide whether a failed response/exception is transient"""
+        status, _ = _status_and_retry_after(outcome)
+        if status is not None:
+            return status in self.retryable_statuses
+
+        # No status: only network-level failures are transient
+        name = type(outcome).__name__
+        return isinstance(outcome, (ConnectionError, TimeoutError)) or name in (
+            'ConnectionError', 'Timeout', 'ConnectTimeout', 'ReadTimeout', 'ChunkedEncodingError'
+        )
+
+    def is_retryable(self, outcome: Any) -> bool:
+        """Transient, and safe to send again"""
+        if not self.is_transient(outcome):
+            return False
+        if self.idempotent:
+            return True
+
+        status, _ = _status_and_retry_after(outcome)
+        if status is not None:
+            return status in RESENDABLE_STATUSES
+        return _failed_before_send(outcome)
+
+    def delay(self, attempt: int, outcome: Any = None) -> Optional[float]:
+        """
+        Seconds to wait before the next attempt, or None to give up now
+
+        Retry-After wins if present: retrying earlier than the upstream
+        asked only earns another 429. If it asks for more than max_delay
+        we don't hold a worker that long, the failure goes to the caller.
+        """
+        _, retry_after = _status_and_retry_after(outcome)
+        if retry_after is not None:
+            try:
+                wait = max(0.0, float(retry_after))
+            except ValueError:
+                pass
+            else:
+                return wait if wait <= self.max_delay else None
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+class CircuitBreaker:
+    """
+    Fail fast while an upstream is down
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are rejected for `reset_timeout` seconds. Then a single trial
+    call is let through (half-open); success closes the circuit again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call should not go out"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == self.OPEN and elapsed >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+
+            raise CircuitOpenError(self.name, max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"   🔌 Circuit for {self.name} opened after {self._failures} failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+class ResiliencePolicy:
+    """Retry policy + circuit breaker for one upstream platform"""
+
+    def __init__(
+        self,
+        name: str,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.name = name
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker(name)
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call `func` with retries and circuit breaking
+
+        Exceptions are retried only when transient (and, for non-idempotent
+        policies, safe to resend). Functions that return a
+        `requests.Response` are retried on retryable statuses too; the last
+        response is returned if retries run out (or the upstream asks us
+        to wait longer than max_delay).
+        """
+        for attempt in range(self.retry.max_attempts):
+            self.breaker.before_call()
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if self.retry.is_transient(e) and _counts_as_outage(e):
+                    self.breaker.record_failure()
+                else:
+                    # Permanent errors (private playlist, bad request) say nothing about upstream health
+                    self.breaker.record_success()
+
+                if not self.retry.is_retryable(e) or attempt == self.retry.max_attempts - 1:
+                    raise
+
+                delay = self.retry.delay(attempt, e)
+                if delay is None:
+                    print(f"   ⏳ {self.name}: {type(e).__name__}, Retry-After is past {self.retry.max_delay:.0f}s, giving up")
+                    raise
+                print(f"   ⏳ {self.name}: {type(e).__name__}, retrying in {delay:.1f}s...")
+                time.sleep(delay)
+                continue
+
+            status = getattr(result, 'status_code', None)
+            if status is not None and self.retry.is_transient(result):
+                if _counts_as_outage(result):
+                    self.breaker.record_failure()
+                else:
+                    # A 429 means the upstream is up; this also releases a half-open trial
+                    self.breaker.record_success()
+                if not self.retry.is_retryable(result) or attempt == self.retry.max_attempts - 1:
+                    return result
+
+                delay = self.retry.delay(attempt, result)
+                if delay is None:
+                    print(f"   ⏳ {self.name}: HTTP {status}, Retry-After is past {self.retry.max_delay:.0f}s, giving up")
+                    return result
+                print(f"   ⏳ {self.name}: HTTP {status}, retrying in {delay:.1f}s...")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
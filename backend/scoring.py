@@ -0,0 +1,78 @@
+# backend/scoring.py
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from fuzzywuzzy import fuzz
+
+# Combined score = title * TITLE_WEIGHT + artist * ARTIST_WEIGHT (0-100)
+TITLE_WEIGHT = 0.6
+ARTIST_WEIGHT = 0.4
+MATCH_THRESHOLD = 70
+
+def _combine(title_score: float, artist_score: float) -> float:
+    return (title_score * TITLE_WEIGHT) + (artist_score * ARTIST_WEIGHT)
+
+def ratio_score(title: str, artist: str, candidate_title: str, candidate_artist: str) -> float:
+    """Plain edit-distance ratio (what YouTube Music matching has always used)"""
+    return _combine(
+        fuzz.ratio(title.lower(), candidate_title.lower()),
+        fuzz.ratio(artist.lower(), candidate_artist.lower())
+    )
+
+def ratio_token_sort_score(title: str, artist: str, candidate_title: str, candidate_artist: str) -> float:
+    """Best of ratio and token-sort ratio, handles word order (Apple Music matching)"""
+    title, artist = title.lower(), artist.lower()
+    candidate_title, candidate_artist = candidate_title.lower(), candidate_artist.lower()
+    return _combine(
+        max(fuzz.ratio(title, candidate_title), fuzz.token_sort_ratio(title, candidate_title)),
+        max(fuzz.ratio(artist, candidate_artist), fuzz.token_sort_ratio(artist, candidate_artist))
+    )
+
+def token_set_score(title: str, artist: str, candidate_title: str, candidate_artist: str) -> float:
+    """Token-set ratio, tolerant of extra words like "feat. X" or "Remastered" """
+    return _combine(
+        fuzz.token_set_ratio(title, candidate_title),
+        fuzz.token_set_ratio(artist, candidate_artist)
+    )
+
+_NOISE = re.compile(r'\(.*?\)|\[.*?\]|\s-\s.*$|\s(?:feat|ft)\..*$', re.IGNORECASE)
+
+def _normalize(text: str) -> str:
+    return ' '.join(_NOISE.sub('', text).lower().split())
+
+def exact_then_token_sort_score(title: str, artist: str, candidate_title: str, candidate_artist: str) -> float:
+    """Skip fuzzy scoring entirely when normalized title and artist are equal"""
+    if _normalize(title) == _normalize(candidate_title) and _normalize(artist) == _normalize(candidate_artist):
+        return 100.0
+    return ratio_token_sort_score(title, artist, candidate_title, candidate_artist)
+
+SCORERS: Dict[str, Callable[[str, str, str, str], float]] = {
+    'ratio': ratio_score,
+    'ratio_token_sort': ratio_token_sort_score,
+    'token_set': token_set_score,
+    'exact_then_token_sort': exact_then_token_sort_score,
+}
+
+def best_candidate(
+    title: str,
+    artist: str,
+    candidates: List[Tuple[str, str]],
+    scorer: str = 'ratio'
+) -> Tuple[Optional[int], float]:
+    """
+    Score (title, artist) candidates against a source track
+
+    Returns:
+        (index of the best candidate or None, its score 0-100)
+    """
+    score_fn = SCORERS[scorer]
+    best_index = None
+    best_score = 0
+
+    for i, (candidate_title, candidate_artist) in enumerate(candidates):
+        score = score_fn(title, artist, candidate_title, candidate_artist)
+        if score > best_score:
+            best_score = score
+            best_index = i
+
+    return best_index, best_score
@@ -0,0 +1,97 @@
+# backend/session_backends/base.py
+
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+_named_locks_guard = threading.Lock()
+
+class SessionBackend(ABC):
+    """
+    Base class for session storage backends
+
+    Backends store opaque string values under string keys with a TTL and
+    follow Redis semantics, so SessionManager behaves the same whichever
+    backend is configured.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored value or None if missing/expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: int) -> None:
+        """Store a value that expires after `ttl` seconds"""
+        pass
+
+    @abstractmethod
+    def set_if_absent(self, key: str, value: str, ttl: int) -> bool:
+        """
+        Store a value only if the key doesn't exist yet (atomically, like SET NX)
+
+        Returns True if it was stored
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete a key, returns True if it existed"""
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Check if a key exists and has not expired"""
+        pass
+
+    @abstractmethod
+    def expire(self, key: str, ttl: int) -> bool:
+        """Reset the TTL of an existing key, returns False if it is missing"""
+        pass
+
+    @abstractmethod
+    def ttl(self, key: str) -> int:
+        """
+        Remaining TTL in seconds
+
+        Returns -2 if the key does not exist and -1 if it has no expiry
+        (same as Redis TTL)
+        """
+        pass
+
+    @abstractmethod
+    def keys(self, prefix: str) -> List[str]:
+        """Live keys starting with `prefix` (a full scan, keep it off hot paths)"""
+        pass
+
+    @abstractmethod
+    def ping(self) -> bool:
+        """Health check"""
+        pass
+
+    @contextmanager
+    def lock(self, name: str, timeout: float = 10) -> Iterator[None]:
+        """
+        Mutual exclusion for a read-modify-write over several keys
+
+        The default only excludes other threads using this backend
+        instance; stores shared between workers override it with a lock
+        every worker sees. Names may be per key (e.g. one per record), a
+        lock is forgotten once nobody holds or waits for it.
+        """
+        with _named_locks_guard:
+            locks = self.__dict__.setdefault('_named_locks', {})
+            entry = locks.setdefault(name, [threading.Lock(), 0])
+            entry[1] += 1
+
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with _named_locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del locks[name]
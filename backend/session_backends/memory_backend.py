@@ -0,0 +1,145 @@
+# backend/session_backends/memory_backend.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from .base import SessionBackend
+
+class MemorySessionBackend(SessionBackend):
+    """
+    In-process session store with TTL expiry and LRU eviction
+
+    Good for single-node deployments and tests: no Redis server and no
+    network hop. Memory is bounded by both entry count and total value
+    size (UTF-8 bytes); when either limit is hit the least recently used
+    entries are evicted. Expired entries are dropped when they are read
+    or reach the LRU head, and swept at most every PURGE_INTERVAL
+    seconds, so a store running at capacity doesn't scan every entry on
+    every write. A value bigger than max_bytes on its own is refused.
+    """
+
+    name = 'memory'
+
+    PURGE_INTERVAL = 60  # seconds between expired-entry sweeps
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (value, expires_at, size); ordered from least to most recently used
+        self._data: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._next_purge = time.monotonic() + self.PURGE_INTERVAL
+        self._lock = threading.Lock()
+
+    def _live_entry(self, key: str) -> Optional[Tuple[str, float, int]]:
+        """Return the entry if present and not expired (caller holds the lock)"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        if entry[1] <= time.monotonic():
+            self._remove(key)
+            return None
+
+        return entry
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        self._next_purge = now + self.PURGE_INTERVAL
+        for key in [k for k, (_, expires_at, _) in self._data.items() if expires_at <= now]:
+            self._remove(key)
+
+    def _enforce_limits(self) -> None:
+        if len(self._data) <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+
+        if time.monotonic() >= self._next_purge:
+            self._purge_expired()
+
+        # Evict least recently used until we are back under both limits
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            key = next(iter(self._data))
+            self._remove(key)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None:
+                return None
+
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def _size(self, value: str) -> int:
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            # Storing it would evict everything else and then the value itself
+            raise ValueError(f"Value of {size} bytes exceeds the store's {self.max_bytes} byte limit")
+        return size
+
+    def _store(self, key: str, value: str, ttl: int, size: int) -> None:
+        if key in self._data:
+            self._remove(key)
+
+        self._data[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+        self._enforce_limits()
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        size = self._size(value)
+        with self._lock:
+            self._store(key, value, ttl, size)
+
+    def set_if_absent(self, key: str, value: str, ttl: int) -> bool:
+        size = self._size(value)
+        with self._lock:
+            if self._live_entry(key) is not None:
+                return False
+
+            self._store(key, value, ttl, size)
+            return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if self._live_entry(key) is None:
+                return False
+
+            self._remove(key)
+            return True
+
+    def exists(self, key: str) -> bool:
+        with self._lock:
+            return self._live_entry(key) is not None
+
+    def expire(self, key: str, ttl: int) -> bool:
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None:
+                return False
+
+            self._data[key] = (entry[0], time.monotonic() + ttl, entry[2])
+            return True
+
+    def ttl(self, key: str) -> int:
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None:
+                return -2
+
+            return int(round(entry[1] - time.monotonic()))
+
+    def keys(self, prefix: str) -> List[str]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                key for key, (_, expires_at, _) in self._data.items()
+                if key.startswith(prefix) and expires_at > now
+            ]
+
+    def ping(self) -> bool:
+        return True
@@ -0,0 +1,50 @@
+# backend/session_backends/redis_backend.py
+
+import re
+import redis
+from typing import ContextManager, List, Optional
+from .base import SessionBackend
+
+class RedisSessionBackend(SessionBackend):
+    """Sessions stored in Redis (shared between all API workers)"""
+
+    name = 'redis'
+
+    def __init__(self, url: str = 'redis://localhost:6379/0'):
+        self.client = redis.Redis.from_url(
+            url,
+            decode_responses=True  # Automatically decode bytes to strings
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self.client.setex(key, ttl, value)
+
+    def set_if_absent(self, key: str, value: str, ttl: int) -> bool:
+        return bool(self.client.set(key, value, ex=ttl, nx=True))
+
+    def delete(self, key: str) -> bool:
+        return self.client.delete(key) > 0
+
+    def exists(self, key: str) -> bool:
+        return self.client.exists(key) > 0
+
+    def expire(self, key: str, ttl: int) -> bool:
+        return bool(self.client.expire(key, ttl))
+
+    def ttl(self, key: str) -> int:
+        return self.client.ttl(key)
+
+    def keys(self, prefix: str) -> List[str]:
+        # SCAN rather than KEYS so a big keyspace doesn't block the server
+        pattern = re.sub(r'([*?\[\]\\])', r'\\\1', prefix) + '*'
+        return list(self.client.scan_iter(match=pattern, count=500))
+
+    def ping(self) -> bool:
+        return self.client.ping()
+
+    def lock(self, name: str, timeout: float = 10) -> ContextManager:
+        # redis-py's Lock (SET NX + Lua release), expires if its holder dies
+        return self.client.lock(f"lock:{name}", timeout=timeout, blocking_timeout=timeout)
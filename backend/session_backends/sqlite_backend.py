@@ -0,0 +1,135 @@
+# backend/session_backends/sqlite_backend.py
+
+import sqlite3
+import threading
+import time
+import zlib
+from typing import List, Optional
+from .base import SessionBackend
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Compact on-disk session store (cold tier)
+
+    Values are zlib-compressed and each row remembers its original TTL, so
+    `touch` can implement sliding expiration. Expired rows are skipped on
+    read and purged periodically on write.
+    """
+
+    name = 'sqlite'
+
+    PURGE_EVERY = 500  # writes between expired-row sweeps
+
+    def __init__(self, path: str = 'sessions.db'):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            '  key TEXT PRIMARY KEY,'
+            '  value BLOB NOT NULL,'
+            '  ttl INTEGER NOT NULL,'
+            '  expires_at REAL NOT NULL'
+            ')'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)')
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _purge_expired(self) -> None:
+        self._conn.execute('DELETE FROM sessions WHERE expires_at <= ?', (time.time(),))
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM sessions WHERE key = ? AND expires_at > ?',
+                (key, time.time())
+            ).fetchone()
+
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        blob = zlib.compress(value.encode('utf-8'))
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sessions (key, value, ttl, expires_at) VALUES (?, ?, ?, ?)',
+                (key, blob, ttl, time.time() + ttl)
+            )
+
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._purge_expired()
+
+    def set_if_absent(self, key: str, value: str, ttl: int) -> bool:
+        blob = zlib.compress(value.encode('utf-8'))
+        now = time.time()
+
+        # One statement, so it is atomic across processes sharing the file too
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO sessions (key, value, ttl, expires_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET value = excluded.value, ttl = excluded.ttl, '
+                'expires_at = excluded.expires_at WHERE sessions.expires_at <= ?',
+                (key, blob, ttl, now + ttl, now)
+            )
+        return cursor.rowcount > 0
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM sessions WHERE key = ?', (key,))
+        return cursor.rowcount > 0
+
+    def exists(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM sessions WHERE key = ? AND expires_at > ?',
+                (key, time.time())
+            ).fetchone()
+        return row is not None
+
+    def expire(self, key: str, ttl: int) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                'UPDATE sessions SET ttl = ?, expires_at = ? WHERE key = ? AND expires_at > ?',
+                (ttl, now + ttl, key, now)
+            )
+        return cursor.rowcount > 0
+
+    def touch(self, key: str) -> bool:
+        """Sliding expiration: push expiry out by the key's original TTL"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                'UPDATE sessions SET expires_at = ? + ttl WHERE key = ? AND expires_at > ?',
+                (now, key, now)
+            )
+        return cursor.rowcount > 0
+
+    def ttl(self, key: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT expires_at FROM sessions WHERE key = ? AND expires_at > ?',
+                (key, time.time())
+            ).fetchone()
+
+        if row is None:
+            return -2
+        return int(round(row[0] - time.time()))
+
+    def keys(self, prefix: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key FROM sessions WHERE substr(key, 1, ?) = ? AND expires_at > ?',
+                (len(prefix), prefix, time.time())
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def ping(self) -> bool:
+        with self._lock:
+            self._conn.execute('SELECT 1').fetchone()
+        return True
@@ -0,0 +1,122 @@
+# backend/session_backends/tiered_backend.py
+
+from typing import ContextManager, List, Optional
+from .base import SessionBackend
+from .sqlite_backend import SQLiteSessionBackend
+from metrics import record_cache
+
+# Keys whose expiry slides with use (sessions); conversion dedupe, checkpoints,
+# identities, leases and the HTTP cache keep the expiry they were written with
+SLIDING_PREFIXES = ('playlist:',)
+# A hot hit only slides the expiry once this fraction of hot_ttl has run out
+SLIDE_AFTER = 0.5
+
+class TieredSessionBackend(SessionBackend):
+    """
+    Hot/cold session storage
+
+    Every session is written through to the cold on-disk store, which owns
+    the real expiry. The hot tier (usually Redis) only keeps a copy for
+    `hot_ttl` seconds after the last access, so its memory tracks the active
+    working set instead of everything created in the last 24 hours. Idle
+    sessions simply age out of the hot tier and are promoted back on the
+    next read.
+
+    Single host only: the cold tier is a SQLite file on this machine. Every
+    worker process on the host can share it, but workers on other hosts
+    would each see their own cold tier behind the same hot one (promoting
+    stale copies, missing each other's sessions). Use the redis backend
+    when running on more than one host.
+
+    Sliding expiration applies to session keys (SLIDING_PREFIXES) only. A
+    hot hit doesn't write anything until the hot copy is past SLIDE_AFTER
+    of its hot_ttl, so a busy session costs a TTL check per read rather
+    than a SQLite update; the cold expiry lags its last use by at most
+    that much.
+    """
+
+    name = 'tiered'
+
+    def __init__(
+        self,
+        hot: SessionBackend,
+        cold: SQLiteSessionBackend,
+        hot_ttl: int = 900,
+        sliding: bool = True
+    ):
+        self.hot = hot
+        self.cold = cold
+        self.hot_ttl = hot_ttl
+        self.sliding = sliding
+
+    def _slides(self, key: str) -> bool:
+        return self.sliding and key.startswith(SLIDING_PREFIXES)
+
+    def _hot_ttl_for(self, remaining: int) -> int:
+        return max(1, min(self.hot_ttl, remaining))
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.hot.get(key)
+        record_cache('session_hot_tier', value is not None)
+
+        if value is not None:
+            if self._slides(key) and self.hot.ttl(key) < self.hot_ttl * SLIDE_AFTER:
+                if self.cold.touch(key):
+                    self.hot.expire(key, self._hot_ttl_for(self.cold.ttl(key)))
+            return value
+
+        # Cold hit: promote back into the hot tier
+        value = self.cold.get(key)
+        if value is None:
+            return None
+
+        if self._slides(key):
+            self.cold.touch(key)
+
+        remaining = self.cold.ttl(key)
+        if remaining > 0:
+            self.hot.set(key, value, self._hot_ttl_for(remaining))
+
+        return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self.cold.set(key, value, ttl)
+        self.hot.set(key, value, self._hot_ttl_for(ttl))
+
+    def set_if_absent(self, key: str, value: str, ttl: int) -> bool:
+        # The hot tier is shared by every worker, so it decides who gets the key
+        if not self.hot.set_if_absent(key, value, self._hot_ttl_for(ttl)):
+            return False
+
+        self.cold.set(key, value, ttl)
+        return True
+
+    def delete(self, key: str) -> bool:
+        deleted_hot = self.hot.delete(key)
+        deleted_cold = self.cold.delete(key)
+        return deleted_hot or deleted_cold
+
+    def exists(self, key: str) -> bool:
+        return self.hot.exists(key) or self.cold.exists(key)
+
+    def expire(self, key: str, ttl: int) -> bool:
+        if not self.cold.expire(key, ttl):
+            return False
+
+        self.hot.expire(key, self._hot_ttl_for(ttl))
+        return True
+
+    def ttl(self, key: str) -> int:
+        # The cold tier holds the authoritative expiry
+        return self.cold.ttl(key)
+
+    def keys(self, prefix: str) -> List[str]:
+        # Every key is written through to the cold tier
+        return self.cold.keys(prefix)
+
+    def ping(self) -> bool:
+        return self.hot.ping() and self.cold.ping()
+
+    def lock(self, name: str, timeout: float = 10) -> ContextManager:
+        # The hot tier is the one every worker shares (Redis in production)
+        return self.hot.lock(name, timeout)
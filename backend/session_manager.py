@@ -1,20 +1,59 @@
 # backend/session_manager.py (COMPLETE FILE)
 
-import redis
+import os
 import json
 import secrets
 import time
+from contextlib import contextmanager
 from typing import List, Dict, Optional
+from session_backends.base import SessionBackend
+from metrics import SESSION_STORE_LATENCY
+from profiling import stage
 
-class SessionManager:
-    def __init__(self):
-        """Initialize Redis connection"""
-        self.redis_client = redis.Redis(
-            host='localhost',
-            port=6379,
-            db=0,
-            decode_responses=True  # Automatically decode bytes to strings
+def create_backend(name: Optional[str] = None) -> SessionBackend:
+    """
+    Build the session backend selected by configuration
+
+    SESSION_BACKEND=redis (default), memory or tiered (single host)
+    """
+    name = (name or os.getenv('SESSION_BACKEND', 'redis')).lower()
+
+    if name == 'redis':
+        # Imported lazily so memory-only deployments don't need the redis package
+        from session_backends.redis_backend import RedisSessionBackend
+        return RedisSessionBackend(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+
+    if name == 'memory':
+        from session_backends.memory_backend import MemorySessionBackend
+        return MemorySessionBackend(
+            max_entries=int(os.getenv('SESSION_MEMORY_MAX_ENTRIES', '10000')),
+            max_bytes=int(os.getenv('SESSION_MEMORY_MAX_BYTES', str(256 * 1024 * 1024)))
+        )
+
+    if name == 'tiered':
+        # Hot sessions in SESSION_HOT_BACKEND, idle ones spilled to SQLite
+        # (a local file: single-host deployments only, see TieredSessionBackend)
+        from session_backends.sqlite_backend import SQLiteSessionBackend
+        from session_backends.tiered_backend import TieredSessionBackend
+        return TieredSessionBackend(
+            hot=create_backend(os.getenv('SESSION_HOT_BACKEND', 'redis')),
+            cold=SQLiteSessionBackend(os.getenv('SESSION_COLD_PATH', 'sessions.db')),
+            hot_ttl=int(os.getenv('SESSION_HOT_TTL', '900')),
+            sliding=os.getenv('SESSION_SLIDING_EXPIRATION', 'true').lower() == 'true'
         )
+
+    raise ValueError(f"Unknown session backend: {name}")
+
+class SessionManager:
+    def __init__(self, backend: Optional[SessionBackend] = None):
+        """Initialize the configured session backend"""
+        self.backend = backend or create_backend()
+    
+    @contextmanager
+    def _timed(self, operation: str):
+        """Record session store latency (metrics + per-request stage timing)"""
+        with SESSION_STORE_LATENCY.labels(operation, self.backend.name).time(), stage(f'session.{operation}'):
+            yield
     
     def generate_code(self) -> str:
         """Generate a unique 4-digit code"""
@@ -22,7 +61,9 @@ class SessionManager:
             code = str(secrets.randbelow(9000) + 1000)  # 1000-9999
             
             # Check if code already exists
-            if not self.redis_client.exists(f"playlist:{code}"):
+            with self._timed('exists'):
+                taken = self.backend.exists(f"playlist:{code}")
+            if not taken:
                 return code
     
     def save_session(
@@ -30,16 +71,20 @@ class SessionManager:
         tracks: List[Dict], 
         target_platform: str = None,
         source_platform: str = None,
-        ttl: int = 86400
+        ttl: int = 86400,
+        pending: bool = False,
+        stats: Optional[Dict] = None
     ) -> str:
         """
-        Save playlist session to Redis
+        Save playlist session to the session backend
         
         Args:
             tracks: List of matched track dictionaries
             target_platform: Which platform was targeted
             source_platform: Which platform was the source
             ttl: Time to live in seconds (default 24 hours)
+            pending: Tracks are still being matched (see update_session)
+            stats: Match statistics, stored so reads needn't recompute them
         
         Returns:
             Session code
@@ -52,15 +97,18 @@ class SessionManager:
             'tracks': tracks,
             'target_platform': target_platform,
             'source_platform': source_platform,
+            'pending': pending,
+            'stats': stats,
             'created_at': time.time()
         }
         
         # Store as JSON
-        self.redis_client.setex(
-            key,
-            ttl,
-            json.dumps(session_data)
-        )
+        with self._timed('save'):
+            self.backend.set(
+                key,
+                json.dumps(session_data),
+                ttl
+            )
         
         print(f"✅ Session saved with code: {code}")
         print(f"   Target platform: {target_platform}")
@@ -71,7 +119,7 @@ class SessionManager:
     
     def get_session(self, code: str) -> Optional[Dict]:
         """
-        Retrieve playlist session from Redis
+        Retrieve playlist session from the session backend
         
         Args:
             code: Session code
@@ -80,26 +128,54 @@ class SessionManager:
             Session data dict or None if not found
         """
         key = f"playlist:{code}"
-        data = self.redis_client.get(key)
+        with self._timed('get'):
+            data = self.backend.get(key)
         
         if data:
             return json.loads(data)
         return None
     
+    def update_session(self, code: str, **fields) -> bool:
+        """
+        Update fields of an existing session in place
+        
+        The session keeps its code and remaining TTL.
+        
+        Returns:
+            False if the session no longer exists
+        """
+        key = f"playlist:{code}"
+        with self._timed('get'):
+            data = self.backend.get(key)
+            ttl = self.backend.ttl(key)
+        
+        if not data or ttl <= 0:
+            return False
+        
+        session_data = json.loads(data)
+        session_data.update(fields)
+        
+        with self._timed('save'):
+            self.backend.set(key, json.dumps(session_data), ttl)
+        return True
+    
     def delete_session(self, code: str) -> bool:
         """Delete a session"""
         key = f"playlist:{code}"
-        return self.redis_client.delete(key) > 0
+        with self._timed('delete'):
+            return self.backend.delete(key)
     
     def session_exists(self, code: str) -> bool:
         """Check if session exists"""
         key = f"playlist:{code}"
-        return self.redis_client.exists(key) > 0
+        with self._timed('exists'):
+            return self.backend.exists(key)
     
     def get_session_ttl(self, code: str) -> int:
         """Get remaining TTL in seconds"""
         key = f"playlist:{code}"
-        return self.redis_client.ttl(key)
+        with self._timed('ttl'):
+            return self.backend.ttl(key)
 
 
 # Test it!
@@ -3,11 +3,11 @@ from dotenv import load_dotenv
 import os 
 import spotipy 
 from spotipy.oauth2 import SpotifyClientCredentials
+from http_transport import get_session, DEFAULT_TIMEOUT
+from url_router import router
 # Load environment variables from .env file
 
 load_dotenv()
-print("SPOTIPY_CLIENT_ID:", os.getenv("SPOTIPY_CLIENT_ID"))
-print("SPOTIPY_CLIENT_SECRET:", "SET" if os.getenv("SPOTIPY_CLIENT_SECRET") else "MISSING")
 
 class SpotifyClient: 
     def __init__(self):
@@ -18,48 +18,57 @@ class SpotifyClient:
         # Client Credentials Flow (No user authorization required)
         auth_manager = SpotifyClientCredentials(
             client_id=client_id,
-            client_secret=client_secret
+            client_secret=client_secret,
+            requests_session=get_session()
+        )
+        self.sp = spotipy.Spotify(
+            auth_manager=auth_manager,
+            requests_session=get_session(),  # Shared pooled transport
+            requests_timeout=DEFAULT_TIMEOUT[1]
         )
-        self.sp = spotipy.Spotify(auth_manager=auth_manager)
 
     def extract_playlist_id(self, url):
         """Extract the playlist ID from a Spotify playlist URL."""
-        import re
-
-        patterns = [
-            r'spotify\.com/playlist/([a-zA-Z0-9]+)',
-            r'spotify:playlist:([a-zA-Z0-9]+)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
+        route = router.match(url)
+        if route and route.platform == 'spotify' and route.kind == 'playlist':
+            return route.resource_id
         
         return None
 
     def get_playlist_tracks(self, playlist_id):
         """Fetch all tracks from a playlist"""
-        results = self.sp.playlist_tracks(playlist_id)
         tracks = []
+        for page in self.iter_playlist_pages(playlist_id):
+            tracks.extend(page)
 
-        while results: 
-            for item in results['items']:
-                track = item['track']
-                if track: 
-                    tracks.append({
-                        'title': track['name'],
-                        'artists': track['artists'][0]['name'],
-                        'album': track['album']['name'],
-                        'isrc': track['external_ids'].get('isrc'),
-                        'spotify_id': track['id'],
-                        'duration_ms': track['duration_ms'] 
-                    })
+        return tracks
 
-            # FIX: This must be OUTSIDE the 'for' loop, but inside the 'while' loop
-            results = self.sp.next(results) if results['next'] else None
+    def iter_playlist_pages(self, playlist_id, call=None):
+        """
+        Yield a playlist's tracks one API page (up to 100) at a time
 
-        return tracks
+        `call(func, *args)` wraps every page request (e.g. a retry policy),
+        so a failed page is retried on its own.
+        """
+        call = call or (lambda func, *args: func(*args))
+        results = call(self.sp.playlist_tracks, playlist_id)
+
+        while results: 
+            yield [
+                {
+                    'title': track['name'],
+                    'artists': track['artists'][0]['name'],
+                    'album': track['album']['name'],
+                    'isrc': track['external_ids'].get('isrc'),
+                    'spotify_id': track['id'],
+                    'duration_ms': track['duration_ms'] 
+                }
+                for track in (item['track'] for item in results['items'])
+                if track
+            ]
+
+            # Next page (the raw one can be dropped once it's parsed)
+            results = call(self.sp.next, results) if results['next'] else None
         # Testing 
 if __name__ == "__main__":
     client = SpotifyClient()
@@ -0,0 +1,28 @@
+# backend/tests/conftest.py
+
+import os
+import sys
+import time
+
+import pytest
+
+# The backend modules import each other as top-level modules (run from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class FakeClock:
+    """Stands in for time.monotonic, moved forward by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(time, 'monotonic', fake)
+    return fake
@@ -0,0 +1,122 @@
+# backend/tests/test_fair_scheduler.py
+
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from fair_scheduler import SMALL_JOB_TRACKS, SMALL_JOB_WEIGHT, FairExecutor, FairScheduler, Job, current_job
+
+class ManualLimiter:
+    """A rate limiter that only hands out the tokens a test gives it"""
+
+    def __init__(self):
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def give(self, tokens: int) -> None:
+        with self._lock:
+            self.tokens += tokens
+
+    def try_acquire(self) -> float:
+        with self._lock:
+            if self.tokens:
+                self.tokens -= 1
+                return 0.0
+        return 0.01
+
+def test_small_jobs_weigh_more_until_they_grow():
+    job = Job('conversion', SMALL_JOB_TRACKS)
+    assert job.weight == SMALL_JOB_WEIGHT
+
+    job.size += 1
+    assert job.weight == 1
+
+@pytest.fixture
+def executor():
+    pool = FairExecutor(max_workers=1, thread_name_prefix='test')
+    yield pool
+    pool.shutdown(cancel_futures=True)
+
+def test_executor_runs_a_small_job_ahead_of_a_large_backlog(executor):
+    started, release = threading.Event(), threading.Event()
+    executor.submit(None, lambda: (started.set(), release.wait()))
+    started.wait()
+
+    ran = []
+    large, small = Job('large', 5000), Job('small', 20)
+    futures = [executor.submit(large, ran.append, 'large') for _ in range(6)]
+    futures += [executor.submit(small, ran.append, 'small') for _ in range(2)]
+    release.set()
+    wait(futures)
+
+    assert ran == ['small'] * 2 + ['large'] * 6
+
+def test_executor_alternates_between_equal_jobs(executor):
+    started, release = threading.Event(), threading.Event()
+    executor.submit(None, lambda: (started.set(), release.wait()))
+    started.wait()
+
+    ran = []
+    a, b = Job('a', 5000), Job('b', 5000)
+    futures = [executor.submit(a, ran.append, 'a') for _ in range(3)]
+    futures += [executor.submit(b, ran.append, 'b') for _ in range(3)]
+    release.set()
+    wait(futures)
+
+    assert ran == ['b', 'a'] * 3
+
+def test_executor_passes_results_and_errors_through(executor):
+    assert executor.submit(None, sum, [1, 2]).result() == 3
+    with pytest.raises(ZeroDivisionError):
+        executor.submit(None, lambda: 1 / 0).result()
+
+def test_executor_shutdown_cancels_queued_tasks_and_wakes_waiters():
+    pool = FairExecutor(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    running = pool.submit(None, lambda: (started.set(), release.wait()))
+    started.wait()
+    queued = pool.submit(Job('large', 5000), time.sleep, 0)
+
+    waiter = threading.Thread(target=wait, args=([queued],))
+    waiter.start()
+    pool.shutdown(cancel_futures=True)
+    waiter.join(timeout=5)
+
+    assert not waiter.is_alive()
+    assert queued.cancelled()
+    with pytest.raises(RuntimeError):
+        pool.submit(None, time.sleep, 0)
+
+    release.set()
+    assert running.result(timeout=5)
+
+def test_scheduler_hands_tokens_out_by_weight():
+    limiter = ManualLimiter()
+    scheduler = FairScheduler(limiter)
+    granted = []
+
+    def request(job: Job) -> None:
+        current_job.set(job)
+        scheduler.acquire()
+        granted.append(job.name)
+
+    large, small = Job('large', 5000), Job('small', 20)
+    threads = [threading.Thread(target=request, args=(large,)) for _ in range(3)]
+    threads += [threading.Thread(target=request, args=(small,)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+        # Queue them in a known order
+        time.sleep(0.05)
+    assert scheduler.active_jobs() == 2
+
+    for _ in threads:
+        limiter.give(1)
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    # The large job's turn had started when the small one arrived
+    assert granted == ['large', 'small', 'small', 'large', 'large']
+    assert scheduler.active_jobs() == 0
@@ -0,0 +1,94 @@
+# backend/tests/test_identity_graph.py
+
+import random
+import threading
+
+import pytest
+
+from identity_graph import IDENTITY_MIN_CONFIDENCE, IdentityGraph
+from models import MatchResult, Track
+from session_backends.memory_backend import MemorySessionBackend
+
+@pytest.fixture
+def backend():
+    return MemorySessionBackend()
+
+@pytest.fixture
+def graph(backend):
+    return IdentityGraph(backend)
+
+def match(platform: str, id: str, confidence: float = 1.0) -> MatchResult:
+    return MatchResult(platform, id, title='Song', artist='Artist', confidence=confidence)
+
+def test_lookup_answers_both_directions(graph):
+    graph.link(Track('Song', 'Artist', spotify_id='S1'), match('youtube_music', 'Y1'))
+
+    assert graph.lookup(Track('Song', 'Artist', spotify_id='S1'), 'youtube_music').id == 'Y1'
+    found = graph.lookup(Track('Song', 'Artist', youtube_music_id='Y1'), 'spotify')
+    assert (found.id, found.method) == ('S1', 'identity')
+
+def test_links_through_a_shared_id_answer_every_pair(graph):
+    graph.link(Track('Song', 'Artist', spotify_id='S1'), match('youtube_music', 'Y1'))
+    graph.link(Track('Song', 'Artist', spotify_id='S1'), match('apple_music', 'A1'))
+
+    assert graph.lookup(Track('Song', 'Artist', youtube_music_id='Y1'), 'apple_music').id == 'A1'
+    assert graph.lookup(Track('Song', 'Artist', apple_music_id='A1'), 'youtube_music').id == 'Y1'
+
+def test_isrc_links_tracks_from_different_sources(graph):
+    graph.link(Track('Song', 'Artist', isrc='usabc', spotify_id='S1'), match('apple_music', 'A1'))
+
+    assert graph.lookup(Track('Song', 'Artist', isrc='USABC'), 'apple_music').id == 'A1'
+
+def test_unconfident_matches_are_not_linked(graph):
+    graph.link(Track('Song', 'Artist', spotify_id='S1'), match('youtube_music', 'Y1', IDENTITY_MIN_CONFIDENCE / 2))
+
+    assert graph.lookup(Track('Song', 'Artist', spotify_id='S1'), 'youtube_music') is None
+
+def test_more_confident_record_wins(graph):
+    graph.link(Track('Song', 'Artist', spotify_id='S1'), match('youtube_music', 'Y1', 0.95))
+    graph.link(Track('Song', 'Artist', spotify_id='S1'), match('youtube_music', 'Y2', 1.0))
+
+    assert graph.lookup(Track('Song', 'Artist', spotify_id='S1'), 'youtube_music').id == 'Y2'
+
+def make_cycle(backend) -> None:
+    for node, parent in [('spotify:A', 'youtube_music:B'), ('youtube_music:B', 'isrc:C'), ('isrc:C', 'spotify:A')]:
+        backend.set(f'identity:parent:{node}', parent, 100)
+
+def test_lookup_through_a_cycle_terminates_without_writing(backend, graph):
+    make_cycle(backend)
+    before = {key: backend.get(key) for key in backend.keys('identity:')}
+
+    assert graph.lookup(Track('Song', 'Artist', spotify_id='A'), 'apple_music') is None
+    assert {graph.find(node) for node in ('spotify:A', 'youtube_music:B', 'isrc:C')} == {'isrc:C'}
+    assert {key: backend.get(key) for key in backend.keys('identity:')} == before
+
+def test_link_repairs_a_cycle(backend, graph):
+    make_cycle(backend)
+
+    graph.link(Track('Song', 'Artist', spotify_id='A'), match('apple_music', 'Z'))
+
+    root = graph.find('spotify:A')
+    assert backend.get(f'identity:parent:{root}') is None
+    assert {graph.find(node) for node in ('youtube_music:B', 'isrc:C', 'apple_music:Z')} == {root}
+    assert graph.lookup(Track('Song', 'Artist', youtube_music_id='B'), 'apple_music').id == 'Z'
+
+def test_concurrent_links_end_in_consistent_sets(graph):
+    links = []
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(100):
+            pair = (rng.randrange(30), rng.randrange(30))
+            links.append(pair)
+            graph.link(Track('Song', 'Artist', spotify_id=f's{pair[0]}'), match('youtube_music', f'y{pair[1]}'))
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for spotify_id, youtube_id in links:
+        assert graph.find(f'spotify:s{spotify_id}') == graph.find(f'youtube_music:y{youtube_id}')
+    # No union left a named lock behind
+    assert not graph.backend.__dict__.get('_named_locks')
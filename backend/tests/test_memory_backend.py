@@ -0,0 +1,108 @@
+# backend/tests/test_memory_backend.py
+
+import pytest
+
+from session_backends.memory_backend import MemorySessionBackend
+
+def test_get_returns_what_was_set(clock):
+    backend = MemorySessionBackend()
+    backend.set('a', 'one', ttl=10)
+
+    assert backend.get('a') == 'one'
+    assert backend.exists('a')
+    assert backend.get('missing') is None
+
+def test_entries_expire_after_their_ttl(clock):
+    backend = MemorySessionBackend()
+    backend.set('a', 'one', ttl=10)
+
+    clock.advance(9)
+    assert backend.ttl('a') == 1
+    clock.advance(1)
+    assert backend.get('a') is None
+    assert backend.ttl('a') == -2
+    assert not backend.delete('a')
+
+def test_expire_moves_the_deadline(clock):
+    backend = MemorySessionBackend()
+    backend.set('a', 'one', ttl=10)
+
+    assert backend.expire('a', 100)
+    clock.advance(50)
+    assert backend.get('a') == 'one'
+    assert not backend.expire('missing', 100)
+
+def test_keys_skips_expired_entries(clock):
+    backend = MemorySessionBackend()
+    backend.set('playlist:1', 'x', ttl=10)
+    backend.set('playlist:2', 'x', ttl=100)
+    backend.set('other', 'x', ttl=100)
+
+    clock.advance(20)
+    assert backend.keys('playlist:') == ['playlist:2']
+
+def test_least_recently_used_entry_is_evicted(clock):
+    backend = MemorySessionBackend(max_entries=3)
+    for key in 'abc':
+        backend.set(key, key, ttl=100)
+
+    backend.get('a')
+    backend.set('d', 'd', ttl=100)
+
+    assert backend.get('b') is None
+    assert [backend.get(key) for key in 'acd'] == ['a', 'c', 'd']
+
+def test_byte_limit_counts_utf8_bytes(clock):
+    backend = MemorySessionBackend(max_bytes=10)
+    backend.set('a', 'ééé', ttl=100)  # 6 bytes, 3 characters
+    backend.set('b', 'éé', ttl=100)  # 4 bytes: 10 in total, still fits
+    assert backend.exists('a')
+
+    backend.set('c', 'x', ttl=100)
+    assert backend.get('a') is None
+    assert backend.get('b') == 'éé'
+    assert backend.get('c') == 'x'
+
+def test_overwrite_replaces_the_old_size(clock):
+    backend = MemorySessionBackend(max_bytes=10)
+    backend.set('a', 'x' * 8, ttl=100)
+    backend.set('a', 'x', ttl=100)
+    backend.set('b', 'x' * 9, ttl=100)
+
+    assert backend.get('a') == 'x'
+    assert backend.get('b') == 'x' * 9
+
+def test_oversized_value_is_refused_without_touching_the_store(clock):
+    backend = MemorySessionBackend(max_bytes=10)
+    backend.set('a', 'small', ttl=100)
+
+    with pytest.raises(ValueError):
+        backend.set('b', 'x' * 11, ttl=100)
+
+    assert backend.get('a') == 'small'
+    assert backend.get('b') is None
+
+def test_expired_entries_are_swept_before_evicting_live_ones(clock):
+    backend = MemorySessionBackend(max_entries=2)
+    backend.set('short', 'x', ttl=1)
+    backend.set('long', 'x', ttl=1000)
+
+    clock.advance(MemorySessionBackend.PURGE_INTERVAL)
+    # Over the limit: the sweep is due, so the expired entry goes instead of a live one
+    backend.set('new', 'x', ttl=1000)
+    backend.get('long')
+    backend.set('newer', 'x', ttl=1000)
+
+    assert backend.get('long') == 'x'
+    assert backend.get('newer') == 'x'
+
+def test_set_if_absent_only_sets_missing_or_expired_keys(clock):
+    backend = MemorySessionBackend()
+
+    assert backend.set_if_absent('lease', 'me', ttl=10)
+    assert not backend.set_if_absent('lease', 'you', ttl=10)
+    assert backend.get('lease') == 'me'
+
+    clock.advance(10)
+    assert backend.set_if_absent('lease', 'you', ttl=10)
+    assert backend.get('lease') == 'you'
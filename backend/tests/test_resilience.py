@@ -0,0 +1,157 @@
+# backend/tests/test_resilience.py
+
+import time
+
+import pytest
+
+from resilience import CircuitBreaker, CircuitOpenError, ResiliencePolicy, RetryPolicy
+
+class FakeResponse:
+    def __init__(self, status_code: int, retry_after=None):
+        self.status_code = status_code
+        self.headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+
+class Flaky:
+    """Returns (or raises) each outcome in turn, then succeeds"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.outcomes:
+            outcome = self.outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return FakeResponse(200)
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(time, 'sleep', slept.append)
+    return slept
+
+def policy(idempotent: bool = True, **breaker) -> ResiliencePolicy:
+    return ResiliencePolicy(
+        'test',
+        retry=RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=5, idempotent=idempotent),
+        breaker=CircuitBreaker('test', **breaker)
+    )
+
+def test_transient_errors_are_retried(sleeps):
+    call = Flaky(ConnectionError('reset'), FakeResponse(503))
+
+    assert policy().call(call).status_code == 200
+    assert call.calls == 3
+    assert len(sleeps) == 2
+
+def test_permanent_errors_are_not_retried(sleeps):
+    call = Flaky(ValueError('bad request'))
+
+    with pytest.raises(ValueError):
+        policy().call(call)
+    assert call.calls == 1
+
+def test_last_response_is_returned_when_retries_run_out(sleeps):
+    call = Flaky(*[FakeResponse(503)] * 3)
+
+    assert policy().call(call).status_code == 503
+    assert call.calls == 3
+
+def test_non_idempotent_calls_only_resend_429(sleeps):
+    call = Flaky(FakeResponse(503))
+    assert policy(idempotent=False).call(call).status_code == 503
+    assert call.calls == 1
+
+    call = Flaky(FakeResponse(429))
+    assert policy(idempotent=False).call(call).status_code == 200
+    assert call.calls == 2
+
+def test_retry_after_is_honoured_up_to_max_delay(sleeps):
+    call = Flaky(FakeResponse(429, retry_after=2))
+
+    assert policy().call(call).status_code == 200
+    assert sleeps == [2.0]
+
+def test_retry_after_past_max_delay_fails_fast(sleeps):
+    call = Flaky(FakeResponse(429, retry_after=60))
+
+    assert policy().call(call).status_code == 429
+    assert call.calls == 1
+    assert sleeps == []
+
+def test_backoff_is_capped_at_max_delay():
+    retry = RetryPolicy(base_delay=10, max_delay=2)
+
+    assert all(retry.delay(attempt) <= 2 for attempt in range(10))
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_breaker_lets_one_trial_through_once_reset(clock):
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    clock.advance(30)
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+def test_failed_trial_opens_the_breaker_again(clock):
+    breaker = CircuitBreaker('test', failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+
+    clock.advance(30)
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_429s_do_not_trip_the_breaker(sleeps):
+    resilience = policy(failure_threshold=2)
+    for _ in range(3):
+        resilience.call(Flaky(*[FakeResponse(429)] * 3))
+
+    assert resilience.breaker.state == CircuitBreaker.CLOSED
+
+def test_429_on_the_half_open_trial_releases_it(clock, sleeps):
+    resilience = ResiliencePolicy(
+        'test',
+        retry=RetryPolicy(max_attempts=1),
+        breaker=CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+    )
+    with pytest.raises(ConnectionError):
+        resilience.call(Flaky(ConnectionError('down')))
+    assert resilience.breaker.state == CircuitBreaker.OPEN
+
+    clock.advance(30)
+    # The upstream answers (if only to say slow down): the trial must not stay in flight forever
+    assert resilience.call(Flaky(FakeResponse(429))).status_code == 429
+    assert resilience.breaker.state == CircuitBreaker.CLOSED
+    assert resilience.call(Flaky()).status_code == 200
+
+def test_open_breaker_rejects_without_calling(clock):
+    resilience = policy(failure_threshold=1)
+    resilience.breaker.record_failure()
+    call = Flaky()
+
+    with pytest.raises(CircuitOpenError):
+        resilience.call(call)
+    assert call.calls == 0
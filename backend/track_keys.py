@@ -0,0 +1,52 @@
+# backend/track_keys.py
+
+import re
+from typing import Dict, List, Tuple
+
+from models import SOURCE_ID_KEYS, Track
+
+_NON_ALNUM = re.compile(r'[\W_]+', re.UNICODE)
+
+def dedupe_keys(track: Track) -> List[Tuple[str, str]]:
+    """
+    Identity keys for collapsing duplicate tracks before matching
+
+    Two tracks are the same song if they share a source id, an ISRC or
+    the same title + artist after case/punctuation normalization.
+    Qualifiers like "(Live)" are kept, they are different recordings.
+    """
+    keys = [(key, value) for key in SOURCE_ID_KEYS if (value := getattr(track, key))]
+    
+    if track.isrc:
+        keys.append(('isrc', track.isrc.upper()))
+    
+    title = _NON_ALNUM.sub(' ', (track.title or '').casefold()).strip()
+    if title:
+        keys.append(('meta', f"{title}|{_NON_ALNUM.sub(' ', (track.artist or '').casefold()).strip()}"))
+    
+    return keys
+
+def collapse_duplicates(tracks: List[Track]) -> Tuple[List[Track], List[int]]:
+    """
+    Reduce a track list to its unique songs
+
+    Returns:
+        (unique tracks, index into the unique list for every input track)
+    """
+    unique = []
+    positions = []
+    seen: Dict[Tuple[str, str], int] = {}
+    
+    for track in tracks:
+        keys = dedupe_keys(track)
+        index = next((seen[key] for key in keys if key in seen), None)
+        
+        if index is None:
+            index = len(unique)
+            unique.append(track)
+        
+        for key in keys:
+            seen.setdefault(key, index)
+        positions.append(index)
+    
+    return unique, positions
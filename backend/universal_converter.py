@@ -1,19 +1,328 @@
 # backend/universal_converter.py
 
-from typing import List, Dict
+import contextvars
+import itertools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 from platform_detector import PlatformDetector
 from platforms.base import MusicPlatform
+from metrics import CONVERSIONS, CONVERSION_DURATION, CONVERSIONS_IN_FLIGHT
+from profiling import stage
+from resilience import CircuitOpenError
+from match_engine import MatchEngine, get_match_engine
+from track_keys import collapse_duplicates
+from checkpoints import CHECKPOINT_LEASE_TTL, CheckpointStore, checkpoint_key, track_identity
+from models import MatchResult, MatchedTrack, Track, deserialize_track, serialize_track
+
+# Conversions finishing in the background (each mostly waits on the match pool)
+CONVERT_WORKERS = int(os.getenv('CONVERT_WORKERS', '32'))
+# Playlist pages fetched ahead of matching (per conversion)
+EXTRACT_QUEUE_PAGES = int(os.getenv('EXTRACT_QUEUE_PAGES', '4'))
+# How often a running conversion pushes progress to its session and checkpoint
+CONVERT_FLUSH_INTERVAL = float(os.getenv('CONVERT_FLUSH_INTERVAL', '2'))
+
+def prefetch(pages: Iterator[List[Track]], max_pages: int = EXTRACT_QUEUE_PAGES) -> Iterator[List[Track]]:
+    """
+    Fetch pages on a background thread, at most `max_pages` ahead
+    
+    Lets the next page download while the current one is being matched
+    without ever holding more than a few pages. Errors are re-raised to
+    the consumer; closing the generator stops the fetching.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max_pages)
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            for page in pages:
+                if not put(('page', page)):
+                    return
+            put(('done', None))
+        except Exception as e:
+            put(('error', e))
+    
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(produce,), name='extract', daemon=True).start()
+    
+    try:
+        while True:
+            kind, item = buffer.get()
+            if kind == 'error':
+                raise item
+            if kind == 'done':
+                return
+            yield item
+    finally:
+        stop.set()
+
+class ConversionJob:
+    """
+    Matching for one conversion, run on a background thread
+
+    Source tracks arrive page by page and are matched as they come in.
+    Each track starts out as a pending placeholder and is filled in when
+    it matches, so a snapshot can be taken at any time. Progress
+    listeners and the checkpoint are updated every CONVERT_FLUSH_INTERVAL
+    seconds and once at the end. Tracks the checkpoint already has a
+    match for are not matched again.
+    """
+
+    def __init__(
+        self,
+        converter: 'UniversalConverter',
+        target_platform: MusicPlatform,
+        pages: Iterable[List[Track]],
+        labels: Tuple[str, str],
+        checkpoint: Dict,
+        checkpoint_key: str,
+        leased: bool = False
+    ):
+        self.converter = converter
+        self.target_platform = target_platform
+        self.pages = pages
+        self.labels = labels
+        self.checkpoint = checkpoint
+        self.checkpoint_key = checkpoint_key
+        # Whether this worker holds the checkpoint's lease (resumed jobs arrive with it)
+        self.leased = leased
+        # Matches by track identity, from an earlier run and growing
+        self.matches: Dict[str, Optional[MatchResult]] = {
+            identity: MatchResult.from_dict(match) if match else None
+            for identity, match in checkpoint.get('matches', {}).items()
+        }
+        
+        # Grow as pages arrive
+        self.source_tracks: List[Track] = []
+        self.identities: List[Optional[str]] = []
+        self.tracks: List[MatchedTrack] = []
+        # A list of pages is the whole playlist up front (resumed or retargeted
+        # conversions): checkpoint all of it right away, there's nothing to re-extract
+        self.known_tracks: Optional[List[Track]] = (
+            [track for page in pages for track in page] if isinstance(pages, list) else None
+        )
+        self.checkpoint['extracted'] = self.known_tracks is not None
+        # Job index of each track handed to the match engine
+        self.matching: List[int] = []
+        self.reused = 0
+        
+        self.pending = 0
+        self.extracting = True
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+    
+    def _tracks_to_match(self) -> Iterator[Track]:
+        """Take in source pages, yield the tracks that still need matching"""
+        for page in self.pages:
+            for track in page:
+                identity = track_identity(track)
+                with self._lock:
+                    index = len(self.source_tracks)
+                    self.source_tracks.append(track)
+                    self.identities.append(identity)
+                    
+                    if identity in self.matches:
+                        self.tracks.append(MatchedTrack(track, self.matches[identity]))
+                        self.reused += 1
+                        continue
+                    
+                    self.tracks.append(MatchedTrack(track, pending=True))
+                    self.pending += 1
+                
+                self.matching.append(index)
+                yield track
+        
+        print(f"Found {len(self.source_tracks)} tracks")
+        with self._lock:
+            self.extracting = False
+        self.checkpoint['extracted'] = True
+    
+    @property
+    def session_code(self) -> Optional[str]:
+        """Session this conversion is filling in (recorded in the checkpoint)"""
+        return self.checkpoint.get('session_code')
+    
+    @session_code.setter
+    def session_code(self, code: str) -> None:
+        self.checkpoint['session_code'] = code
+    
+    def run(self, started: float) -> None:
+        self._hold_lease()
+        self._save_checkpoint()
+        last_flush = time.monotonic()
+        try:
+            for position, match in self.converter.engine.match_iter(self.target_platform, self._tracks_to_match()):
+                index = self.matching[position]
+                with self._lock:
+                    self.tracks[index] = MatchedTrack(self.source_tracks[index], match)
+                    self.pending -= 1
+                if self.identities[index] and not (match is not None and match.failed):
+                    # Failed lookups are retried when the checkpoint is resumed
+                    self.matches[self.identities[index]] = match
+                
+                if time.monotonic() - last_flush >= CONVERT_FLUSH_INTERVAL:
+                    self._save_checkpoint()
+                    self._notify()
+                    last_flush = time.monotonic()
+            
+            if self.reused:
+                print(f"♻️ Reused {self.reused} matches from a checkpoint")
+        except Exception as e:
+            print(f"❌ Matching failed: {e}")
+            # Keep what matched so a retry picks up from here
+            self._save_checkpoint()
+            with self._lock:
+                self.error = e
+                # Whatever didn't match by now won't, stop showing it as pending
+                for track in self.tracks:
+                    track.pending = False
+                self.pending = 0
+                self.extracting = False
+            CONVERSIONS.labels(*self.labels, 'error').inc()
+        else:
+            self._delete_checkpoint()
+            CONVERSIONS.labels(*self.labels, 'success').inc()
+        finally:
+            CONVERSION_DURATION.labels(*self.labels).observe(time.perf_counter() - started)
+            CONVERSIONS_IN_FLIGHT.dec()
+            with self._lock:
+                self.done.set()
+            self._release_lease()
+            self._notify()
+    
+    def _hold_lease(self) -> None:
+        """Claim the checkpoint's lease and keep renewing it until the job is done"""
+        store = self.converter.checkpoints
+        if store is None:
+            return
+        
+        if not self.leased:
+            try:
+                self.leased = store.claim(self.checkpoint_key)
+            except Exception as e:
+                print(f"⚠️ Checkpoint lease failed: {e}")
+            if not self.leased:
+                # Another worker runs the same conversion; its lease keeps ours from being resumed too
+                print(f"⚠️ Checkpoint {self.checkpoint_key} is leased by another worker")
+                return
+        
+        def renew():
+            # On a timer, not on progress: a job stuck behind a slow rate limit is still alive
+            while not self.done.wait(CHECKPOINT_LEASE_TTL / 3):
+                try:
+                    if not store.renew(self.checkpoint_key):
+                        print(f"⚠️ Lost the lease on {self.checkpoint_key}")
+                        self.leased = False
+                        return
+                except Exception as e:
+                    print(f"⚠️ Checkpoint lease renewal failed: {e}")
+        
+        threading.Thread(target=renew, name='checkpoint-lease', daemon=True).start()
+    
+    def _release_lease(self) -> None:
+        if not self.leased:
+            return
+        try:
+            self.converter.checkpoints.release(self.checkpoint_key)
+        except Exception as e:
+            # It expires on its own
+            print(f"⚠️ Checkpoint lease release failed: {e}")
+    
+    def snapshot(self) -> Dict:
+        """Tracks matched so far (pending ones as placeholders) and stats"""
+        with self._lock:
+            tracks = list(self.tracks)
+            pending = self.pending > 0 or self.extracting
+            error = str(self.error) if self.error else None
+        
+        with stage('stats'):
+            stats = self.converter._calculate_stats(tracks)
+        
+        with stage('serialize'):
+            tracks = [serialize_track(track, self.target_platform.name) for track in tracks]
+        
+        return {'tracks': tracks, 'stats': stats, 'pending': pending, 'error': error}
+    
+    def on_progress(self, listener: Callable[[Dict], None]) -> None:
+        """
+        Call `listener(snapshot)` as matching progresses
+
+        Called right away (once) if the job has already finished.
+        """
+        with self._lock:
+            finished = self.done.is_set()
+            if not finished:
+                self._listeners.append(listener)
+        
+        if finished:
+            listener(self.snapshot())
+    
+    def _save_checkpoint(self) -> None:
+        if self.converter.checkpoints is None:
+            return
+        source_tracks = self.source_tracks if self.known_tracks is None else self.known_tracks
+        self.checkpoint['source_tracks'] = [track.to_dict() for track in source_tracks]
+        self.checkpoint['matches'] = {
+            identity: match.to_dict() if match else None
+            for identity, match in self.matches.items()
+        }
+        try:
+            self.converter.checkpoints.save(self.checkpoint_key, self.checkpoint)
+        except Exception as e:
+            # Losing a checkpoint only costs work after a restart, keep matching
+            print(f"⚠️ Checkpoint save failed: {e}")
+    
+    def _delete_checkpoint(self) -> None:
+        if self.converter.checkpoints is None:
+            return
+        try:
+            self.converter.checkpoints.delete(self.checkpoint_key)
+        except Exception as e:
+            print(f"⚠️ Checkpoint delete failed: {e}")
+    
+    def _notify(self) -> None:
+        snapshot = self.snapshot()
+        for listener in list(self._listeners):
+            try:
+                listener(snapshot)
+            except Exception as e:
+                print(f"⚠️ Progress update failed: {e}")
 
 class UniversalConverter:
     """Convert playlists between any supported platforms"""
     
-    def __init__(self):
-        self.detector = PlatformDetector()
+    def __init__(
+        self,
+        detector: Optional[PlatformDetector] = None,
+        engine: Optional[MatchEngine] = None,
+        checkpoints: Optional[CheckpointStore] = None
+    ):
+        self.detector = detector or PlatformDetector()
+        self.engine = engine or get_match_engine()
+        # Where conversion progress is checkpointed (None = not at all)
+        self.checkpoints = checkpoints
+        self.background = ThreadPoolExecutor(max_workers=CONVERT_WORKERS, thread_name_prefix='convert')
     
     def convert(
         self,
         source_url: str,
-        target_platform_name: str
+        target_platform_name: str,
+        time_budget: Optional[float] = None,
+        resolved: Optional[Tuple[Dict, MusicPlatform, str]] = None
     ) -> Dict:
         """
         Convert a playlist from one platform to another
@@ -21,9 +330,330 @@ class UniversalConverter:
         Args:
             source_url: URL of the source playlist
             target_platform_name: Name of target platform
+            time_budget: Seconds to wait for matching before returning
+                what has matched so far (None = wait for every track)
+            resolved: resolve() of this request, if the caller already has it
+        
+        Returns:
+            Dict with matched tracks and statistics. If the budget ran
+            out, `pending` is True and `job` keeps matching in the
+            background (see ConversionJob.on_progress).
+        """
+        source_platform_info, target_platform, playlist_id = (
+            resolved or self.resolve(source_url, target_platform_name)
+        )
+        source_platform = source_platform_info['handler']
+        
+        labels = (source_platform_info['name'], target_platform.name)
+        started = time.perf_counter()
+        CONVERSIONS_IN_FLIGHT.inc()
+        try:
+            pages = self._extract(source_platform, playlist_id)
+        except Exception:
+            CONVERSIONS.labels(*labels, 'error').inc()
+            CONVERSIONS_IN_FLIGHT.dec()
+            raise
+        
+        # Step 5: Match each unique song once (concurrently, cached) as pages arrive,
+        # skipping whatever an earlier, interrupted run of this conversion already matched
+        key = checkpoint_key(source_platform_info['name'], playlist_id, target_platform.name)
+        checkpoint = self._load_checkpoint(key) or {}
+        checkpoint.update(
+            source_platform=source_platform_info['name'],
+            source_display_name=source_platform_info['display_name'],
+            playlist_id=playlist_id,
+            target_platform=target_platform.name,
+            session_code=None
+        )
+        
+        job = ConversionJob(self, target_platform, pages, labels, checkpoint, key)
+        return self._run(job, started, time_budget, source_platform_info['display_name'])
+    
+    @staticmethod
+    def session_identity(session: Dict, session_code: str) -> str:
+        """
+        Stable id of one stored session
+        
+        Codes are handed out again once a session expires, so the code
+        alone could pick up a checkpoint (or dedupe entry) left behind by
+        an older session; its creation time tells them apart.
+        """
+        return f"session-{session_code}-{session.get('created_at', 0):.6f}"
+    
+    def retarget(
+        self,
+        session: Dict,
+        session_code: str,
+        target_platform_name: str,
+        time_budget: Optional[float] = None
+    ) -> Dict:
+        """
+        Convert a session's source tracks to another target
+        
+        The tracks stored in the session (title, artist, ISRC, source
+        ids) are matched against the new target as they are, the source
+        playlist isn't fetched again.
+        
+        Args:
+            session: The stored session (see SessionManager.get_session)
+            session_code: Its code
+            target_platform_name: Name of the new target platform
+            time_budget: As for convert()
+        
+        Returns:
+            Same as convert()
+        """
+        target_platform = self.detector.get_platform(target_platform_name)
+        if not target_platform:
+            raise ValueError(f"Unsupported target platform: {target_platform_name}")
+        
+        current_target = session.get('target_platform', 'youtube_music')
+        if target_platform.name == current_target:
+            raise ValueError(f"Session {session_code} already targets {target_platform.name}")
+        if session.get('pending'):
+            raise ValueError(f"Session {session_code} is still converting, retarget it once it is done")
+        if not session.get('tracks'):
+            raise ValueError(f"Session {session_code} has no tracks")
+        
+        print(f"Retargeting session {session_code} from {current_target} to {target_platform.name}")
+        
+        # The old target's id is its match, not part of the source track (deserialize_track drops it)
+        source_tracks = [deserialize_track(track, current_target).track for track in session['tracks']]
+        source_display_name = session.get('source_platform')
+        source_name = next(
+            (platform['name'] for platform in self.detector.get_supported_platforms()
+             if platform['display_name'] == source_display_name),
+            'unknown'
+        )
+        
+        labels = (source_name, target_platform.name)
+        CONVERSIONS_IN_FLIGHT.inc()
+        
+        key = checkpoint_key(source_name, self.session_identity(session, session_code), target_platform.name)
+        checkpoint = self._load_checkpoint(key) or {}
+        checkpoint.update(
+            source_platform=source_name,
+            source_display_name=source_display_name,
+            playlist_id=None,
+            target_platform=target_platform.name,
+            session_code=None
+        )
         
+        job = ConversionJob(self, target_platform, [source_tracks], labels, checkpoint, key)
+        return self._run(job, time.perf_counter(), time_budget, source_display_name)
+    
+    def _run(self, job: 'ConversionJob', started: float, time_budget: Optional[float], source_display_name: str) -> Dict:
+        """Start a job and wait up to `time_budget` for it (see convert)"""
+        self._start(job, started)
+        
+        if not job.done.wait(time_budget):
+            print(f"⏱️ Time budget of {time_budget}s reached, {job.pending} tracks still matching"
+                  f"{' (playlist still loading)' if job.extracting else ''}")
+        elif job.error:
+            raise job.error
+        
+        # Step 6: Calculate statistics
+        snapshot = job.snapshot()
+        
+        return {
+            'source_platform': source_display_name,
+            'target_platform': job.target_platform.name,
+            'tracks': snapshot['tracks'],
+            'stats': snapshot['stats'],
+            'pending': snapshot['pending'],
+            'job': job
+        }
+    
+    @staticmethod
+    def conversion_key(resolved: Tuple[Dict, MusicPlatform, str]) -> str:
+        """
+        Identity of a conversion request (see resolve)
+        
+        Source platform + playlist id (as parsed, so URL variants agree)
+        and target.
+        """
+        source_platform_info, target_platform, playlist_id = resolved
+        return f"{source_platform_info['name']}:{playlist_id}:{target_platform.name}"
+    
+    def playlist_snapshot(self, resolved: Tuple[Dict, MusicPlatform, str]) -> Optional[str]:
+        """
+        The source playlist's current snapshot, if its platform has one
+        
+        Costs a request against the source platform's budget. None if
+        there is none or it couldn't be fetched.
+        """
+        source_platform_info, _, playlist_id = resolved
+        try:
+            return source_platform_info['handler'].get_playlist_snapshot(playlist_id)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            # Fine to go without, identical requests still dedupe within the TTL
+            print(f"⚠️ Could not fetch playlist snapshot: {e}")
+            return None
+    
+    def resume_checkpoints(self, should_resume: Callable[[Dict], bool]) -> List[ConversionJob]:
+        """
+        Restart background conversions left behind by a dead worker
+        
+        Each is claimed first (see CheckpointStore.orphaned), so workers
+        starting together don't all resume the same one.
+        
+        Args:
+            should_resume: Called with each orphaned checkpoint; those it
+                rejects (e.g. their session expired) are dropped
+        
+        Returns:
+            The resumed jobs (their `session_code` says what they fill in)
+        """
+        if self.checkpoints is None:
+            return []
+        
+        jobs = []
+        for key, checkpoint in self.checkpoints.orphaned():
+            target_platform = self.detector.get_platform(checkpoint['target_platform'])
+            if not target_platform or not should_resume(checkpoint):
+                self.checkpoints.delete(key)
+                self.checkpoints.release(key)
+                continue
+            
+            print(f"♻️ Resuming conversion for session {checkpoint['session_code']}")
+            labels = (checkpoint['source_platform'], target_platform.name)
+            if checkpoint['extracted']:
+                pages = [[Track.from_dict(track) for track in checkpoint['source_tracks']]]
+            else:
+                # Died mid-extraction: fetch the playlist again, matched tracks are still skipped
+                source_platform = self.detector.get_platform(checkpoint['source_platform'])
+                pages = prefetch(source_platform.iter_playlist_pages(checkpoint['playlist_id']))
+            job = ConversionJob(self, target_platform, pages, labels, checkpoint, key, leased=True)
+            
+            CONVERSIONS_IN_FLIGHT.inc()
+            self._start(job, time.perf_counter())
+            jobs.append(job)
+        
+        return jobs
+    
+    def _start(self, job: ConversionJob, started: float) -> None:
+        """Run a job in the background (it owns the conversion's metrics from here)"""
+        context = contextvars.copy_context()
+        self.background.submit(context.run, job.run, started)
+    
+    def _load_checkpoint(self, key: str) -> Optional[Dict]:
+        if self.checkpoints is None:
+            return None
+        try:
+            return self.checkpoints.load(key)
+        except Exception as e:
+            print(f"⚠️ Checkpoint load failed: {e}")
+            return None
+    
+    def convert_batch(self, requests: List[Tuple[str, str]]) -> Dict:
+        """
+        Convert many playlists in one go
+        
+        All playlists are extracted concurrently, then every track bound
+        for the same target is matched in a single pass, so songs shared
+        between playlists are only matched once. A bad URL or failed
+        extraction only fails its own entry.
+        
+        Args:
+            requests: (source_url, target_platform_name) pairs
+        
+        Returns:
+            Dict with one result per request (tracks + stats, or error)
+            and aggregate stats for the batch
+        """
+        results: List[Dict] = [{} for _ in requests]
+        jobs = {}
+        started = time.perf_counter()
+        finished = set()
+        
+        def finish(index: int, outcome: str) -> None:
+            CONVERSIONS.labels(*jobs[index][0], outcome).inc()
+            CONVERSION_DURATION.labels(*jobs[index][0]).observe(time.perf_counter() - started)
+            finished.add(index)
+        
+        for index, (source_url, target_platform_name) in enumerate(requests):
+            try:
+                source_platform_info, target_platform, playlist_id = self.resolve(source_url, target_platform_name)
+            except ValueError as e:
+                results[index] = {'error': str(e)}
+                continue
+            
+            results[index] = {
+                'source_platform': source_platform_info['display_name'],
+                'target_platform': target_platform.name
+            }
+            labels = (source_platform_info['name'], target_platform.name)
+            future = self.engine.executor.submit(
+                None, source_platform_info['handler'].get_playlist_tracks, playlist_id
+            )
+            jobs[index] = (labels, target_platform, future)
+        
+        CONVERSIONS_IN_FLIGHT.inc(len(jobs))
+        try:
+            # Step 1: Wait for every extraction, grouping the tracks by target
+            by_target: Dict[str, Tuple[MusicPlatform, List[Tuple[int, List[Track]]]]] = {}
+            with stage('extract'):
+                for index, (labels, target_platform, future) in jobs.items():
+                    try:
+                        source_tracks = future.result()
+                        if not source_tracks:
+                            raise ValueError("Playlist is empty or could not be fetched")
+                    except Exception as e:
+                        print(f"❌ Extraction failed for {requests[index][0]}: {e}")
+                        results[index] = {'error': str(e)}
+                        finish(index, 'error')
+                        continue
+                    
+                    by_target.setdefault(target_platform.name, (target_platform, []))[1].append((index, source_tracks))
+            
+            # Step 2: One matching pass per target over the whole batch
+            unique_tracks = 0
+            for target_platform, playlists in by_target.values():
+                all_tracks = [track for _, source_tracks in playlists for track in source_tracks]
+                print(f"Matching {len(all_tracks)} tracks from {len(playlists)} playlists to {target_platform.name}")
+                unique_tracks += len(collapse_duplicates(all_tracks)[0])
+                
+                matches = iter(self.engine.match_all(target_platform, all_tracks))
+                for index, source_tracks in playlists:
+                    tracks = [MatchedTrack(track, next(matches)) for track in source_tracks]
+                    with stage('stats'):
+                        stats = self._calculate_stats(tracks)
+                    results[index].update(
+                        tracks=[serialize_track(track, target_platform.name) for track in tracks],
+                        stats=stats
+                    )
+                    finish(index, 'success')
+        finally:
+            # Jobs cut short by a failed matching pass still took this long
+            for index in jobs.keys() - finished:
+                CONVERSION_DURATION.labels(*jobs[index][0]).observe(time.perf_counter() - started)
+            CONVERSIONS_IN_FLIGHT.dec(len(jobs))
+        
+        converted = [result for result in results if 'stats' in result]
+        total = sum(result['stats']['total'] for result in converted)
+        matched = sum(result['stats']['matched'] for result in converted)
+        
+        return {
+            'results': results,
+            'stats': {
+                'playlists': len(requests),
+                'converted': len(converted),
+                'failed': len(requests) - len(converted),
+                'total_tracks': total,
+                'unique_tracks': unique_tracks,
+                'matched': matched,
+                'match_rate': matched / total if total > 0 else 0
+            }
+        }
+    
+    def resolve(self, source_url: str, target_platform_name: str) -> Tuple[Dict, MusicPlatform, str]:
+        """
+        Validate a conversion request
+
         Returns:
-            Dict with matched tracks and statistics
+            (source platform info, target platform handler, source playlist id)
         """
         # Step 1: Detect source platform
         source_platform_info = self.detector.detect_platform(source_url)
@@ -38,8 +668,6 @@ class UniversalConverter:
                 f"You can still convert TO {source_platform_info['display_name']}!"
             )
         
-        source_platform = source_platform_info['handler']
-        
         # Step 3: Get target platform
         target_platform = self.detector.get_platform(target_platform_name)
         if not target_platform:
@@ -47,95 +675,67 @@ class UniversalConverter:
         
         print(f"Converting from {source_platform_info['display_name']} to {target_platform.name}")
         
-        # Step 4: Extract playlist from source
-        playlist_id = source_platform.extract_playlist_id(source_url)
-        if not playlist_id:
-            raise ValueError("Could not extract playlist ID from URL")
+        # Step 4: Only playlists can be extracted (the router already parsed its id)
+        if source_platform_info['kind'] != 'playlist':
+            raise ValueError(
+                f"Only playlist links are supported as source, got a {source_platform_info['kind']} link"
+            )
+        playlist_id = source_platform_info['resource_id']
         
-        source_tracks = source_platform.get_playlist_tracks(playlist_id)
-        print(f"Found {len(source_tracks)} tracks")
+        return source_platform_info, target_platform, playlist_id
+    
+    def _extract(self, source_platform: MusicPlatform, playlist_id: str) -> Iterator[List[Track]]:
+        """
+        Start fetching the source playlist
         
-        if not source_tracks:
-            raise ValueError("Playlist is empty or could not be fetched")
+        Pages are fetched here up to the first one with tracks, so a
+        missing, private or empty playlist fails the request (a page can
+        come back empty when every track on it is unavailable). The rest
+        keep coming from a background thread through a bounded queue
+        (see prefetch).
+        """
+        pages = prefetch(source_platform.iter_playlist_pages(playlist_id))
         
-        # Step 5: Match each track to target platform
-        matched_tracks = []
-        for i, track in enumerate(source_tracks, 1):
-            print(f"  [{i}/{len(source_tracks)}] {track['title']} - {track['artist']}")
-            
-            target_match = target_platform.match_track(track)
-            
-            # Build result with all source data + target match
-            result = {
-                **track,  # Keep original data
-                f'{target_platform.name}_id': target_match['id'] if target_match else None,
-                f'{target_platform.name}_match_method': target_match.get('match_method') if target_match else None,
-                f'{target_platform.name}_confidence': target_match.get('confidence', 0) if target_match else 0
-            }
-            
-            # Add platform-specific fields if target match exists
-            if target_match:
-                # Determine the URL key for this platform
-                url_key = f'{target_platform.name}_url'
-                
-                # Add URL based on platform
-                if target_platform.name == 'apple_music':
-                    if 'apple_music_url' in target_match:
-                        result[url_key] = target_match['apple_music_url']
-                    
-                    # Add preview URL and artwork for Apple Music
-                    if 'preview_url' in target_match:
-                        result['preview_url'] = target_match['preview_url']
-                    if 'artwork_url' in target_match:
-                        result['artwork_url'] = target_match['artwork_url']
-                
-                elif target_platform.name == 'youtube_music':
-                    # Generate YouTube Music URL from ID
-                    result[url_key] = f"https://music.youtube.com/watch?v={target_match['id']}"
-                
-                elif target_platform.name == 'spotify':
-                    # Generate Spotify URL from ID
-                    result[url_key] = f"https://open.spotify.com/track/{target_match['id']}"
-                
-                # Add any other metadata from target match
-                if 'album' in target_match and not result.get('album'):
-                    result['album'] = target_match['album']
-            
-            matched_tracks.append(result)
+        with stage('extract'):
+            first_page = next((page for page in pages if page), None)
         
-        # Step 6: Calculate statistics
-        stats = self._calculate_stats(matched_tracks, target_platform.name)
+        if not first_page:
+            pages.close()
+            raise ValueError("Playlist is empty or could not be fetched")
         
-        return {
-            'source_platform': source_platform_info['display_name'],
-            'target_platform': target_platform.name,
-            'tracks': matched_tracks,
-            'stats': stats
-        }
+        return itertools.chain([first_page], pages)
+    
+    def session_stats(self, session: Dict) -> Dict:
+        """Stats of a stored session (recomputed for sessions saved without them)"""
+        if session.get('stats'):
+            return session['stats']
+        
+        target_platform = session.get('target_platform', 'youtube_music')
+        return self._calculate_stats([deserialize_track(track, target_platform) for track in session.get('tracks', [])])
     
-    def _calculate_stats(self, tracks: List[Dict], target_platform: str) -> Dict:
+    def _calculate_stats(self, tracks: List[MatchedTrack]) -> Dict:
         """Calculate matching statistics"""
         total = len(tracks)
-        id_key = f'{target_platform}_id'
-        confidence_key = f'{target_platform}_confidence'
         
-        matched = sum(1 for t in tracks if t.get(id_key))
-        failed = total - matched
+        confidences = [t.match.confidence for t in tracks if t.match]
+        matched = len(confidences)
+        pending = sum(1 for t in tracks if t.pending)
+        failed = total - matched - pending
         
         avg_confidence = 0
         if matched > 0:
-            confidences = [t[confidence_key] for t in tracks if t.get(id_key)]
             avg_confidence = sum(confidences) / len(confidences)
         
         # Additional stats - confidence breakdown
-        high_confidence = sum(1 for t in tracks if t.get(confidence_key, 0) >= 0.9)
-        medium_confidence = sum(1 for t in tracks if 0.7 <= t.get(confidence_key, 0) < 0.9)
-        low_confidence = sum(1 for t in tracks if t.get(id_key) and t.get(confidence_key, 0) < 0.7)
+        high_confidence = sum(1 for c in confidences if c >= 0.9)
+        medium_confidence = sum(1 for c in confidences if 0.7 <= c < 0.9)
+        low_confidence = sum(1 for c in confidences if c < 0.7)
         
         return {
             'total': total,
             'matched': matched,
             'failed': failed,
+            'pending': pending,
             'match_rate': matched / total if total > 0 else 0,
             'avg_confidence': avg_confidence,
             'high_confidence': high_confidence,  # >=90%
@@ -179,7 +779,7 @@ if __name__ == "__main__":
         print(f"\n🎵 Sample matches (first 3):")
         for i, track in enumerate(result['tracks'][:3], 1):
             matched = "✅" if track.get('apple_music_id') else "❌"
-            print(f"\n  {i}. {matched} {track['title']} - {track['artists']}")
+            print(f"\n  {i}. {matched} {track['title']} - {track['artist']}")
             if track.get('apple_music_id'):
                 print(f"     Confidence: {track['apple_music_confidence']:.1%}")
                 print(f"     Apple Music URL: {track.get('apple_music_url', 'N/A')}")
@@ -230,7 +830,7 @@ if __name__ == "__main__":
         if result['tracks']:
             track = result['tracks'][0]
             matched = "✅" if track.get('youtube_music_id') else "❌"
-            print(f"  {matched} {track['title']} - {track['artists']}")
+            print(f"  {matched} {track['title']} - {track['artist']}")
             if track.get('youtube_music_id'):
                 print(f"     YouTube Music URL: {track.get('youtube_music_url', 'N/A')}")
         
@@ -0,0 +1,69 @@
+# backend/url_router.py
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+class RouteMatch(NamedTuple):
+    platform: str       # 'spotify', 'youtube_music', 'apple_music'
+    kind: str           # 'playlist', 'album' or 'track'
+    resource_id: str
+
+# (platform, kind, pattern) - the pattern's only capture group is the resource id.
+# Order matters where two patterns can match at the same position: first one wins.
+ROUTES: List[Tuple[str, str, str]] = [
+    ('spotify', 'playlist', r'open\.spotify\.com/(?:intl-[a-z-]+/)?playlist/([A-Za-z0-9]+)'),
+    ('spotify', 'album', r'open\.spotify\.com/(?:intl-[a-z-]+/)?album/([A-Za-z0-9]+)'),
+    ('spotify', 'track', r'open\.spotify\.com/(?:intl-[a-z-]+/)?track/([A-Za-z0-9]+)'),
+    ('spotify', 'playlist', r'spotify:playlist:([A-Za-z0-9]+)'),
+    ('spotify', 'album', r'spotify:album:([A-Za-z0-9]+)'),
+    ('spotify', 'track', r'spotify:track:([A-Za-z0-9]+)'),
+    ('youtube_music', 'playlist', r'music\.youtube\.com/playlist\?(?:[^#]*?&)?list=([A-Za-z0-9_-]+)'),
+    ('youtube_music', 'playlist', r'music\.youtube\.com/playlist/([A-Za-z0-9_-]+)'),
+    ('youtube_music', 'playlist', r'music\.youtube\.com/watch\?(?:[^#]*?&)?list=([A-Za-z0-9_-]+)'),
+    ('youtube_music', 'track', r'music\.youtube\.com/watch\?(?:[^#]*?&)?v=([A-Za-z0-9_-]+)'),
+    ('apple_music', 'playlist', r'music\.apple\.com/[a-z]{2}/playlist/(?:[^/?#]+/)?(pl\.[A-Za-z0-9-]+)'),
+    ('apple_music', 'track', r'music\.apple\.com/[a-z]{2}/album/(?:[^/?#]+/)?\d+\?(?:[^#]*?&)?i=(\d+)'),
+    ('apple_music', 'album', r'music\.apple\.com/[a-z]{2}/album/(?:[^/?#]+/)?(\d+)'),
+    ('apple_music', 'track', r'music\.apple\.com/[a-z]{2}/song/(?:[^/?#]+/)?(\d+)'),
+]
+
+_CAPTURE_GROUP = re.compile(r'(?<!\\)\((?!\?)')
+
+class UrlRouter:
+    """
+    Single-pass URL router
+
+    All routes are compiled into one alternation, each wrapped in its own
+    named group, so a single `search` tells us the platform, the resource
+    kind and the resource id at once.
+    """
+
+    def __init__(self, routes: List[Tuple[str, str, str]]):
+        self.routes = list(routes)
+        self._compile()
+
+    def _compile(self) -> None:
+        parts = []
+        for i, (_, _, pattern) in enumerate(self.routes):
+            # Name the id group (first unescaped, non-"(?" paren) so we never count groups
+            pattern = _CAPTURE_GROUP.sub(f'(?P<r{i}_id>', pattern, count=1)
+            parts.append(f'(?P<r{i}>{pattern})')
+        self._regex = re.compile('|'.join(parts))
+
+    def add_route(self, platform: str, kind: str, pattern: str) -> None:
+        """Register another URL pattern (its first group must capture the id)"""
+        self.routes.append((platform, kind, pattern))
+        self._compile()
+
+    def match(self, url: str) -> Optional[RouteMatch]:
+        """Identify platform, kind and id of a URL, or None if unsupported"""
+        m = self._regex.search(url)
+        if not m:
+            return None
+
+        # The outer route group closes last, so it is the match's lastgroup
+        index = int(m.lastgroup[1:])
+        platform, kind, _ = self.routes[index]
+        return RouteMatch(platform, kind, m.group(f'r{index}_id'))
+
+router = UrlRouter(ROUTES)
@@ -1,13 +1,19 @@
 # backend/youtube_music_client.py
 
+import os
 from ytmusicapi import YTMusic
-from fuzzywuzzy import fuzz
+from http_transport import get_session
+from profiling import stage
+from scoring import best_candidate, MATCH_THRESHOLD
 
 class YouTubeMusicClient:
+    # See scoring.SCORERS and benchmarks/bench_matching.py
+    SCORER = os.getenv('YOUTUBE_MUSIC_SCORER', 'ratio')
+    
     def __init__(self):
         """Initialize YouTube Music client"""
         # No authentication needed for search!
-        self.ytmusic = YTMusic()
+        self.ytmusic = YTMusic(requests_session=get_session())
     
     def search_track(self, title, artist):
         """Search for a track on YouTube Music"""
@@ -18,26 +24,20 @@ class YouTubeMusicClient:
             return None
         
         # Find best match using fuzzy string matching
-        best_match = None
-        best_score = 0
-        
-        for result in results:
-            result_title = result.get('title', '')
-            result_artist = result.get('artists', [{}])[0].get('name', '')
-            
-            # Calculate similarity scores
-            title_score = fuzz.ratio(title.lower(), result_title.lower())
-            artist_score = fuzz.ratio(artist.lower(), result_artist.lower())
-            
-            # Combined score (title weighted more)
-            combined_score = (title_score * 0.6) + (artist_score * 0.4)
-            
-            if combined_score > best_score:
-                best_score = combined_score
-                best_match = result
+        with stage('score'):
+            best_index, best_score = best_candidate(
+                title,
+                artist,
+                [
+                    (result.get('title', ''), result.get('artists', [{}])[0].get('name', ''))
+                    for result in results
+                ],
+                scorer=self.SCORER
+            )
+            best_match = results[best_index] if best_index is not None else None
         
         # Only return if confidence is high enough
-        if best_score > 70:  # 70% threshold
+        if best_score > MATCH_THRESHOLD:
             return {
                 'youtube_music_id': best_match['videoId'],
                 'title': best_match['title'],